@@ -0,0 +1,39 @@
+"""Cost per sample of the streaming anomaly detectors across many series.
+
+Usage: python benchmarks/bench_anomaly.py [series] [samples]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from anomaly import EwmaDetector, SeasonalDetector
+
+
+def run(detector_class, series, samples):
+    rng = random.Random(42)
+    detectors = [detector_class() for _ in range(series)]
+    values = [[rng.gauss(50, 5) for _ in range(samples)] for _ in range(series)]
+    t0 = time.time()
+    start = time.perf_counter()
+    for i in range(samples):
+        t = t0 + i * 2
+        for detector, column in zip(detectors, values):
+            detector.update(t, column[i])
+    elapsed = time.perf_counter() - start
+    return elapsed / (series * samples) * 1e6, elapsed / samples * 1e3
+
+
+def main():
+    series = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    samples = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    for detector_class in (EwmaDetector, SeasonalDetector):
+        per_update_us, per_tick_ms = run(detector_class, series, samples)
+        print(f"{detector_class.__name__:18} {series} series: {per_update_us:.2f} us/update, "
+              f"{per_tick_ms:.2f} ms per sample tick")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Compare the os.walk cleanup with the parallel scandir engine.
+
+Usage: python benchmarks/bench_cleanup.py [files]   (default: 200000)
+Builds a temporary tree of small files (100 per directory), then times a
+sizing pass with os.walk + os.path.getsize (what the old cleanup did before
+each remove), the parallel dry run, and the parallel delete.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+from cleanup import run_cleanup  # noqa: E402
+
+FILES_PER_DIR = 100
+
+
+def build_tree(root, files):
+    for i in range(files):
+        d = os.path.join(root, str(i // (FILES_PER_DIR * 50)), str(i // FILES_PER_DIR))
+        if i % FILES_PER_DIR == 0:
+            os.makedirs(d, exist_ok=True)
+        with open(os.path.join(d, str(i)), 'wb') as f:
+            f.write(b'x' * (i % 4096))
+
+
+def walk_sizes(root):
+    total = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            total += os.path.getsize(os.path.join(dirpath, name))
+    return total
+
+
+def timed(label, func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    print(f"{label:>28}: {time.perf_counter() - start:6.2f} s")
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    root = tempfile.mkdtemp(prefix='bench_cleanup_')
+    try:
+        build_tree(root, files)
+        print(f"{files} files in {files // FILES_PER_DIR} directories")
+        timed("os.walk + getsize", walk_sizes, root)
+        timed("parallel scandir dry run", run_cleanup, [root])
+        timed("parallel scandir delete", run_cleanup, [root], delete=True)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
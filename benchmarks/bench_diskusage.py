@@ -0,0 +1,48 @@
+"""Compare a full disk usage scan with a cached rescan.
+
+Usage: python benchmarks/bench_diskusage.py [files]   (default: 200000)
+Builds the same temporary tree as bench_cleanup, then times a full scan, a
+rescan of the unchanged tree, and a rescan after a few directories changed.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+sys.path.insert(0, HERE)
+
+from bench_cleanup import FILES_PER_DIR, build_tree  # noqa: E402
+from diskusage import DiskUsageAnalyzer  # noqa: E402
+
+
+def timed(label, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    print(f"{label:>28}: {time.perf_counter() - start:6.2f} s  "
+          f"({result.dirs} directories, {result.listed} listed, {result.root.total_files} files)")
+    return result
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    root = tempfile.mkdtemp(prefix='bench_diskusage_')
+    try:
+        build_tree(root, files)
+        print(f"{files} files in {files // FILES_PER_DIR} directories")
+        analyzer = DiskUsageAnalyzer()
+        timed("full scan", analyzer.scan, root, full=True)
+        timed("rescan, unchanged", analyzer.scan, root)
+        for i in range(0, files, files // 5):
+            d = os.path.join(root, str(i // (FILES_PER_DIR * 50)), str(i // FILES_PER_DIR))
+            with open(os.path.join(d, 'new'), 'wb') as f:
+                f.write(b'x' * 1024)
+        timed("rescan, 5 directories changed", analyzer.scan, root)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
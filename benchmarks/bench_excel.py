@@ -0,0 +1,44 @@
+"""Time and peak RSS of the streaming XLSX export.
+
+Usage: python benchmarks/bench_excel.py [rows ...]   (default: 100000 1000000)
+Each size runs in its own process so peak RSS is measured independently.
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+sys.path.insert(0, HERE)
+
+
+def run_one(rows):
+    from reports import generate_excel_report
+    from synthetic import SyntheticHistory
+
+    history = SyntheticHistory(rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.xlsx')
+        start = time.perf_counter()
+        generate_excel_report(history, path)
+        elapsed = time.perf_counter() - start
+        size_mb = os.path.getsize(path) / 2 ** 20
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{rows:>9} rows: {elapsed:7.1f} s, {rows / elapsed:8.0f} rows/s, "
+          f"peak RSS {peak_mb:6.0f} MB, file {size_mb:6.1f} MB")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--one':
+        run_one(int(sys.argv[2]))
+        return
+    sizes = [int(a) for a in sys.argv[1:]] or [100_000, 1_000_000]
+    for rows in sizes:
+        subprocess.run([sys.executable, __file__, '--one', str(rows)], check=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Export and load times of the XLSX, CSV.gz and NPZ exports.
+
+Usage: python benchmarks/bench_export_load.py [rows]   (default: 100000)
+Loading is timed with NumPy only: the XLSX through openpyxl in read-only
+mode, the CSV.gz with numpy.loadtxt and the NPZ with numpy.load.
+"""
+import gzip
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+sys.path.insert(0, HERE)
+
+from export import generate_csv_report, generate_npz_report, read_xlsx_rows  # noqa: E402
+from reports import generate_excel_report  # noqa: E402
+from synthetic import SyntheticHistory  # noqa: E402
+
+
+def load_xlsx(path):
+    columns, rows = read_xlsx_rows(path)
+    data = [[t] + values for t, values in rows]
+    return np.array(data, dtype=object)
+
+
+def load_csv(path):
+    with gzip.open(path, 'rt') as f:
+        return np.loadtxt(f, delimiter=',', skiprows=1)
+
+
+def load_npz(path):
+    with np.load(path) as npz:
+        return {name: npz[name] for name in npz.files}
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    history = SyntheticHistory(rows)
+    cases = [
+        ('xlsx', generate_excel_report, load_xlsx),
+        ('csv.gz', generate_csv_report, load_csv),
+        ('npz', generate_npz_report, load_npz),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for ext, export, load in cases:
+            path = os.path.join(tmp, 'bench.' + ext)
+            _, export_s = timed(export, history, path)
+            _, load_s = timed(load, path)
+            size_mb = os.path.getsize(path) / 2 ** 20
+            print(f"{ext:>7}: export {export_s:7.1f} s, load {load_s:7.2f} s, file {size_mb:6.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Time a fleet aggregator against many agents on localhost.
+
+Usage: python benchmarks/bench_fleet.py [agents]   (default: 500)
+A few agents run as separate `agent.py` processes; the rest are hosted by
+one helper process, each on its own port. Measures the time until every
+agent is online, how long an agent that was killed takes to be marked
+offline, and how long it takes to come back once it is restarted.
+"""
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(HERE, '..', 'src')
+sys.path.insert(0, SRC)
+
+from agent import Agent  # noqa: E402
+from fleet import FleetAggregator  # noqa: E402
+
+INTERVAL_S = 1.0
+PROCESS_AGENTS = 4
+
+
+def host_agents(count, ports):
+    async def serve():
+        servers = [await Agent(f"bench-{i}", INTERVAL_S).start('127.0.0.1', 0) for i in range(count)]
+        ports.put([server.sockets[0].getsockname()[1] for server in servers])
+        await asyncio.Event().wait()
+    asyncio.run(serve())
+
+
+def spawn_agent(port):
+    proc = subprocess.Popen([sys.executable, os.path.join(SRC, 'agent.py'), '--host', '127.0.0.1',
+                             '-p', str(port), '-i', str(INTERVAL_S)], stdout=subprocess.PIPE, text=True)
+    proc.stdout.readline()
+    return proc
+
+
+async def wait_for(aggregator, address, status):
+    start = time.perf_counter()
+    while aggregator.states[address].status != status:
+        await asyncio.sleep(0.01)
+    return time.perf_counter() - start
+
+
+async def bench(addresses, procs):
+    aggregator = FleetAggregator()
+    start = time.perf_counter()
+    aggregator.set_agents(addresses)
+    while not all(state.sample is not None for state in aggregator.states.values()):
+        await asyncio.sleep(0.01)
+    print(f"{len(addresses)} agents online with a sample after {time.perf_counter() - start:.2f} s")
+
+    port, proc = next(iter(procs.items()))
+    address = f"127.0.0.1:{port}"
+    proc.kill()
+    proc.wait()
+    print(f"killed agent marked offline after {await wait_for(aggregator, address, 'Offline'):.2f} s")
+    procs[port] = spawn_agent(port)
+    print(f"restarted agent online again after {await wait_for(aggregator, address, 'Online'):.2f} s")
+    await aggregator.close()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    ports = multiprocessing.Queue()
+    host = multiprocessing.Process(target=host_agents, args=(count - PROCESS_AGENTS, ports), daemon=True)
+    host.start()
+    procs = {port: spawn_agent(port) for port in range(5310, 5310 + PROCESS_AGENTS)}
+    try:
+        addresses = [f"127.0.0.1:{port}" for port in list(procs) + ports.get(timeout=60)]
+        asyncio.run(bench(addresses, procs))
+    finally:
+        for proc in procs.values():
+            proc.kill()
+        host.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Time one update of the Multi-Device table for a large fleet.
+
+Usage: python benchmarks/bench_fleet_view.py [hosts]   (default: 2000)
+Every host gets a new sample per tick, the view is sorted by CPU and is
+shown off-screen; the repaint only touches the visible rows. Then every
+other host is removed with a row selected. Compares QSortFilterProxyModel
+(the proxy used by the other tables) with KeyedSortFilterProxy, with and
+without a text filter.
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+from PyQt5.QtCore import Qt  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from models import KeyedSortFilterProxy, KeyedTableModel, create_table_view  # noqa: E402
+
+TICKS = 5
+HEADERS = ["Device Name", "Address", "Status", "CPU %", "RAM %", "Disk %", "Last Seen", "Error", "CPU History"]
+
+
+def fleet_rows(hosts, tick, history):
+    rows = []
+    for i in range(hosts):
+        address = f"10.0.{i // 250}.{i % 250}:5300"
+        cpu = random.uniform(0, 100)
+        history[address] = (history.get(address, ()) + (cpu,))[-60:]
+        rows.append((address, (f"host-{i}", address, 'Online', cpu, random.uniform(0, 100), 50.0,
+                               float(tick), "", history[address])))
+    return rows
+
+
+def measure(app, hosts, proxy, filter_text):
+    model = KeyedTableModel(HEADERS)
+    view, proxy = create_table_view(model, proxy=proxy)
+    view.resize(1400, 800)
+    view.show()
+    history = {}
+    model.set_rows(fleet_rows(hosts, 0, history))
+    view.sortByColumn(3, Qt.DescendingOrder)
+    if isinstance(proxy, KeyedSortFilterProxy):
+        proxy.set_filter_text(filter_text)
+    else:
+        proxy.setFilterFixedString(filter_text)
+    app.processEvents()
+
+    update = paint = 0.0
+    for tick in range(1, TICKS + 1):
+        rows = fleet_rows(hosts, tick, history)
+        start = time.perf_counter()
+        model.upsert_rows(rows)
+        middle = time.perf_counter()
+        app.processEvents()
+        update += middle - start
+        paint += time.perf_counter() - middle
+
+    view.selectRow(0)
+    start = time.perf_counter()
+    model.remove_keys(model.keys[::2])
+    app.processEvents()
+    remove = time.perf_counter() - start
+    view.close()
+    return (f"update {update / TICKS * 1000:6.1f} ms, repaint {paint / TICKS * 1000:5.1f} ms per tick, "
+            f"removing half {remove * 1000:6.1f} ms")
+
+
+def main():
+    hosts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    app = QApplication(sys.argv[:1])
+    for filter_text in ("", "host-1"):
+        label = f"filter {filter_text!r}" if filter_text else "no filter"
+        print(f"{hosts} hosts, {label}:")
+        print(f"  {'QSortFilterProxyModel':>22}: {measure(app, hosts, None, filter_text)}")
+        print(f"  {'KeyedSortFilterProxy':>22}: "
+              f"{measure(app, hosts, KeyedSortFilterProxy(filter_columns=(0, 1, 7)), filter_text)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Time latency monitor rounds against local TCP listeners.
+
+Usage: python benchmarks/bench_latency.py [targets] [concurrency]   (default: 500 64)
+Starts the given number of listeners on 127.0.0.1 plus one closed port,
+then times a few monitor rounds and prints the RTT statistics.
+"""
+import asyncio
+import os
+import socket
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+from latency import LatencyMonitor  # noqa: E402
+
+ROUNDS = 3
+
+
+def closed_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    servers = [await asyncio.start_server(lambda reader, writer: writer.close(), '127.0.0.1', 0)
+               for _ in range(count)]
+    targets = [f"127.0.0.1:{server.sockets[0].getsockname()[1]}" for server in servers]
+    targets.append(f"127.0.0.1:{closed_port()}")
+
+    monitor = LatencyMonitor(targets, concurrency=concurrency, timeout_s=1)
+    for i in range(ROUNDS):
+        start = time.perf_counter()
+        await monitor.run_round()
+        print(f"round {i + 1}: {len(targets)} targets in {time.perf_counter() - start:.3f} s")
+
+    stats = monitor.snapshot()
+    reachable = [s for s in stats if s['avg'] is not None]
+    print(f"reachable: {len(reachable)}, lost: {len(stats) - len(reachable)}")
+    print(f"mean avg RTT: {sum(s['avg'] for s in reachable) / len(reachable):.2f} ms, "
+          f"worst p95: {max(s['p95'] for s in reachable):.2f} ms")
+    for server in servers:
+        server.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
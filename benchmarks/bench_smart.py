@@ -0,0 +1,43 @@
+"""Time SMART collection with the fake smartctl: sequential, parallel and cached.
+
+Usage: python benchmarks/bench_smart.py [devices] [delay]   (default: 8 0.5)
+Runs benchmarks/fake_smartctl.py, which sleeps delay seconds per device
+query, then prints the report of the last collection.
+"""
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+from smart import SmartCollector  # noqa: E402
+
+FAKE_SMARTCTL = os.path.join(HERE, 'fake_smartctl.py')
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    print(f"{label:>24}: {time.perf_counter() - start:6.2f} s")
+    return result
+
+
+def main():
+    os.environ['FAKE_SMARTCTL_DEVICES'] = sys.argv[1] if len(sys.argv) > 1 else '8'
+    os.environ['FAKE_SMARTCTL_DELAY'] = sys.argv[2] if len(sys.argv) > 2 else '0.5'
+    with tempfile.TemporaryDirectory() as tmp:
+        history_path = os.path.join(tmp, 'smart.ndjson')
+        sequential = SmartCollector(FAKE_SMARTCTL, workers=1)
+        timed("sequential", sequential.collect)
+        collector = SmartCollector(FAKE_SMARTCTL, history_path=history_path)
+        timed("parallel", collector.collect)
+        timed("cached (within TTL)", collector.collect)
+        os.environ['FAKE_SMARTCTL_REALLOCATED'] = '8'
+        results = timed("forced", collector.collect, True)
+        print("\n".join(collector.report_lines(results)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Time the report summary over large histories.
+
+Usage: python benchmarks/bench_summary.py [samples ...]   (default: 1000000 5000000)
+The HistoryStore columns are filled directly with synthetic NumPy data; the
+rollup figures include folding every sample into the hourly rollups.
+"""
+import os
+import sys
+import time
+from array import array
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+from history import HistoryStore  # noqa: E402
+from metrics import CORE_METRIC_NAMES  # noqa: E402
+from summary import HourlyRollups, summarize  # noqa: E402
+
+THRESHOLDS = {'cpu.temperature': 80, 'memory.percent': 90, 'gpu.temp': 85, 'disk.max_percent': 90}
+
+
+def synthetic_store(n):
+    rng = np.random.default_rng(0)
+    store = HistoryStore(n)
+    times = time.time() - 2.0 * n + 2.0 * np.arange(n)
+    store.times = array('d', times.tobytes())
+    load = 50 + 40 * np.sin(np.arange(n) / 300.0)
+    for name in CORE_METRIC_NAMES:
+        values = np.clip(load + rng.normal(0, 5, n), 0, 100)
+        store.columns[name] = array('d', values.tobytes())
+    return store
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1_000_000, 5_000_000]
+    for n in sizes:
+        store = synthetic_store(n)
+
+        start = time.perf_counter()
+        summarize(store, thresholds=THRESHOLDS)
+        raw_s = time.perf_counter() - start
+
+        store.rollups = HourlyRollups(max_hours=n)
+        start = time.perf_counter()
+        store.update_rollups()
+        fold_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.rollups.summarize(store.times[0], store.times[-1], THRESHOLDS)
+        rollup_s = time.perf_counter() - start
+        print(f"{n:>9} samples ({len(store.rollups)} hours): raw summary {raw_s:6.2f} s, "
+              f"fold into rollups {fold_s:6.2f} s, summary from rollups {rollup_s * 1000:6.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Compare the old 8 KB chunked download loop with the throughput tester.
+
+Usage: python benchmarks/bench_throughput.py [seconds]   (default: 3)
+Starts the built-in server on 127.0.0.1 and downloads from it with one
+stream reading 8 KB chunks (what the old speed test did through
+iter_content), then with run_test and 1 and 4 streams.
+"""
+import os
+import socket
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+from throughput import HEADER, MAGIC, run_test, start_server  # noqa: E402
+
+
+def chunked_download(port, duration_s, chunk_size=8192):
+    total = 0
+    with socket.create_connection(('127.0.0.1', port)) as sock:
+        start = time.perf_counter()
+        sock.sendall(HEADER.pack(MAGIC, b'D', duration_s))
+        while True:
+            chunk = sock.recv(chunk_size)
+            if not chunk:
+                break
+            total += len(chunk)
+    return total * 8 / (time.perf_counter() - start) / 1e6
+
+
+def main():
+    duration_s = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    server = start_server('127.0.0.1', 0)
+    try:
+        print(f"{'8 KB recv, 1 stream':>28}: {chunked_download(server.port, duration_s):10.0f} Mbps")
+        for streams in (1, 4):
+            result = run_test(f"127.0.0.1:{server.port}", streams=streams, duration_s=duration_s)
+            print(f"{f'1 MB recv_into, {streams} streams':>28}: {result.mbps:10.0f} Mbps")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
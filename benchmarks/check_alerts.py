@@ -0,0 +1,94 @@
+"""Replay sample sequences through AlertEngine and check the transitions.
+
+Usage: python benchmarks/check_alerts.py
+Also checks that malformed rule specs are rejected with ValueError and that
+a rule failing on a sample does not stop the rules after it. Exits with an
+error if any check fails.
+"""
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+from alerts import AlertEngine, AlertRule  # noqa: E402
+
+RULE = {'name': 'cpu', 'metric': 'cpu.percent', 'threshold': 90, 'clear_threshold': 85,
+        'sustained_s': 10, 'cooldown_s': 0}
+
+# (описание, [(t, значение)], ожидаемые переходы [(t, состояние)])
+SEQUENCES = [
+    ("fires after being sustained",
+     [(0, 95), (5, 95), (10, 95)], [(10, 'firing')]),
+    ("a short breach does not fire",
+     [(0, 95), (5, 95), (6, 50), (12, 95)], []),
+    ("a single spike after a clear does not re-fire",
+     [(0, 95), (5, 95), (10, 95), (11, 50), (20, 95)], [(10, 'firing'), (11, 'cleared')]),
+    ("re-fires once sustained again after a clear",
+     [(0, 95), (5, 95), (10, 95), (11, 50), (20, 95), (25, 95), (30, 95)],
+     [(10, 'firing'), (11, 'cleared'), (30, 'firing')]),
+    ("hysteresis: staying above the clear threshold keeps it active",
+     [(0, 95), (10, 95), (11, 87), (12, 95)], [(10, 'firing')]),
+]
+
+
+# Спецификации, которые должны отвергаться с ValueError
+MALFORMED_SPECS = [
+    "cpu.percent > 90",
+    {'metric': 'cpu.percent', 'threshold': None},
+    {'metric': 'cpu.percent'},
+    {'metric': 5, 'threshold': 90},
+    {'metric': 'cpu.percent', 'threshold': 90, 'op': ['>']},
+    {'metric': 'cpu.percent', 'threshold': 90, 'message': "{val}"},
+    {'metric': 'cpu.percent', 'threshold': 90, 'message': "{value:d}"},
+    {'metric': 'cpu.percent', 'threshold': 90, 'severity': 3},
+]
+
+
+def check_malformed(spec):
+    try:
+        AlertRule(spec)
+    except ValueError:
+        return True
+    return False
+
+
+def check_bad_rule_isolated():
+    """A rule whose metric is not a number must not keep later rules from firing"""
+    engine = AlertEngine([{'name': 'bad', 'metric': 'cpu.state', 'threshold': 1},
+                          {'name': 'mem', 'metric': 'memory.percent', 'threshold': 90}])
+    fired = []
+    for t in range(3):
+        sample = {'t_ns': t * 10 ** 9, 'timestamp': t, 'cpu': {'state': 'busy'}, 'memory': {'percent': 95}}
+        fired += [transition['rule'] for transition in engine.evaluate(sample)]
+    return fired == ['mem']
+
+
+def replay(samples):
+    engine = AlertEngine([RULE])
+    transitions = []
+    for t, value in samples:
+        for transition in engine.evaluate({'t_ns': int(t * 1e9), 'timestamp': t, 'cpu': {'percent': value}}):
+            transitions.append((t, transition['state']))
+    return transitions
+
+
+def main():
+    failed = 0
+    for description, samples, expected in SEQUENCES:
+        got = replay(samples)
+        ok = got == expected
+        failed += not ok
+        print(f"{'ok' if ok else 'FAIL':>4}  {description}" + ("" if ok else f": expected {expected}, got {got}"))
+    for spec in MALFORMED_SPECS:
+        ok = check_malformed(spec)
+        failed += not ok
+        print(f"{'ok' if ok else 'FAIL':>4}  rejects {spec!r}")
+    ok = check_bad_rule_isolated()
+    failed += not ok
+    print(f"{'ok' if ok else 'FAIL':>4}  a failing rule does not stop the others")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""Check notification delivery against a local SMTP stand-in.
+
+Usage: python benchmarks/check_notifications.py
+Starts a minimal SMTP server on 127.0.0.1 that can accept mail, answer
+with a temporary 4xx error or hang without a greeting, then checks that
+the dispatcher sends one digest per batch window, retries a temporary
+failure with backoff, reports the final failure through on_error, and
+shows toasts on time while the SMTP server hangs. Exits with an error if
+any check fails.
+"""
+import email
+import os
+import socket
+import sys
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+from notifications import NotificationDispatcher, SmtpSink, ToastSink  # noqa: E402
+
+
+class SmtpStandIn:
+    """SMTP server speaking just enough of the protocol for smtplib.
+
+    ``replies`` gives the reply to each successive DATA in turn (the last
+    one repeats); with ``hang`` set, connections get no greeting at all.
+    """
+
+    def __init__(self, replies=("250 OK",), hang=False):
+        self.replies = list(replies)
+        self.hang = hang
+        self.messages = []
+        self.attempts = []
+        self.lock = threading.Lock()
+        self.listener = socket.create_server(('127.0.0.1', 0))
+        self.port = self.listener.getsockname()[1]
+        self.closed = threading.Event()
+        threading.Thread(target=self.accept, daemon=True).start()
+
+    def accept(self):
+        while not self.closed.is_set():
+            try:
+                conn, _ = self.listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self.session, args=(conn,), daemon=True).start()
+
+    def session(self, conn):
+        with conn, conn.makefile('rb') as reader:
+            if self.hang:
+                self.closed.wait()
+                return
+            conn.sendall(b"220 stand-in ESMTP\r\n")
+            for line in reader:
+                command = line.strip().upper()
+                if command.startswith((b'EHLO', b'HELO')):
+                    conn.sendall(b"250 stand-in\r\n")
+                elif command == b'DATA':
+                    conn.sendall(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                    body = []
+                    for data_line in reader:
+                        if data_line == b".\r\n":
+                            break
+                        body.append(data_line)
+                    with self.lock:
+                        reply = self.replies[min(len(self.attempts), len(self.replies) - 1)]
+                        self.attempts.append(time.monotonic())
+                        if reply.startswith('2'):
+                            message = email.message_from_bytes(b"".join(body))
+                            self.messages.append(message.get_payload(decode=True).decode('utf-8'))
+                    conn.sendall(reply.encode() + b"\r\n")
+                elif command == b'QUIT':
+                    conn.sendall(b"221 Bye\r\n")
+                    return
+                else:
+                    conn.sendall(b"250 OK\r\n")
+
+    def close(self):
+        self.closed.set()
+        self.listener.close()
+
+
+def smtp_sink(server, batch_window_s, timeout=5):
+    return SmtpSink('127.0.0.1', server.port, 'monitor@example.com', ['admin@example.com'],
+                    use_tls=False, batch_window_s=batch_window_s, timeout=timeout)
+
+
+def wait_until(condition, timeout_s):
+    deadline = time.monotonic() + timeout_s
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def check_one_digest_per_window():
+    """Alerts within one batch window arrive as a single e-mail"""
+    server = SmtpStandIn()
+    dispatcher = NotificationDispatcher([smtp_sink(server, batch_window_s=0.5)])
+    dispatcher.start()
+    for i in range(5):
+        dispatcher.notify('CPU', f"High temperature: {90 + i}°C")
+    first = wait_until(lambda: server.messages, 3.0)
+    time.sleep(0.7)
+    ok = first and len(server.messages) == 1 and all(f"{90 + i}" in server.messages[0] for i in range(5))
+    dispatcher.notify('Disk', "High usage")
+    ok = ok and wait_until(lambda: len(server.messages) == 2, 3.0) and "High usage" in server.messages[1]
+    dispatcher.stop()
+    server.close()
+    return ok
+
+
+def check_retry_after_temporary_error():
+    """A 451 reply is retried after the backoff and the batch is sent once"""
+    backoff_s = 0.5
+    server = SmtpStandIn(replies=("451 Try again later", "250 OK"))
+    errors = []
+    dispatcher = NotificationDispatcher([smtp_sink(server, batch_window_s=0.1)], backoff_s=backoff_s,
+                                        on_error=errors.append)
+    dispatcher.start()
+    dispatcher.notify('Memory', "High usage: 95%")
+    delivered = wait_until(lambda: server.messages, 5.0)
+    dispatcher.stop()
+    server.close()
+    return (delivered and len(server.attempts) == 2 and len(server.messages) == 1
+            and server.attempts[1] - server.attempts[0] >= backoff_s and not errors)
+
+
+def check_error_after_final_failure():
+    """After max_retries failed retries on_error is called once and the batch is counted as failed"""
+    server = SmtpStandIn(replies=("451 Try again later",))
+    errors = []
+    dispatcher = NotificationDispatcher([smtp_sink(server, batch_window_s=0.1)], max_retries=2, backoff_s=0.1,
+                                        on_error=errors.append)
+    dispatcher.start()
+    dispatcher.notify('GPU', "High temperature: 95°C")
+    dispatcher.notify('GPU', "High temperature: 96°C")
+    reported = wait_until(lambda: errors, 5.0)
+    time.sleep(0.5)
+    dispatcher.stop()
+    server.close()
+    return reported and len(errors) == 1 and len(server.attempts) == 3 and dispatcher.failed == 2
+
+
+def check_toasts_not_delayed_by_smtp():
+    """Toasts are shown within their own batch window while the SMTP server hangs"""
+    server = SmtpStandIn(hang=True)
+    shown = []
+    toast = ToastSink(lambda title, message: shown.append(time.monotonic()), batch_window_s=0.05)
+    dispatcher = NotificationDispatcher([smtp_sink(server, batch_window_s=0.01, timeout=10), toast])
+    dispatcher.start()
+    dispatcher.notify('CPU', "first")
+    time.sleep(0.3)
+    # SMTP-обработчик сейчас висит на соединении; второе уведомление всё равно должно дойти до тоста
+    sent = time.monotonic()
+    dispatcher.notify('CPU', "second")
+    ok = wait_until(lambda: len(shown) == 2, 2.0) and shown[1] - sent < 0.5
+    server.close()
+    return ok
+
+
+CHECKS = [
+    ("one digest per batch window", check_one_digest_per_window),
+    ("retry with backoff after a temporary 4xx", check_retry_after_temporary_error),
+    ("on_error after the final failure", check_error_after_final_failure),
+    ("toasts are not delayed while SMTP hangs", check_toasts_not_delayed_by_smtp),
+]
+
+
+def main():
+    failed = 0
+    for description, check in CHECKS:
+        ok = check()
+        failed += not ok
+        print(f"{'ok' if ok else 'FAIL':>4}  {description}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Stand-in for smartctl that answers with canned JSON.
+
+Environment: FAKE_SMARTCTL_DEVICES (default 8) devices /dev/sda.. are
+reported by --scan; every device query sleeps FAKE_SMARTCTL_DELAY seconds
+(default 0.5). Even devices are SATA SSDs, odd ones NVMe drives. /dev/sda
+reports FAKE_SMARTCTL_REALLOCATED reallocated sectors (default 0), and
+unknown device names fail to open.
+"""
+import json
+import os
+import sys
+import time
+
+
+def ata_report(name):
+    reallocated = int(os.environ.get('FAKE_SMARTCTL_REALLOCATED', 0)) if name == '/dev/sda' else 0
+    return {
+        'smartctl': {'exit_status': 0},
+        'device': {'name': name, 'type': 'sat', 'protocol': 'ATA'},
+        'model_name': 'FAKE SSD 1TB',
+        'serial_number': 'S' + name[-1].upper() * 8,
+        'smart_status': {'passed': True},
+        'temperature': {'current': 35},
+        'power_on_time': {'hours': 12345},
+        'ata_smart_attributes': {'table': [
+            {'id': 5, 'name': 'Reallocated_Sector_Ct', 'value': 100, 'raw': {'value': reallocated}},
+            {'id': 177, 'name': 'Wear_Leveling_Count', 'value': 93, 'raw': {'value': 70}},
+            {'id': 197, 'name': 'Current_Pending_Sector', 'value': 100, 'raw': {'value': 0}},
+        ]},
+    }
+
+
+def nvme_report(name):
+    return {
+        'smartctl': {'exit_status': 0},
+        'device': {'name': name, 'type': 'nvme', 'protocol': 'NVMe'},
+        'model_name': 'FAKE NVMe 2TB',
+        'serial_number': 'N' + name[-1].upper() * 8,
+        'smart_status': {'passed': True},
+        'nvme_smart_health_information_log': {
+            'temperature': 41, 'percentage_used': 12, 'media_errors': 0, 'power_on_hours': 2000},
+    }
+
+
+def main(args):
+    count = int(os.environ.get('FAKE_SMARTCTL_DEVICES', 8))
+    names = [f"/dev/sd{chr(ord('a') + i)}" for i in range(count)]
+    if '--scan' in args:
+        print(json.dumps({'devices': [{'name': name, 'type': 'sat' if i % 2 == 0 else 'nvme'}
+                                      for i, name in enumerate(names)]}))
+        return 0
+    time.sleep(float(os.environ.get('FAKE_SMARTCTL_DELAY', 0.5)))
+    name = args[-2] if args[-1] == '--json' else args[-1]
+    if name not in names:
+        print(json.dumps({'smartctl': {'exit_status': 2, 'messages': [
+            {'string': f"{name}: Unable to detect device type", 'severity': 'error'}]}}))
+        return 2
+    index = names.index(name)
+    print(json.dumps(ata_report(name) if index % 2 == 0 else nvme_report(name)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,58 @@
+"""Synthetic collector samples for the benchmarks, generated on demand"""
+import math
+import time
+from collections.abc import Sequence
+
+NICS = ['lo', 'eth0', 'wlan0']
+MOUNTS = ['/', '/home']
+
+
+def make_sample(i, start=None):
+    t = (start or 1.7e9) + i * 2.0
+    load = 50 + 40 * math.sin(i / 300.0)
+    return {
+        't_ns': i * 2_000_000_000,
+        'timestamp': t,
+        'cpu': {
+            'percent': load,
+            'frequency': {'current': 2400.0 + i % 800, 'min': 800.0, 'max': 4200.0},
+            'cores_physical': 8,
+            'cores_logical': 16,
+            'temperature': 45 + load / 3,
+        },
+        'memory': {
+            'virtual': {'total': 16 * 2 ** 30, 'available': 8 * 2 ** 30, 'percent': 40 + i % 20,
+                        'used': 6 * 2 ** 30 + i, 'free': 2 * 2 ** 30, 'active': 5 * 2 ** 30,
+                        'inactive': 2 ** 30, 'buffers': 2 ** 28, 'cached': 2 ** 31, 'shared': 2 ** 27,
+                        'slab': 2 ** 27},
+            'swap': {'total': 2 ** 31, 'used': 2 ** 20, 'free': 2 ** 31 - 2 ** 20, 'percent': 0.1,
+                     'sin': 0, 'sout': 0},
+        },
+        'disk': {m: {'total': 5e11, 'used': 2e11 + i, 'free': 3e11 - i, 'percent': 40.0} for m in MOUNTS},
+        'gpu': {'load': load / 2, 'temp': 50 + load / 4, 'mem_used': 2048.0, 'mem_total': 8192.0},
+        'network': {n: {'bytes_sent': i * 1500, 'bytes_recv': i * 9000, 'packets_sent': i, 'packets_recv': i * 6,
+                        'errin': 0, 'errout': 0, 'dropin': 0, 'dropout': 0} for n in NICS},
+        'process': {'cpu_percent': 1.5, 'rss': 150 * 2 ** 20},
+    }
+
+
+class SyntheticHistory(Sequence):
+    """A history of n samples that builds each sample only when accessed"""
+
+    def __init__(self, n):
+        self.n = n
+        self.start = time.time() - 2.0 * n
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError(i)
+        return make_sample(i, self.start)
+
+    def __iter__(self):
+        for i in range(self.n):
+            yield make_sample(i, self.start)
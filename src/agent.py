@@ -0,0 +1,208 @@
+"""Headless monitoring agent.
+
+Samples the host every interval and serves the latest sample to
+aggregators over TCP. Every message is a frame: a 4-byte big-endian
+payload length, a 1-byte message type, then the payload. The agent greets
+each connection with HELLO (protocol version, sample interval, host
+name); a client then either sends GET for the latest sample or SUBSCRIBE
+to have every new sample pushed. A SAMPLE is a timestamp and a fixed list
+of float32 metrics (NaN when unavailable), 45 bytes per frame.
+
+Run on each host:  python agent.py [--host ADDRESS] [--port 5300] [--interval 2]
+Only psutil is needed; the agent does not import PyQt.
+"""
+import argparse
+import asyncio
+import math
+import os
+import socket
+import struct
+import sys
+import time
+
+import psutil
+
+DEFAULT_PORT = 5300
+DEFAULT_INTERVAL_S = 2.0
+PROTOCOL_VERSION = 1
+MAX_FRAME = 64 * 1024
+# Подписчик, не успевающий читать, отключается, чтобы не копить данные в памяти
+MAX_WRITE_BUFFER = 256 * 1024
+
+HELLO, GET, SAMPLE, SUBSCRIBE = 1, 2, 3, 4
+
+FRAME_HEADER = struct.Struct('!IB')
+HELLO_HEADER = struct.Struct('!HI')
+SAMPLE_FIELDS = ('cpu_percent', 'memory_percent', 'swap_percent', 'disk_percent',
+                 'net_sent_rate', 'net_recv_rate', 'load_1m', 'cpu_temperature')
+SAMPLE_STRUCT = struct.Struct('!d' + 'f' * len(SAMPLE_FIELDS))
+
+
+def pack_frame(kind, payload=b''):
+    return FRAME_HEADER.pack(len(payload), kind) + payload
+
+
+async def read_frame(reader):
+    """(type, payload) of the next frame; raises ValueError for oversized frames"""
+    length, kind = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    if length > MAX_FRAME:
+        raise ValueError(f"Frame of {length} bytes exceeds the limit")
+    return kind, await reader.readexactly(length)
+
+
+def pack_hello(name, interval_s):
+    return HELLO_HEADER.pack(PROTOCOL_VERSION, int(interval_s * 1000)) + name.encode('utf-8')
+
+
+def unpack_hello(payload):
+    """(name, interval_s) of a HELLO payload; raises ValueError if it is malformed"""
+    if len(payload) < HELLO_HEADER.size:
+        raise ValueError(f"HELLO of {len(payload)} bytes is too short")
+    version, interval_ms = HELLO_HEADER.unpack_from(payload)
+    if version != PROTOCOL_VERSION:
+        raise ValueError(f"Unsupported protocol version {version}")
+    return payload[HELLO_HEADER.size:].decode('utf-8', 'replace'), interval_ms / 1000
+
+
+def pack_sample(sample):
+    return SAMPLE_STRUCT.pack(sample['timestamp'], *(
+        math.nan if sample.get(name) is None else sample[name] for name in SAMPLE_FIELDS))
+
+
+def unpack_sample(payload):
+    """Sample dict of a SAMPLE payload; raises ValueError if it is malformed"""
+    if len(payload) != SAMPLE_STRUCT.size:
+        raise ValueError(f"SAMPLE of {len(payload)} bytes, expected {SAMPLE_STRUCT.size}")
+    timestamp, *values = SAMPLE_STRUCT.unpack(payload)
+    sample = {'timestamp': timestamp}
+    sample.update((name, None if math.isnan(value) else value) for name, value in zip(SAMPLE_FIELDS, values))
+    return sample
+
+
+class SampleCollector:
+    """The agent's metrics; network rates are computed between calls"""
+
+    def __init__(self):
+        psutil.cpu_percent(interval=None)
+        self.last_net = None
+        self.last_time = None
+
+    def cpu_temperature(self):
+        try:
+            temps = psutil.sensors_temperatures() if hasattr(psutil, 'sensors_temperatures') else None
+        except OSError:
+            return None
+        if not temps:
+            return None
+        for name in ('coretemp', 'k10temp', 'cpu_thermal'):
+            if name in temps:
+                return temps[name][0].current
+        return next(iter(temps.values()))[0].current
+
+    def disk_percent(self):
+        """Usage of the fullest local partition"""
+        percents = []
+        for part in psutil.disk_partitions(all=False):
+            try:
+                percents.append(psutil.disk_usage(part.mountpoint).percent)
+            except OSError:
+                continue
+        return max(percents) if percents else None
+
+    def collect(self):
+        now = time.time()
+        net = psutil.net_io_counters()
+        sent_rate = recv_rate = None
+        if self.last_net is not None and now > self.last_time:
+            sent_rate = (net.bytes_sent - self.last_net.bytes_sent) / (now - self.last_time)
+            recv_rate = (net.bytes_recv - self.last_net.bytes_recv) / (now - self.last_time)
+        self.last_net, self.last_time = net, now
+        return {
+            'timestamp': now,
+            'cpu_percent': psutil.cpu_percent(interval=None),
+            'memory_percent': psutil.virtual_memory().percent,
+            'swap_percent': psutil.swap_memory().percent,
+            'disk_percent': self.disk_percent(),
+            'net_sent_rate': sent_rate,
+            'net_recv_rate': recv_rate,
+            'load_1m': os.getloadavg()[0] if hasattr(os, 'getloadavg') else None,
+            'cpu_temperature': self.cpu_temperature(),
+        }
+
+
+class Agent:
+    def __init__(self, name=None, interval_s=DEFAULT_INTERVAL_S, collector=None):
+        self.name = name or socket.gethostname()
+        self.interval_s = interval_s
+        self.collector = collector or SampleCollector()
+        self.latest_frame = None
+        self.subscribers = set()
+        self.sampler = None
+        self.hello_frame = pack_frame(HELLO, pack_hello(self.name, interval_s))
+
+    async def sample_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # psutil может надолго заблокироваться (например, на зависшем NFS), поэтому сбор идёт в потоке
+            try:
+                sample = await loop.run_in_executor(None, self.collector.collect)
+            except Exception as e:
+                # Старый сэмпл больше не раздаём: агрегаторы увидят, что данных нет
+                print(f"Sampling failed: {type(e).__name__}: {e}", file=sys.stderr, flush=True)
+                self.latest_frame = None
+                await asyncio.sleep(self.interval_s)
+                continue
+            self.latest_frame = pack_frame(SAMPLE, pack_sample(sample))
+            for writer in list(self.subscribers):
+                if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                    self.subscribers.discard(writer)
+                    writer.close()
+                else:
+                    writer.write(self.latest_frame)
+            await asyncio.sleep(self.interval_s)
+
+    async def handle(self, reader, writer):
+        writer.write(self.hello_frame)
+        try:
+            while True:
+                kind, _ = await read_frame(reader)
+                if kind == SUBSCRIBE:
+                    self.subscribers.add(writer)
+                if kind in (GET, SUBSCRIBE) and self.latest_frame is not None:
+                    writer.write(self.latest_frame)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+    async def start(self, host=None, port=DEFAULT_PORT):
+        """Start sampling and listening; returns the asyncio server"""
+        self.sampler = asyncio.ensure_future(self.sample_loop())
+        return await asyncio.start_server(self.handle, host, port)
+
+
+async def serve(host, port, name, interval_s):
+    server = await Agent(name, interval_s).start(host, port)
+    print(f"Agent listening on port {server.sockets[0].getsockname()[1]}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve this host's metrics to System Monitor aggregators")
+    parser.add_argument('--host', default=None, help="address to listen on (default: all)")
+    parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('-i', '--interval', type=float, default=DEFAULT_INTERVAL_S, help="seconds between samples")
+    parser.add_argument('-n', '--name', default=None, help="name reported to aggregators (default: host name)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.name, args.interval))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+
+from timebase import to_iso
+
+
+class AlertStore:
+    """Persistent alert history in an append-only NDJSON log.
+
+    Only a compact index lives in memory: per alert its time, file offset,
+    component id and severity id, plus the positions of each component's
+    alerts. Queries run against the index and only the requested rows are
+    read back from the log.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.times = array('d')
+        self.offsets = array('q')
+        self.component_ids = array('H')
+        self.severity_ids = array('B')
+        self.components = []
+        self.severities = []
+        self.by_component = {}
+        self.file = open(path, 'a+b')
+        self.load_index()
+
+    def __len__(self):
+        return len(self.times)
+
+    def load_index(self):
+        self.file.seek(0)
+        offset = 0
+        for line in self.file:
+            if line.endswith(b'\n'):
+                try:
+                    record = json.loads(line)
+                    self.add_to_index(offset, record)
+                except (ValueError, KeyError):
+                    pass
+            offset += len(line)
+        if offset and not line.endswith(b'\n'):
+            # Обрывок записи после сбоя: иначе следующая запись склеится с ним и потеряется
+            self.file.truncate(offset - len(line))
+            self.file.flush()
+
+    def intern(self, names, value):
+        try:
+            return names.index(value)
+        except ValueError:
+            names.append(value)
+            return len(names) - 1
+
+    def add_to_index(self, offset, record):
+        position = len(self.times)
+        component_id = self.intern(self.components, record['component'])
+        self.times.append(record['timestamp'])
+        self.offsets.append(offset)
+        self.component_ids.append(component_id)
+        self.severity_ids.append(self.intern(self.severities, record.get('severity', 'warning')))
+        self.by_component.setdefault(component_id, array('q')).append(position)
+        return position
+
+    def append(self, timestamp, component, message, severity='warning'):
+        """Write an alert to the log and return its position"""
+        record = {'timestamp': timestamp, 'component': component, 'severity': severity, 'message': message}
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        with self.lock:
+            self.file.seek(0, os.SEEK_END)
+            offset = self.file.tell()
+            self.file.write(line)
+            self.file.flush()
+            return self.add_to_index(offset, record)
+
+    def matches(self, position, component=None, severity=None, start=None, end=None):
+        if component is not None and self.components[self.component_ids[position]] != component:
+            return False
+        if severity is not None and self.severities[self.severity_ids[position]] != severity:
+            return False
+        t = self.times[position]
+        return (start is None or t >= start) and (end is None or t <= end)
+
+    def query(self, component=None, severity=None, start=None, end=None):
+        """Positions of the matching alerts, newest first"""
+        with self.lock:
+            i0 = 0 if start is None else bisect_left(self.times, start)
+            i1 = len(self.times) if end is None else bisect_right(self.times, end)
+
+            if component is not None:
+                if component not in self.components:
+                    return array('q')
+                candidates = self.by_component.get(self.components.index(component), array('q'))
+                candidates = candidates[bisect_left(candidates, i0):bisect_left(candidates, i1)]
+            else:
+                candidates = array('q', range(i0, i1))
+
+            if severity is not None:
+                if severity not in self.severities:
+                    return array('q')
+                severity_id = self.severities.index(severity)
+                candidates = array('q', (p for p in candidates if self.severity_ids[p] == severity_id))
+
+        candidates.reverse()
+        return candidates
+
+    def read(self, positions):
+        """Load the alerts at the given positions from the log"""
+        records = []
+        with self.lock:
+            for position in positions:
+                self.file.seek(self.offsets[position])
+                record = json.loads(self.file.readline())
+                record['time'] = to_iso(record['timestamp'])[:19].replace('T', ' ')
+                records.append(record)
+        return records
+
+    def recent(self, count):
+        with self.lock:
+            first = max(0, len(self.times) - count)
+            positions = range(len(self.times) - 1, first - 1, -1)
+        return self.read(positions)
+
+    def close(self):
+        with self.lock:
+            self.file.close()
@@ -0,0 +1,256 @@
+import math
+import operator
+import threading
+from collections import deque
+
+from metrics import get_path
+
+OPERATORS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le}
+AGGREGATES = ('last', 'avg', 'max', 'min')
+
+
+class SlidingWindow:
+    """Time-based sliding window with O(1) amortised avg/max/min updates.
+
+    Keeps a running sum for the average and monotonic deques for the
+    extremes, so each push costs O(1) amortised regardless of window length.
+    """
+
+    def __init__(self, length_s):
+        self.length_s = length_s
+        self.samples = deque()
+        self.total = 0.0
+        self.max_candidates = deque()
+        self.min_candidates = deque()
+
+    def push(self, t, value):
+        self.samples.append((t, value))
+        self.total += value
+        while self.max_candidates and self.max_candidates[-1][1] <= value:
+            self.max_candidates.pop()
+        self.max_candidates.append((t, value))
+        while self.min_candidates and self.min_candidates[-1][1] >= value:
+            self.min_candidates.pop()
+        self.min_candidates.append((t, value))
+
+        horizon = t - self.length_s
+        while self.samples[0][0] < horizon:
+            self.total -= self.samples.popleft()[1]
+        while self.max_candidates[0][0] < horizon:
+            self.max_candidates.popleft()
+        while self.min_candidates[0][0] < horizon:
+            self.min_candidates.popleft()
+
+    def value(self, aggregate):
+        if aggregate == 'avg':
+            return self.total / len(self.samples)
+        if aggregate == 'max':
+            return self.max_candidates[0][1]
+        if aggregate == 'min':
+            return self.min_candidates[0][1]
+        return self.samples[-1][1]
+
+
+def rule_number(spec, key, name, default=None):
+    value = spec.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"'{key}' of rule '{name}' must be a number, got {value!r}")
+    return float(value)
+
+
+def rule_text(spec, key, name, default):
+    value = spec.get(key) or default
+    if not isinstance(value, str):
+        raise ValueError(f"'{key}' of rule '{name}' must be a string, got {value!r}")
+    return value
+
+
+class AlertRule:
+    """A compiled alert rule.
+
+    ``metric`` is a dotted path into a sample; a ``*`` segment matches every
+    key at that level (e.g. ``disk.*.percent``) and gives one independent
+    alert instance per key. The rule fires once the (optionally aggregated)
+    value has satisfied ``op threshold`` for ``sustained_s`` seconds, clears
+    only after crossing ``clear_threshold`` in the other direction, and does
+    not fire again within ``cooldown_s`` of the previous firing.
+    """
+
+    def __init__(self, spec):
+        """Compile spec; raises ValueError if it is malformed"""
+        if not isinstance(spec, dict):
+            raise ValueError(f"Alert rule must be an object, got {spec!r}")
+        self.metric = spec.get('metric')
+        if not isinstance(self.metric, str) or not self.metric:
+            raise ValueError(f"Alert rule needs a 'metric' string, got {self.metric!r}")
+        self.name = rule_text(spec, 'name', self.metric, self.metric)
+        self.component = rule_text(spec, 'component', self.name, self.name)
+        self.path = self.metric.split('.')
+        self.op_symbol = spec.get('op', '>')
+        if not isinstance(self.op_symbol, str) or self.op_symbol not in OPERATORS:
+            raise ValueError(f"Unknown operator in rule '{self.name}': {self.op_symbol!r}")
+        self.op = OPERATORS[self.op_symbol]
+        self.threshold = rule_number(spec, 'threshold', self.name)
+        self.clear_threshold = rule_number(spec, 'clear_threshold', self.name, self.threshold)
+        self.sustained_s = rule_number(spec, 'sustained_s', self.name, 0)
+        self.cooldown_s = rule_number(spec, 'cooldown_s', self.name, 0)
+        self.aggregate = spec.get('aggregate', 'last')
+        if not isinstance(self.aggregate, str) or self.aggregate not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate in rule '{self.name}': {self.aggregate!r}")
+        self.window_s = rule_number(spec, 'window_s', self.name, 0)
+        self.severity = rule_text(spec, 'severity', self.name, 'warning')
+        self.message = rule_text(spec, 'message', self.name,
+                                 f"{self.metric} {self.op_symbol} {self.threshold:g}: {{value:.1f}}")
+        # Шаблон проверяется сразу, а не при первом срабатывании
+        try:
+            self.message.format(value=0.0, instance='')
+        except (KeyError, IndexError, ValueError, AttributeError, TypeError) as e:
+            raise ValueError(f"Invalid message in rule '{self.name}': {self.message!r} ({e!r})") from None
+        self.wildcard = '*' in self.path
+
+    def values(self, data):
+        """Yield (instance, value) pairs of the rule's metric in a sample"""
+        if not self.wildcard:
+            yield None, get_path(data, *self.path)
+            return
+
+        star = self.path.index('*')
+        parent = get_path(data, *self.path[:star])
+        if not isinstance(parent, dict):
+            return
+        for key, child in parent.items():
+            yield key, get_path(child, *self.path[star + 1:])
+
+    def clears(self, value):
+        if self.op_symbol in ('>', '>='):
+            return value < self.clear_threshold
+        return value > self.clear_threshold
+
+    def format_message(self, instance, value):
+        display = instance.replace('_drive', ':') if instance else ''
+        return self.message.format(value=value, instance=display)
+
+
+class RuleState:
+    __slots__ = ('active', 'breach_since', 'last_fired', 'window')
+
+    def __init__(self, rule):
+        self.active = False
+        self.breach_since = None
+        self.last_fired = -math.inf
+        self.window = SlidingWindow(rule.window_s) if rule.window_s > 0 else None
+
+
+class AlertEngine:
+    """Evaluates compiled alert rules incrementally, one sample at a time.
+
+    Work per sample is O(1) per rule instance. Only state transitions are
+    returned, so the caller can run this in the collector thread and post
+    just the transitions to the GUI.
+    """
+
+    def __init__(self, specs=()):
+        self.lock = threading.Lock()
+        self.rules = []
+        self.states = {}
+        # Правила, ошибка которых уже выведена
+        self.failed = set()
+        self.set_rules(specs)
+
+    def set_rules(self, specs):
+        rules = [AlertRule(spec) for spec in specs]
+        with self.lock:
+            self.rules = rules
+            self.states = {}
+            self.failed = set()
+
+    def evaluate(self, data):
+        t = data['t_ns'] / 1e9
+        transitions = []
+        with self.lock:
+            for index, rule in enumerate(self.rules):
+                # Ошибка одного правила не должна мешать остальным
+                try:
+                    self.evaluate_rule(index, rule, data, t, transitions)
+                except Exception as e:
+                    if index not in self.failed:
+                        self.failed.add(index)
+                        print(f"Error evaluating alert rule '{rule.name}': {e!r}")
+        return transitions
+
+    def evaluate_rule(self, index, rule, data, t, transitions):
+        for instance, raw in rule.values(data):
+            if raw is None:
+                continue
+            state = self.states.get((index, instance))
+            if state is None:
+                state = self.states[(index, instance)] = RuleState(rule)
+            transition = self.update(rule, state, instance, t, float(raw))
+            if transition:
+                transition['timestamp'] = data['timestamp']
+                transitions.append(transition)
+
+    def update(self, rule, state, instance, t, value):
+        if state.window is not None:
+            state.window.push(t, value)
+            value = state.window.value(rule.aggregate)
+
+        # Переход собирается до изменения состояния: если он не удастся, состояние останется прежним
+        if state.active:
+            if rule.clears(value):
+                transition = self.transition('cleared', rule, instance, value)
+                state.active = False
+                # После сброса условие снова должно продержаться sustained_s
+                state.breach_since = None
+                return transition
+            return None
+
+        if not rule.op(value, rule.threshold):
+            state.breach_since = None
+            return None
+        if state.breach_since is None:
+            state.breach_since = t
+        if t - state.breach_since < rule.sustained_s or t - state.last_fired < rule.cooldown_s:
+            return None
+
+        transition = self.transition('firing', rule, instance, value)
+        state.active = True
+        state.last_fired = t
+        state.breach_since = None
+        return transition
+
+    def transition(self, kind, rule, instance, value):
+        return {
+            'state': kind,
+            'rule': rule.name,
+            'component': rule.component,
+            'severity': rule.severity,
+            'instance': instance,
+            'value': value,
+            'message': rule.format_message(instance, value),
+        }
+
+
+def default_rules(settings):
+    """Rules equivalent to the threshold settings, plus any user-defined rules"""
+    sustain = settings.get('alert_sustained_s', 10)
+    hysteresis = settings.get('alert_hysteresis', 5)
+    cooldown = settings.get('alert_cooldown_s', 300)
+    thresholds = [
+        ('CPU', 'cpu.temperature', 'cpu_temp_threshold', "High temperature: {value:.0f}°C"),
+        ('Memory', 'memory.virtual.percent', 'ram_threshold', "High usage: {value:.0f}%"),
+        ('GPU', 'gpu.temp', 'gpu_temp_threshold', "High temperature: {value:.0f}°C"),
+        ('Disk', 'disk.*.percent', 'disk_threshold', "High usage on {instance}: {value:.0f}%"),
+    ]
+    rules = [{
+        'name': f"{component} {key}",
+        'component': component,
+        'metric': metric,
+        'op': '>',
+        'threshold': settings[key],
+        'clear_threshold': settings[key] - hysteresis,
+        'sustained_s': sustain,
+        'cooldown_s': cooldown,
+        'message': message,
+    } for component, metric, key, message in thresholds]
+    return rules + list(settings.get('alert_rules', []))
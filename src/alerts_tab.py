@@ -0,0 +1,73 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QTableView
+import time
+from models import AlertLogModel
+
+
+class AlertsTab(QWidget):
+    TIME_RANGES = {"All time": None, "Last hour": 3600, "Last 24 hours": 86400, "Last 7 days": 7 * 86400}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        # Filters
+        filter_layout = QHBoxLayout()
+        self.component_combo = QComboBox()
+        self.severity_combo = QComboBox()
+        self.range_combo = QComboBox()
+        self.range_combo.addItems(self.TIME_RANGES.keys())
+        self.count_label = QLabel()
+        for label, combo in (("Component:", self.component_combo), ("Severity:", self.severity_combo),
+                             ("Time:", self.range_combo)):
+            filter_layout.addWidget(QLabel(label))
+            filter_layout.addWidget(combo)
+        filter_layout.addStretch()
+        filter_layout.addWidget(self.count_label)
+        layout.addLayout(filter_layout)
+
+        # Rows are loaded lazily from the alert log
+        self.model = AlertLogModel(self.parent.alert_store, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        self.refresh_filter_choices()
+        self.update_count()
+        for combo in (self.component_combo, self.severity_combo, self.range_combo):
+            combo.activated.connect(self.apply_filters)
+
+    def refresh_filter_choices(self):
+        store = self.parent.alert_store
+        for combo, values in ((self.component_combo, store.components), (self.severity_combo, store.severities)):
+            if combo.count() == len(values) + 1:
+                continue
+            current = combo.currentText()
+            combo.clear()
+            combo.addItems(["All"] + sorted(values))
+            combo.setCurrentText(current or "All")
+
+    def apply_filters(self):
+        component = self.component_combo.currentText()
+        severity = self.severity_combo.currentText()
+        seconds = self.TIME_RANGES[self.range_combo.currentText()]
+        self.model.set_filters(
+            component=None if component == "All" else component,
+            severity=None if severity == "All" else severity,
+            start=None if seconds is None else time.time() - seconds)
+        self.update_count()
+
+    def alert_added(self, position):
+        self.refresh_filter_choices()
+        self.model.alert_added(position)
+        self.update_count()
+
+    def update_count(self):
+        self.count_label.setText(f"{self.model.rowCount()} of {len(self.parent.alert_store)} alerts")
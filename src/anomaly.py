@@ -0,0 +1,132 @@
+import math
+import threading
+import time
+
+from metrics import get_path
+
+# Серии, за которыми следит детектор аномалий (накопительные счётчики не подходят)
+ANOMALY_METRICS = [
+    ('cpu.percent', 'CPU', ('cpu', 'percent')),
+    ('cpu.temperature', 'CPU', ('cpu', 'temperature')),
+    ('memory.percent', 'Memory', ('memory', 'virtual', 'percent')),
+    ('swap.percent', 'Memory', ('memory', 'swap', 'percent')),
+    ('gpu.load', 'GPU', ('gpu', 'load')),
+    ('gpu.temp', 'GPU', ('gpu', 'temp')),
+]
+
+
+class EwmaDetector:
+    """Streaming z-score detector over an EWMA mean and variance.
+
+    A one-sided CUSUM on the z-scores catches slow drifts (e.g. memory that
+    keeps climbing) that never produce a single large z-score. Each update is
+    O(1) and the state is a handful of floats.
+    """
+    __slots__ = ('alpha', 'z_threshold', 'warmup', 'drift_k', 'drift_h', 'min_std',
+                 'count', 'mean', 'var', 'cusum_up', 'cusum_down')
+
+    def __init__(self, alpha=0.02, z_threshold=4.0, warmup=30, drift_k=0.5, drift_h=12.0, min_std=0.5):
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.warmup = warmup
+        self.drift_k = drift_k
+        self.drift_h = drift_h
+        self.min_std = min_std
+        self.count = 0
+        self.mean = 0.0
+        self.var = 0.0
+        self.cusum_up = 0.0
+        self.cusum_down = 0.0
+
+    def baseline(self, t):
+        return self
+
+    def update(self, t, x):
+        """Feed a value; return (kind, z) when it is anomalous, else None"""
+        stats = self.baseline(t)
+        stats.count += 1
+        if stats.count == 1:
+            stats.mean = x
+            return None
+
+        diff = x - stats.mean
+        z = diff / max(math.sqrt(stats.var), self.min_std)
+        stats.mean += self.alpha * diff
+        stats.var = (1 - self.alpha) * (stats.var + self.alpha * diff * diff)
+        if stats.count <= self.warmup:
+            return None
+
+        self.cusum_up = max(0.0, self.cusum_up + z - self.drift_k)
+        self.cusum_down = max(0.0, self.cusum_down - z - self.drift_k)
+        if abs(z) >= self.z_threshold:
+            return 'spike', z
+        if self.cusum_up >= self.drift_h or self.cusum_down >= self.drift_h:
+            self.cusum_up = self.cusum_down = 0.0
+            return 'drift', z
+        return None
+
+
+class SeasonalBucket:
+    __slots__ = ('count', 'mean', 'var')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.var = 0.0
+
+
+class SeasonalDetector(EwmaDetector):
+    """EwmaDetector with a separate baseline for each hour of the day"""
+    __slots__ = ('buckets',)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.buckets = [SeasonalBucket() for _ in range(24)]
+
+    def baseline(self, t):
+        return self.buckets[time.localtime(t).tm_hour]
+
+
+class AnomalyMonitor:
+    """Per-metric streaming anomaly detection for collector samples.
+
+    Runs next to the alert engine in the collector thread and returns one
+    event per anomaly; repeats of the same metric are suppressed for
+    ``cooldown_s`` seconds.
+    """
+
+    def __init__(self, seasonal=False, z_threshold=4.0, cooldown_s=300, metrics=ANOMALY_METRICS):
+        self.lock = threading.Lock()
+        self.metrics = metrics
+        self.cooldown_s = cooldown_s
+        self.configure(seasonal, z_threshold)
+
+    def configure(self, seasonal, z_threshold):
+        detector_class = SeasonalDetector if seasonal else EwmaDetector
+        with self.lock:
+            self.detectors = {name: detector_class(z_threshold=z_threshold) for name, _, _ in self.metrics}
+            self.last_event = {}
+
+    def evaluate(self, data):
+        t = data['timestamp']
+        events = []
+        with self.lock:
+            for name, component, path in self.metrics:
+                value = get_path(data, *path)
+                if value is None:
+                    continue
+                result = self.detectors[name].update(t, float(value))
+                if result is None or t - self.last_event.get(name, -math.inf) < self.cooldown_s:
+                    continue
+                self.last_event[name] = t
+                kind, z = result
+                events.append({
+                    'timestamp': t,
+                    'metric': name,
+                    'component': component,
+                    'kind': kind,
+                    'value': float(value),
+                    'z': z,
+                    'message': f"Anomalous {name} ({kind}): {value:.1f}, z={z:+.1f}",
+                })
+        return events
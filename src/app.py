@@ -1,18 +1,51 @@
 import time
-import random
-import platform
 import os
+import importlib
 from datetime import datetime
 from collections import deque
-from PyQt5.QtCore import QTimer, Qt, pyqtSlot
-from PyQt5.QtWidgets import QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QTabWidget, QMessageBox, QFrame, QPushButton, QLabel
+from PyQt5.QtCore import QTimer, QEvent, pyqtSignal, pyqtSlot
+from PyQt5.QtWidgets import QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QTabWidget, QMessageBox, QFrame, QPushButton
 
 from monitoring import DataCollectorThread, SpeedTestThread
-from widgets import DashboardTab, CpuTab, MemoryTab, DiskTab, GpuTab, NetworkTab, MultiDeviceTab, AlertsTab, ReportsTab, SettingsTab, ToolsTab
-from utils import load_settings, save_settings
+from fleet import FleetThread
+from history import HistoryStore, HistoryQueryThread
+from alerts import AlertEngine, default_rules
+from anomaly import AnomalyMonitor
+from notifications import NotificationDispatcher, build_sinks
+from toast import ToastStack
+from alert_store import AlertStore
+from scheduled import ReportScheduler
+from settings import ALERT_KEYS, ANOMALY_KEYS, HISTORY_KEYS, NOTIFICATION_KEYS, SettingsStore
+from utils import load_settings
+from timebase import to_plot_time
+
+# Вкладки: (заголовок, модуль, класс). Модуль импортируется и вкладка
+# создаётся только при первом показе. Вкладки с графиками живут в widgets
+# (matplotlib нужен уже главной панели), остальные - в своих модулях.
+TAB_SPECS = [
+    ("Dashboard", "widgets", "DashboardTab"),
+    ("CPU", "widgets", "CpuTab"),
+    ("Memory", "widgets", "MemoryTab"),
+    ("Disk", "widgets", "DiskTab"),
+    ("GPU", "widgets", "GpuTab"),
+    ("Network", "widgets", "NetworkTab"),
+    ("Multi-Device", "devices_tab", "MultiDeviceTab"),
+    ("Alerts", "alerts_tab", "AlertsTab"),
+    ("Reports", "reports_tab", "ReportsTab"),
+    ("Settings", "settings_tab", "SettingsTab"),
+    ("Tools", "tools_tab", "ToolsTab"),
+    ("Latency", "latency_tab", "LatencyTab"),
+]
+MULTI_DEVICE_TAB = 6
+ALERTS_TAB = 7
+TOOLS_TAB = 10
+LATENCY_TAB = 11
 
 
 class SystemMonitorApp(QMainWindow):
+    toast_requested = pyqtSignal(str, str)
+    notification_failed = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("System Monitor")
@@ -29,24 +62,58 @@ class SystemMonitorApp(QMainWindow):
         self.historical_data = deque(maxlen=2000)
         self.last_net_io = None
         self.last_update_time = None
-        self.simulated_devices = []
+        self.fleet_devices = {}
+        self.fleet_pending = False
         self.alert_history = deque(maxlen=100)
-        self.last_alert_time = {}
+        self.anomalies = deque(maxlen=500)
         self.alerts_enabled = True
-        self.initialized_tabs = set()
+        self.tab_instances = {}
+        self.data_version = 0
+        self.rendered_versions = {}
+        self.last_frame_time = 0.0
+        self.render_suspended = False
+        self.self_cpu_stats = {'visible': [0.0, 0], 'hidden': [0.0, 0]}
         self.speed_test_thread = SpeedTestThread()
 
         # Загрузка настроек
         self.settings = load_settings()
+        # Изменения применяются на лету, запись на диск отложенная и атомарная
+        self.settings_store = SettingsStore(self.settings, parent=self)
+        self.settings_store.changed.connect(self.apply_settings)
+        self.settings_store.save_failed.connect(lambda message: self.statusBar().showMessage(message))
+        self.settings_store.rejected.connect(self.report_invalid_settings)
+
+        # Хранилище истории для просмотра за длительные периоды
+        self.history = HistoryStore(self.history_capacity())
+        self.history_query_thread = HistoryQueryThread(self.history, self)
+        self.history_query_thread.start()
+
+        # Постоянная история предупреждений
+        alert_log = self.settings.get('alert_log_path') or os.path.join(
+            os.path.expanduser('~'), '.system_monitor_alerts.ndjson')
+        self.alert_store = AlertStore(alert_log)
+        self.alert_history.extend(self.alert_store.recent(self.alert_history.maxlen))
+
+        # Уведомления доставляются в фоновых потоках, у каждого получателя свой
+        self.toasts = ToastStack(self)
+        self.toast_requested.connect(self.toasts.show)
+        self.notification_failed.connect(lambda message: self.statusBar().showMessage(message))
+        self.notifier = NotificationDispatcher(on_error=self.notification_failed.emit)
+        self.apply_notification_settings()
+        self.notifier.start()
+
+        # Отчёты по расписанию выполняются в общем фоновом обработчике отчётов
+        self.report_scheduler = ReportScheduler(self)
 
         # Создание интерфейса
         self.init_ui()
         self.init_monitoring()
 
-        # Дополнительный таймер
-        self.aux_timer = QTimer(self)
-        self.aux_timer.timeout.connect(self.update_simulated_devices_view)
-        self.aux_timer.start(3000)
+        # Устройства парка опрашиваются через агентов в отдельном потоке
+        self.fleet_thread = FleetThread(self.settings.get('fleet_agents', []),
+                                        self.settings.get('fleet_mode', 'subscribe'))
+        self.fleet_thread.devices_updated.connect(self.handle_fleet_devices)
+        self.fleet_thread.start()
 
     def init_ui(self):
         # Основной виджет и layout
@@ -72,14 +139,7 @@ class SystemMonitorApp(QMainWindow):
         sidebar_layout = QVBoxLayout(self.sidebar)
         sidebar_layout.setContentsMargins(10, 10, 10, 10)
         sidebar_layout.setSpacing(8)
-        buttons = [
-            ("Dashboard", lambda: self.tabs.setCurrentIndex(0)), ("CPU", lambda: self.tabs.setCurrentIndex(1)),
-            ("Memory", lambda: self.tabs.setCurrentIndex(2)), ("Disk", lambda: self.tabs.setCurrentIndex(3)),
-            ("GPU", lambda: self.tabs.setCurrentIndex(4)), ("Network", lambda: self.tabs.setCurrentIndex(5)),
-            ("Multi-Device", lambda: self.tabs.setCurrentIndex(6)), ("Alerts", lambda: self.tabs.setCurrentIndex(7)),
-            ("Reports", lambda: self.tabs.setCurrentIndex(8)), ("Settings", lambda: self.tabs.setCurrentIndex(9)),
-            ("Tools", lambda: self.tabs.setCurrentIndex(10))
-        ]
+        buttons = [(title, lambda _, i=i: self.tabs.setCurrentIndex(i)) for i, (title, _, _) in enumerate(TAB_SPECS)]
         for text, handler in buttons:
             btn = QPushButton(text)
             btn.setStyleSheet("""
@@ -99,47 +159,78 @@ class SystemMonitorApp(QMainWindow):
         self.tabs = QTabWidget()
         self.tabs.tabBar().setVisible(False)
 
-        # Создание вкладок
-        self.tabs.addTab(DashboardTab(self), "Dashboard")
-        self.tabs.addTab(CpuTab(self), "CPU")
-        self.tabs.addTab(MemoryTab(self), "Memory")
-        self.tabs.addTab(DiskTab(self), "Disk")
-        self.tabs.addTab(GpuTab(self), "GPU")
-        self.tabs.addTab(NetworkTab(self), "Network")
-        self.tabs.addTab(MultiDeviceTab(self), "Multi-Device")
-        self.tabs.addTab(AlertsTab(self), "Alerts")
-        self.tabs.addTab(ReportsTab(self), "Reports")
-        self.tabs.addTab(SettingsTab(self), "Settings")
-        self.tabs.addTab(ToolsTab(self), "Tools")
-
-        self.multi_device_tab = self.tabs.widget(6)
+        # Пустые заглушки вместо вкладок
+        for title, _, _ in TAB_SPECS:
+            placeholder = QWidget()
+            placeholder_layout = QVBoxLayout(placeholder)
+            placeholder_layout.setContentsMargins(0, 0, 0, 0)
+            self.tabs.addTab(placeholder, title)
 
         self.tabs.currentChanged.connect(self.on_tab_changed)
         content_layout.addWidget(self.tabs)
         main_layout.addWidget(self.content_area)
-        self.on_tab_changed(0)
 
-    def on_tab_changed(self, index):
-        if index in self.initialized_tabs:
-            return
+        # Первая вкладка строится после показа окна
+        QTimer.singleShot(0, lambda: self.on_tab_changed(self.tabs.currentIndex()))
 
-        # Инициализация вкладки при первом переходе
-        tab = self.tabs.widget(index)
-        if hasattr(tab, 'init_ui'):
-            tab.init_ui()
-        self.initialized_tabs.add(index)
+    def on_tab_changed(self, index):
+        self.ensure_tab(index)
+        self.render_frame()
+
+    def ensure_tab(self, index):
+        """Build the tab behind the placeholder at index on first use"""
+        tab = self.tab_instances.get(index)
+        if tab is not None or not 0 <= index < len(TAB_SPECS):
+            return tab
+
+        _, module_name, class_name = TAB_SPECS[index]
+        module = importlib.import_module(module_name)
+        tab = getattr(module, class_name)(self)
+        self.tabs.widget(index).layout().addWidget(tab)
+        self.tab_instances[index] = tab
+        return tab
+
+    def report_worker(self):
+        """Background worker for report jobs, started on first use"""
+        if getattr(self, '_report_worker', None) is None:
+            from jobs import ReportWorker
+            self._report_worker = ReportWorker(self)
+            self._report_worker.start()
+        return self._report_worker
+
+    def report_startup_time(self, start):
+        """Show time from process start to the first painted window"""
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        message = f"Ready (started in {elapsed_ms:.0f} ms)"
+        if self.settings_store.invalid_at_start:
+            message += f"; {self.invalid_settings_text(self.settings_store.invalid_at_start)}, using defaults"
+        self.statusBar().showMessage(message)
 
     def init_monitoring(self):
         poll_interval = self.settings.get('poll_interval', 2000)
-        self.data_collector = DataCollectorThread(poll_interval, self)
+        self.alert_engine = AlertEngine()
+        self.apply_alert_rules()
+        self.anomaly_monitor = AnomalyMonitor(
+            seasonal=self.settings.get('anomaly_seasonal', False),
+            z_threshold=self.settings.get('anomaly_z_threshold', 4.0))
+        monitor = self.anomaly_monitor if self.settings.get('anomaly_detection', True) else None
+        self.data_collector = DataCollectorThread(poll_interval, self.alert_engine, monitor, self)
         self.data_collector.data_updated.connect(self.handle_data_update)
+        self.data_collector.alert_changed.connect(self.handle_alert_transition)
+        self.data_collector.anomaly_detected.connect(self.handle_anomaly)
         self.data_collector.start()
 
+        # Таймер кадров: отрисовка не чаще max_fps раз в секунду
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.timeout.connect(self.render_frame)
+
     @pyqtSlot(dict)
     def handle_data_update(self, data):
         self.historical_data.append(data)
-        now = data['timestamp']
-        self.time_points.append(now)
+        self.history.append(data)
+        # Перевод во время matplotlib один раз на точку
+        self.time_points.append(to_plot_time(data['timestamp']))
 
         # Обновление данных
         cpu_data = data.get('cpu', {})
@@ -153,85 +244,210 @@ class SystemMonitorApp(QMainWindow):
         self.gpu_load_points.append(gpu_info.get('load'))
         self.gpu_temp_points.append(gpu_info.get('temp'))
 
-        # Проверка на предупреждения
-        self.check_for_alerts(data)
+        # Собственная загрузка CPU монитора, отдельно для видимого и скрытого окна
+        process_cpu = data.get('process', {}).get('cpu_percent')
+        if process_cpu is not None:
+            stats = self.self_cpu_stats['hidden' if self.render_suspended else 'visible']
+            stats[0] += process_cpu
+            stats[1] += 1
+
+        # Данные изменились, отрисовка откладывается до следующего кадра
+        self.data_version += 1
+        self.schedule_frame()
 
-        # Обновление текущей вкладки
+    def schedule_frame(self):
+        """Coalesce pending samples into a single frame capped at max_fps"""
+        if self.render_suspended or self.frame_timer.isActive():
+            return
+        frame_interval = 1.0 / max(1, self.settings.get('max_fps', 5))
+        wait = frame_interval - (time.monotonic() - self.last_frame_time)
+        self.frame_timer.start(max(0, int(wait * 1000)))
+
+    def render_frame(self):
+        """Refresh the visible tab if it has not seen the latest sample"""
+        index = self.tabs.currentIndex()
+        if self.render_suspended or not self.historical_data or index not in self.tab_instances:
+            return
+        if self.rendered_versions.get(index) == self.data_version:
+            return
+
+        self.last_frame_time = time.monotonic()
+        self.rendered_versions[index] = self.data_version
         self.update_current_tab()
 
-    def check_for_alerts(self, data):
-        cpu_temp = data.get('cpu', {}).get('temperature')
-        if cpu_temp and cpu_temp > self.settings['cpu_temp_threshold']:
-            self.trigger_alert('CPU', f"High temperature: {cpu_temp:.0f}°C")
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:
+            self.update_render_state()
+        super().changeEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Expose-события окна сообщают о перекрытии и переключении рабочих столов
+        handle = self.windowHandle()
+        if handle is not None and not getattr(self, '_watching_exposure', False):
+            handle.installEventFilter(self)
+            handle.visibilityChanged.connect(self.update_render_state)
+            self._watching_exposure = True
+        self.update_render_state()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_render_state()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Expose:
+            QTimer.singleShot(0, self.update_render_state)
+        return super().eventFilter(obj, event)
+
+    def update_render_state(self, *args):
+        """Pause rendering while the window is minimized, hidden or not exposed"""
+        handle = self.windowHandle()
+        hidden = (not self.isVisible() or self.isMinimized()
+                  or (handle is not None and not handle.isExposed()))
+        if hidden == self.render_suspended:
+            return
 
-        mem_percent = data.get('memory', {}).get('virtual', {}).get('percent')
-        if mem_percent and mem_percent > self.settings['ram_threshold']:
-            self.trigger_alert('Memory', f'High usage: {mem_percent:.0f}%')
+        self.render_suspended = hidden
+        if hidden:
+            self.frame_timer.stop()
+        else:
+            # Одна отрисовка, чтобы догнать накопленные данные
+            self.render_frame()
+            self.update_devices_view()
+            self.statusBar().showMessage(self.self_cpu_summary())
+
+    def self_cpu_summary(self):
+        """Average CPU used by the monitor itself while visible and while hidden"""
+        parts = []
+        for state, (total, count) in self.self_cpu_stats.items():
+            parts.append(f"{state} {total / count:.1f}%" if count else f"{state} n/a")
+        return "Monitor CPU: " + ", ".join(parts)
+
+    def history_capacity(self):
+        retention_ms = self.settings.get('history_retention_hours', 168) * 3600 * 1000
+        return int(retention_ms / self.settings.get('poll_interval', 2000))
+
+    @staticmethod
+    def invalid_settings_text(keys):
+        return "Ignored invalid settings: " + ", ".join(sorted(keys))
+
+    def report_invalid_settings(self, keys):
+        self.statusBar().showMessage(self.invalid_settings_text(keys))
+
+    def apply_settings(self, keys):
+        """Apply changed settings to the running collector, engines and tabs.
+
+        Runs in a slot, so a failing step is reported in the status bar
+        instead of raising; the remaining tabs are still updated.
+        """
+        try:
+            self.apply_core_settings(keys)
+        except Exception as e:
+            self.statusBar().showMessage(f"Failed to apply settings: {e}")
+        for tab in self.tab_instances.values():
+            if hasattr(tab, 'settings_changed'):
+                try:
+                    tab.settings_changed(keys)
+                except Exception as e:
+                    self.statusBar().showMessage(f"Failed to apply settings to {type(tab).__name__}: {e}")
+
+    def apply_core_settings(self, keys):
+        if 'poll_interval' in keys:
+            self.data_collector.set_poll_interval(self.settings.get('poll_interval', 2000))
+        if keys & HISTORY_KEYS:
+            self.history.set_max_samples(self.history_capacity())
+        if keys & ALERT_KEYS:
+            self.apply_alert_rules()
+        if keys & NOTIFICATION_KEYS:
+            self.apply_notification_settings()
+        if 'fleet_agents' in keys:
+            self.fleet_thread.set_agents(self.settings.get('fleet_agents', []))
+        if keys & ANOMALY_KEYS:
+            self.anomaly_monitor.configure(self.settings.get('anomaly_seasonal', False),
+                                           self.settings.get('anomaly_z_threshold', 4.0))
+            enabled = self.settings.get('anomaly_detection', True)
+            self.data_collector.anomaly_monitor = self.anomaly_monitor if enabled else None
+
+    def apply_alert_rules(self):
+        """Recompile alert rules from the current settings"""
+        try:
+            self.alert_engine.set_rules(default_rules(self.settings))
+        except (KeyError, ValueError) as e:
+            self.statusBar().showMessage(f"Invalid alert rule: {e}")
+
+    def apply_notification_settings(self):
+        """Rebuild notification sinks from the current settings"""
+        self.notifier.set_sinks(build_sinks(self.settings, self.toast_requested.emit))
 
-        gpu_info = data.get('gpu')
-        if gpu_info and gpu_info.get('temp') and gpu_info.get('temp') > self.settings['gpu_temp_threshold']:
-            self.trigger_alert('GPU', f"High temperature: {gpu_info.get('temp'):.0f}°C")
+    @pyqtSlot(dict)
+    def handle_alert_transition(self, transition):
+        if transition['state'] == 'firing':
+            self.trigger_alert(transition['component'], transition['message'])
+        else:
+            self.statusBar().showMessage(f"{transition['component']} alert cleared: {transition['message']}", 5000)
 
-        for mount, usage in data.get('disk', {}).items():
-            if usage['percent'] > self.settings['disk_threshold']:
-                self.trigger_alert('Disk', f"High usage on {mount.replace('_drive', ':')}: {usage['percent']:.0f}%")
+    @pyqtSlot(dict)
+    def handle_anomaly(self, event):
+        # Аномалии отмечаются на графиках и попадают в историю предупреждений
+        self.anomalies.append((to_plot_time(event['timestamp']), event['metric'], event['value']))
+        self.trigger_alert(event['component'], event['message'], severity='anomaly')
 
-    def trigger_alert(self, component, message):
+    def trigger_alert(self, component, message, severity='warning'):
         if not self.alerts_enabled:
             return
 
-        alert_key = f"{component}-{message.split(':')[0]}"
         now = time.time()
-        if now - self.last_alert_time.get(alert_key, 0) < 300:  # 5 минут
-            return
+        alert_time = datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S")
+        self.alert_history.appendleft(
+            {'time': alert_time, 'component': component, 'message': message, 'severity': severity})
+        position = self.alert_store.append(now, component, message, severity)
+        alerts_tab = self.tab_instances.get(ALERTS_TAB)
+        if alerts_tab is not None:
+            alerts_tab.alert_added(position)
 
-        self.last_alert_time[alert_key] = now
-        alert_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.alert_history.appendleft({'time': alert_time, 'component': component, 'message': message})
+        # Доставка уведомлений без блокировки интерфейса
+        self.notifier.notify(component, message, severity)
 
-        # Показ всплывающего окна
-        if self.settings.get('popup_alerts', True):
-            QMessageBox.warning(self, f"{component} Alert", message)
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.toasts.reposition()
 
     def update_current_tab(self):
-        index = self.tabs.currentIndex()
-        if index in self.initialized_tabs:
-            tab = self.tabs.widget(index)
+        tab = self.tab_instances.get(self.tabs.currentIndex())
+        if tab is not None:
             if hasattr(tab, 'update_data'):
                 tab.update_data(
-                    self.historical_data,
-                    self.time_points,
-                    self.cpu_usage_points,
-                    self.cpu_temp_points,
-                    self.gpu_load_points,
-                    self.gpu_temp_points,
-                    self.mem_usage_points,
-                    self.alert_history
+                    historical_data=self.historical_data,
+                    time_points=self.time_points,
+                    cpu_usage_points=self.cpu_usage_points,
+                    cpu_temp_points=self.cpu_temp_points,
+                    gpu_load_points=self.gpu_load_points,
+                    gpu_temp_points=self.gpu_temp_points,
+                    mem_usage_points=self.mem_usage_points,
+                    alert_history=self.alert_history
                 )
 
-    def discover_network_devices(self):
-        """Simulate network device discovery"""
-        self.statusBar().showMessage("Discovering network devices...")
-        self.populate_simulated_devices()
-        QTimer.singleShot(2000, lambda: self.statusBar().showMessage("Ready"))
-
-    def populate_simulated_devices(self):
-        """Create simulated devices"""
-        self.simulated_devices.clear()
-        for i, name in enumerate(["WEB-SRV-01", "DB-MASTER", "APP-WORKER", "NAS-STORAGE", "DEV-CLIENT"]):
-            self.simulated_devices.append({
-                'name': name,
-                'ip': f'192.168.1.{10 + i}',
-                'status': 'Online',
-                'cpu': random.randint(5, 70),
-                'ram': random.randint(20, 80)
-            })
-        self.update_simulated_devices_view()
-
-    def update_simulated_devices_view(self):
-        """Update the multi-device tab with current device data"""
-        if hasattr(self, 'multi_device_tab'):
-            self.multi_device_tab.update_devices(self.simulated_devices)
+    @pyqtSlot(object, object)
+    def handle_fleet_devices(self, changed, removed):
+        for address in removed:
+            self.fleet_devices.pop(address, None)
+        self.fleet_devices.update((device['address'], device) for device in changed)
+
+        multi_device_tab = self.tab_instances.get(MULTI_DEVICE_TAB)
+        if multi_device_tab is None or self.render_suspended:
+            # Пропущенные изменения догоняются одним полным обновлением
+            self.fleet_pending = True
+        elif self.fleet_pending:
+            self.update_devices_view()
+        else:
+            multi_device_tab.apply_device_changes(changed, removed)
+
+    def update_devices_view(self):
+        """Update the multi-device tab with the latest agent data"""
+        multi_device_tab = self.tab_instances.get(MULTI_DEVICE_TAB)
+        if multi_device_tab is not None and not self.render_suspended:
+            multi_device_tab.update_devices(self.fleet_devices.values())
+            self.fleet_pending = False
 
     def closeEvent(self, event):
         reply = QMessageBox.question(
@@ -243,14 +459,35 @@ class SystemMonitorApp(QMainWindow):
         )
 
         if reply == QMessageBox.Yes:
-            self.aux_timer.stop()
+            self.fleet_thread.stop()
             if self.speed_test_thread.isRunning():
-                self.speed_test_thread.quit()
+                self.speed_test_thread.cancel()
                 self.speed_test_thread.wait()
 
+            tools_tab = self.tab_instances.get(TOOLS_TAB)
+            if tools_tab is not None:
+                for thread in (tools_tab.cleanup_thread, tools_tab.usage_thread):
+                    if thread is not None:
+                        thread.cancel()
+                        thread.wait()
+                tools_tab.stop_speed_server()
+                if tools_tab.smart_thread is not None:
+                    tools_tab.smart_thread.wait()
+            latency_tab = self.tab_instances.get(LATENCY_TAB)
+            if latency_tab is not None:
+                latency_tab.stop_monitor()
+
+            self.fleet_thread.wait()
             self.data_collector.stop()
             self.data_collector.wait()
-            save_settings(self.settings)
+            self.history_query_thread.stop()
+            self.history_query_thread.wait()
+            self.notifier.stop()
+            if getattr(self, '_report_worker', None) is not None:
+                self._report_worker.stop()
+                self._report_worker.wait()
+            self.alert_store.close()
+            self.settings_store.save()
             event.accept()
         else:
             event.ignore()
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""Off-screen rendering of history charts for reports.
+
+Figures are plain ``matplotlib.figure.Figure`` objects on an Agg canvas,
+independent of pyplot and of the live canvases in the tabs, so they can be
+rendered from a worker thread.
+"""
+import io
+
+import numpy as np
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from history import downsample
+from timebase import to_plot_times
+
+CHART_DPI = 100
+CHART_SIZE = (8, 4)
+CHART_POINTS = 800
+
+# Графики отчёта: заголовок, подписи осей и серии (метрика, подпись, ось, скорость)
+REPORT_CHARTS = [
+    ("CPU Usage and Temperature", ("Usage (%)", "Temperature (°C)"), [
+        ('cpu.percent', "CPU Usage", 0, False),
+        ('cpu.temperature', "CPU Temperature", 1, False),
+    ]),
+    ("Memory Usage", ("Usage (%)", None), [
+        ('memory.percent', "Memory", 0, False),
+        ('swap.percent', "Swap", 0, False),
+    ]),
+    ("GPU Load and Temperature", ("Load (%)", "Temperature (°C)"), [
+        ('gpu.load', "GPU Load", 0, False),
+        ('gpu.temp', "GPU Temperature", 1, False),
+    ]),
+    ("Disk Usage", ("Fullest Disk (%)", None), [
+        ('disk.max_percent', "Disk", 0, False),
+    ]),
+    ("Network Throughput", ("KB/s", None), [
+        ('net.bytes_sent', "Sent", 0, True),
+        ('net.bytes_recv', "Received", 0, True),
+    ]),
+]
+
+
+def chart_series(history, metric, start, end, rate=False, max_points=CHART_POINTS):
+    """(times, mins, maxs, means) of a metric, or of its rate in KB/s for counters"""
+    if not rate:
+        return history.query(metric, start, end, max_points)
+    times, values = history.slice(metric, start, end)
+    if len(times) < 2:
+        return downsample(times[:0], values[:0], max_points)
+    dt = np.diff(times)
+    rates = np.divide(np.diff(values), dt, out=np.full(len(dt), np.nan), where=dt > 0) / 1024
+    # Сброс счётчиков (перезапуск интерфейса) даёт отрицательную скорость
+    rates[rates < 0] = np.nan
+    return downsample(times[1:], rates, max_points)
+
+
+def render_chart(history, title, labels, series, start, end, dpi=CHART_DPI):
+    """Render one report chart to PNG bytes, or None when it has no data"""
+    fig = Figure(figsize=CHART_SIZE, dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    axes = [ax, ax.twinx() if labels[1] else None]
+    colors = ['tab:blue', 'tab:red', 'tab:green', 'tab:orange']
+
+    has_data = False
+    for i, (metric, label, axis, rate) in enumerate(series):
+        times, mins, maxs, means = chart_series(history, metric, start, end, rate)
+        if len(times) == 0 or np.all(np.isnan(means)):
+            continue
+        has_data = True
+        plot_times = to_plot_times(times)
+        target = axes[axis]
+        target.plot(plot_times, means, color=colors[i], linewidth=1, label=label)
+        if mins is not means:
+            target.fill_between(plot_times, mins, maxs, color=colors[i], alpha=0.2, linewidth=0)
+    if not has_data:
+        return None
+
+    ax.set_title(title)
+    for target, label in zip(axes, labels):
+        if target is not None:
+            target.set_ylabel(label)
+    locator = mdates.AutoDateLocator()
+    ax.xaxis.set_major_locator(locator)
+    ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+    handles = [h for target in axes if target is not None for h in target.get_legend_handles_labels()[0]]
+    ax.legend(handles=handles, loc='upper left', fontsize='small')
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi)
+    return buffer.getvalue()
+
+
+def render_history_charts(history, start=None, end=None, progress=None, dpi=CHART_DPI):
+    """Render the report charts for a time range of a HistoryStore.
+
+    Returns a list of (title, PNG bytes); charts without data are left out.
+    """
+    time_range = history.time_range()
+    if time_range is None:
+        return []
+    start = time_range[0] if start is None else start
+    end = time_range[1] if end is None else end
+
+    charts = []
+    for i, (title, labels, series) in enumerate(REPORT_CHARTS):
+        if progress:
+            progress(i, len(REPORT_CHARTS))
+        png = render_chart(history, title, labels, series, start, end, dpi)
+        if png is not None:
+            charts.append((title, png))
+    return charts
@@ -0,0 +1,222 @@
+"""Parallel disk cleanup.
+
+Directories are scanned with ``os.scandir`` by a thread pool, one task per
+directory, so large subtrees are spread over all workers. File types come
+from the directory entries and each file costs a single ``lstat`` (none on
+Windows, where ``DirEntry.stat`` is served from the directory listing).
+A dry run (``delete=False``) only sizes what the filters select; a real run
+deletes matching files as they are found. Both report progress while they
+run and stop early when the cancel event is set.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+MAX_ERRORS = 100
+PROGRESS_INTERVAL_S = 0.1
+
+
+def default_workers():
+    # Работа упирается в системные вызовы, поэтому потоков больше, чем ядер
+    return min(32, (os.cpu_count() or 1) * 4)
+
+
+class CleanupFilter:
+    """Selects files by age (days since modification) and size (bytes)"""
+
+    def __init__(self, min_age_days=0, min_size=0, max_size=None):
+        self.min_age_s = min_age_days * 86400
+        self.min_size = min_size
+        self.max_size = max_size
+
+    def matches(self, st, now):
+        if st.st_size < self.min_size:
+            return False
+        if self.max_size is not None and st.st_size > self.max_size:
+            return False
+        return now - st.st_mtime >= self.min_age_s
+
+
+class DirectoryResult:
+    __slots__ = ('root', 'subdirs', 'files', 'matched', 'matched_bytes', 'deleted', 'deleted_bytes', 'errors')
+
+    def __init__(self, root):
+        self.root = root
+        self.subdirs = []
+        self.files = 0
+        self.matched = 0
+        self.matched_bytes = 0
+        self.deleted = 0
+        self.deleted_bytes = 0
+        self.errors = []
+
+
+def scan_directory(root, path, cleanup_filter, now, delete, cancel):
+    """Scan one directory: size (and optionally delete) its matching files"""
+    result = DirectoryResult(root)
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if cancel.is_set():
+                    break
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        result.subdirs.append(entry.path)
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError as e:
+                    result.errors.append(f"Error reading {entry.path}: {e.strerror}")
+                    continue
+
+                result.files += 1
+                if not cleanup_filter.matches(st, now):
+                    continue
+                result.matched += 1
+                result.matched_bytes += st.st_size
+                if delete:
+                    try:
+                        os.unlink(entry.path)
+                        result.deleted += 1
+                        result.deleted_bytes += st.st_size
+                    except OSError as e:
+                        result.errors.append(f"Error deleting {entry.path}: {e.strerror}")
+    except OSError as e:
+        result.errors.append(f"Error reading {path}: {e.strerror}")
+    return result
+
+
+class CleanupStats:
+    """Running totals of a cleanup, overall and per root path"""
+    COUNTERS = ('dirs', 'files', 'matched', 'matched_bytes', 'deleted', 'deleted_bytes')
+
+    def __init__(self, paths, delete):
+        self.paths = list(paths)
+        self.delete = delete
+        self.totals = dict.fromkeys(self.COUNTERS, 0)
+        self.per_root = [dict.fromkeys(self.COUNTERS, 0) for _ in self.paths]
+        self.skipped = []
+        self.errors = []
+        self.error_count = 0
+        self.cancelled = False
+        self.elapsed_s = 0.0
+
+    def merge(self, result):
+        root = self.per_root[result.root]
+        for counters in (self.totals, root):
+            counters['dirs'] += 1
+            counters['files'] += result.files
+            counters['matched'] += result.matched
+            counters['matched_bytes'] += result.matched_bytes
+            counters['deleted'] += result.deleted
+            counters['deleted_bytes'] += result.deleted_bytes
+        self.error_count += len(result.errors)
+        self.errors.extend(result.errors[:MAX_ERRORS - len(self.errors)])
+
+    def snapshot(self):
+        return {**self.totals, 'errors': self.error_count, 'delete': self.delete}
+
+    def log_lines(self):
+        mb = 1024 * 1024
+        log = ["Starting disk cleanup..." if self.delete else "Cleanup preview (nothing is deleted)..."]
+        for path in self.skipped:
+            log.append(f"Skipping non-existent path: {path}")
+        for path, counters in zip(self.paths, self.per_root):
+            if path in self.skipped:
+                continue
+            log.append(f"{'Cleaning' if self.delete else 'Scanned'}: {path} "
+                       f"({counters['dirs']} directories, {counters['files']} files)")
+            if self.delete:
+                log.append(f"Deleted {counters['deleted']} files ({counters['deleted_bytes'] / mb:.2f} MB)")
+            else:
+                log.append(f"Reclaimable: {counters['matched']} files ({counters['matched_bytes'] / mb:.2f} MB)")
+        log.extend(self.errors)
+        if self.error_count > len(self.errors):
+            log.append(f"... and {self.error_count - len(self.errors)} more errors")
+        if self.cancelled:
+            log.append("Cancelled")
+        if self.delete:
+            log.append(f"Total deleted: {self.totals['deleted']} files ({self.totals['deleted_bytes'] / mb:.2f} MB)")
+        else:
+            log.append(f"Total reclaimable: {self.totals['matched']} files "
+                       f"({self.totals['matched_bytes'] / mb:.2f} MB)")
+        log.append(f"Finished in {self.elapsed_s:.1f} s")
+        return log
+
+
+def run_cleanup(paths, cleanup_filter=None, delete=False, workers=None, progress=None, cancel=None):
+    """Scan (delete=False) or clean the given directory trees in parallel.
+
+    progress, if given, is called with CleanupStats.snapshot() about every
+    PROGRESS_INTERVAL_S from the calling thread. Returns the CleanupStats.
+    """
+    cleanup_filter = cleanup_filter or CleanupFilter()
+    cancel = cancel or threading.Event()
+    stats = CleanupStats(paths, delete)
+    results = queue.Queue()
+    now = time.time()
+    start = time.perf_counter()
+
+    def task(root, path):
+        try:
+            results.put(scan_directory(root, path, cleanup_filter, now, delete, cancel))
+        except Exception as e:
+            failed = DirectoryResult(root)
+            failed.errors.append(f"Error scanning {path}: {e}")
+            results.put(failed)
+
+    with ThreadPoolExecutor(max_workers=workers or default_workers()) as pool:
+        outstanding = 0
+        for root, path in enumerate(stats.paths):
+            if not os.path.isdir(path):
+                stats.skipped.append(path)
+                continue
+            pool.submit(task, root, path)
+            outstanding += 1
+
+        last_progress = time.monotonic()
+        while outstanding:
+            try:
+                result = results.get(timeout=PROGRESS_INTERVAL_S)
+            except queue.Empty:
+                result = None
+            if result is not None:
+                outstanding -= 1
+                stats.merge(result)
+                if not cancel.is_set():
+                    for subdir in result.subdirs:
+                        pool.submit(task, result.root, subdir)
+                    outstanding += len(result.subdirs)
+            if progress and time.monotonic() - last_progress >= PROGRESS_INTERVAL_S:
+                last_progress = time.monotonic()
+                progress(stats.snapshot())
+
+    stats.cancelled = cancel.is_set()
+    stats.elapsed_s = time.perf_counter() - start
+    if progress:
+        progress(stats.snapshot())
+    return stats
+
+
+class CleanupThread(QThread):
+    """Runs a cleanup or a dry run off the GUI thread"""
+    progress = pyqtSignal(object)
+    completed = pyqtSignal(object)
+
+    def __init__(self, paths, cleanup_filter=None, delete=False, parent=None):
+        super().__init__(parent)
+        self.paths = paths
+        self.cleanup_filter = cleanup_filter
+        self.delete = delete
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        stats = run_cleanup(self.paths, self.cleanup_filter, self.delete,
+                            progress=self.progress.emit, cancel=self.cancel_event)
+        self.completed.emit(stats)
@@ -0,0 +1,142 @@
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QHeaderView, QComboBox, QMessageBox,
+    QLineEdit
+)
+from datetime import datetime
+from models import KeyedTableModel, KeyedSortFilterProxy, SparklineDelegate, create_table_view
+
+
+class MultiDeviceTab(QWidget):
+    STATUS_COLORS = {'Online': 'green', 'Connecting': 'orange', 'Offline': 'red'}
+    STATUS_COLUMN = 2
+    HISTORY_COLUMN = 8
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        # Адреса из настроек, которые не удалось разобрать, с причиной
+        self.invalid_agents = {}
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        # Agents are added by address; the list is kept in the settings
+        button_layout = QHBoxLayout()
+        self.agent_edit = QLineEdit()
+        self.agent_edit.setPlaceholderText("Agent address (host or host:port)")
+        self.agent_edit.returnPressed.connect(self.add_agent)
+        add_btn = QPushButton("Add Agent")
+        add_btn.clicked.connect(self.add_agent)
+        remove_btn = QPushButton("Remove Selected")
+        remove_btn.clicked.connect(self.remove_selected_agents)
+        button_layout.addWidget(self.agent_edit, 1)
+        button_layout.addWidget(add_btn)
+        button_layout.addWidget(remove_btn)
+        layout.addLayout(button_layout)
+
+        filter_layout = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter devices...")
+        self.status_combo = QComboBox()
+        self.status_combo.addItems(["All"] + list(self.STATUS_COLORS))
+        filter_layout.addWidget(self.filter_edit, 1)
+        filter_layout.addWidget(QLabel("Status:"))
+        filter_layout.addWidget(self.status_combo)
+        layout.addLayout(filter_layout)
+
+        # Devices table, colored by status and load; sorted and filtered in Python for large fleets
+        percent = lambda v: "-" if v is None else f"{v:.0f}%"
+        self.model = KeyedTableModel(
+            ["Device Name", "Address", "Status", "CPU %", "RAM %", "Disk %", "Last Seen", "Error", "CPU History"],
+            formatters={3: percent, 4: percent, 5: percent,
+                        6: lambda v: "-" if v is None else datetime.fromtimestamp(v).strftime("%H:%M:%S"),
+                        8: lambda v: ""},
+            colorizers={
+                2: self.STATUS_COLORS.get,
+                3: lambda v: None if v is None else 'red' if v > 80 else 'orange' if v > 60 else None,
+                4: lambda v: None if v is None else 'red' if v > 90 else 'orange' if v > 75 else None,
+                5: lambda v: None if v is None else 'red' if v > 90 else 'orange' if v > 80 else None,
+            },
+            parent=self)
+        proxy = KeyedSortFilterProxy(filter_columns=(0, 1, 7),
+                                     sort_keys={self.HISTORY_COLUMN: lambda v: v[-1] if v else -1})
+        self.table, self.proxy = create_table_view(self.model, resize_mode=QHeaderView.Interactive, proxy=proxy)
+        self.table.setItemDelegateForColumn(self.HISTORY_COLUMN, SparklineDelegate(parent=self.table))
+        self.table.setColumnWidth(1, 160)
+        self.filter_edit.textChanged.connect(self.apply_filters)
+        self.status_combo.currentTextChanged.connect(self.apply_filters)
+        layout.addWidget(self.table)
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        self.check_agents()
+        self.update_devices(self.parent.fleet_devices.values())
+
+    def apply_filters(self):
+        status = self.status_combo.currentText()
+        self.proxy.set_column_filter(self.STATUS_COLUMN, None if status == "All" else status)
+        self.proxy.set_filter_text(self.filter_edit.text())
+        self.update_summary()
+
+    def agents(self):
+        return self.parent.settings.get('fleet_agents', [])
+
+    def add_agent(self):
+        from fleet import split_address
+
+        address = self.agent_edit.text().strip()
+        if not address or address in self.agents():
+            return
+        try:
+            split_address(address)
+        except ValueError as e:
+            QMessageBox.warning(self, "Multi-Device", str(e))
+            return
+        self.agent_edit.clear()
+        self.parent.settings_store.update({'fleet_agents': self.agents() + [address]})
+
+    def check_agents(self):
+        from fleet import check_agents
+
+        # Адреса могут прийти из правки файла настроек; агрегатор такие пропускает
+        self.invalid_agents = check_agents(self.agents())[1]
+
+    def settings_changed(self, keys):
+        if 'fleet_agents' in keys:
+            self.check_agents()
+            self.update_summary()
+
+    def remove_selected_agents(self):
+        rows = {self.proxy.mapToSource(index).row() for index in self.table.selectionModel().selectedRows()}
+        removed = {self.model.key_at(row) for row in rows}
+        self.parent.settings_store.update({'fleet_agents': [a for a in self.agents() if a not in removed]})
+
+    @staticmethod
+    def device_row(device):
+        return device['address'], (device['name'], device['address'], device['status'], device['cpu_percent'],
+                                   device['memory_percent'], device['disk_percent'], device['last_seen'],
+                                   device['error'] or "", device['cpu_history'])
+
+    def update_devices(self, devices):
+        """Replace the table contents with devices"""
+        self.model.set_rows(self.device_row(device) for device in devices)
+        self.update_summary()
+
+    def apply_device_changes(self, changed, removed):
+        """Update only the rows of changed devices and drop removed ones"""
+        self.model.remove_keys(removed)
+        self.model.upsert_rows(self.device_row(device) for device in changed)
+        self.update_summary()
+
+    def update_summary(self):
+        rows = self.model.rows
+        if rows:
+            online = sum(1 for row in rows if row[self.STATUS_COLUMN] == 'Online')
+            text = f"{online} of {len(rows)} agents online, {self.proxy.rowCount()} shown"
+        else:
+            text = "No agents configured. Start src/agent.py on each host and add its address."
+        if self.invalid_agents:
+            text = text.rstrip('.') + ". Skipped invalid addresses: " + "; ".join(
+                f"{address} ({reason})" for address, reason in self.invalid_agents.items())
+        self.status_label.setText(text)
@@ -0,0 +1,226 @@
+"""Disk usage analyzer with cached incremental rescans.
+
+The walker builds a tree of DirNode objects, one per directory, with the
+size and count of the files directly inside and the largest of those files.
+Directories are scanned in parallel, one task per directory, like the
+cleanup engine.
+
+Each node remembers its directory's mtime. On a rescan a directory whose
+mtime is unchanged is not listed again: its files, file sizes and
+subdirectory names come from the cache, and only its subdirectories are
+stat'ed to check them in turn. A rescan therefore costs one stat per
+directory instead of one per file. Files that grow in place do not change
+their directory's mtime; use a full scan to pick those up.
+"""
+import heapq
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from cleanup import default_workers
+
+TOP_N = 20
+PROGRESS_INTERVAL_S = 0.1
+
+
+class DirNode:
+    __slots__ = ('path', 'mtime_ns', 'dev', 'file_size', 'file_count', 'largest', 'children', 'total_size',
+                 'total_files')
+
+    def __init__(self, path):
+        self.path = path
+        self.mtime_ns = None
+        self.dev = None
+        self.file_size = 0
+        self.file_count = 0
+        self.largest = []
+        self.children = {}
+        self.total_size = 0
+        self.total_files = 0
+
+
+def scan_node(node, cached, st, top_n, cancel):
+    """Fill node from its directory, or from cached if the directory is unchanged.
+
+    Returns (listed, subdirs): whether the directory was read, and a list of
+    (child node, cached child, stat) to visit next.
+    """
+    node.mtime_ns = st.st_mtime_ns
+    node.dev = st.st_dev
+    subdirs = []
+    if cached is not None and cached.mtime_ns == st.st_mtime_ns:
+        node.file_size = cached.file_size
+        node.file_count = cached.file_count
+        node.largest = cached.largest
+        for name, cached_child in cached.children.items():
+            try:
+                child_st = os.stat(cached_child.path, follow_symlinks=False)
+            except OSError:
+                continue
+            subdirs.append((name, cached_child, child_st))
+        listed = False
+    else:
+        largest = []
+        with os.scandir(node.path) as entries:
+            for entry in entries:
+                if cancel.is_set():
+                    break
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        child_st = entry.stat(follow_symlinks=False)
+                        cached_child = cached.children.get(entry.name) if cached is not None else None
+                        subdirs.append((entry.name, cached_child, child_st))
+                        continue
+                    size = entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+                node.file_size += size
+                node.file_count += 1
+                if len(largest) < top_n:
+                    heapq.heappush(largest, (size, entry.name))
+                elif size > largest[0][0]:
+                    heapq.heapreplace(largest, (size, entry.name))
+        node.largest = sorted(largest, reverse=True)
+        listed = True
+
+    children = []
+    for name, cached_child, child_st in subdirs:
+        # Другие файловые системы не сканируются, как du -x
+        if child_st.st_dev != st.st_dev:
+            continue
+        child = DirNode(os.path.join(node.path, name))
+        node.children[name] = child
+        children.append((child, cached_child, child_st))
+    return listed, children
+
+
+def compute_totals(root):
+    """Fill total_size/total_files bottom-up without recursion"""
+    order = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(node.children.values())
+    for node in reversed(order):
+        node.total_size = node.file_size + sum(child.total_size for child in node.children.values())
+        node.total_files = node.file_count + sum(child.total_files for child in node.children.values())
+
+
+def iter_nodes(root):
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children.values())
+
+
+class DiskUsageResult:
+    def __init__(self, root, dirs, listed, elapsed_s, cancelled, errors):
+        self.root = root
+        self.dirs = dirs
+        self.listed = listed
+        self.elapsed_s = elapsed_s
+        self.cancelled = cancelled
+        self.errors = errors
+
+    def largest_dirs(self, n=TOP_N):
+        """Directories with the most bytes in files directly inside them"""
+        return heapq.nlargest(n, iter_nodes(self.root), key=lambda node: node.file_size)
+
+    def largest_files(self, n=TOP_N):
+        """(size, path) of the largest files in the tree"""
+        candidates = ((size, os.path.join(node.path, name))
+                      for node in iter_nodes(self.root) for size, name in node.largest)
+        return heapq.nlargest(n, candidates)
+
+
+class DiskUsageAnalyzer:
+    """Scans directory trees and keeps the last tree of each root for rescans"""
+
+    def __init__(self, top_n=TOP_N, workers=None):
+        self.top_n = top_n
+        self.workers = workers or default_workers()
+        self.cache = {}
+        self.lock = threading.Lock()
+
+    def scan(self, path, full=False, progress=None, cancel=None):
+        """Scan path, reusing the cached tree unless full; returns a DiskUsageResult.
+
+        progress, if given, is called with (directories done, directories
+        listed) about every PROGRESS_INTERVAL_S from the calling thread.
+        """
+        path = os.path.abspath(path)
+        cancel = cancel or threading.Event()
+        with self.lock:
+            cached_root = None if full else self.cache.get(path)
+        start = time.perf_counter()
+        root = DirNode(path)
+        results = queue.Queue()
+        errors = []
+
+        def task(node, cached, st):
+            try:
+                results.put(scan_node(node, cached, st, self.top_n, cancel))
+            except OSError as e:
+                results.put(e)
+
+        dirs = listed = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pool.submit(task, root, cached_root, os.stat(path))
+            outstanding = 1
+            last_progress = time.monotonic()
+            while outstanding:
+                try:
+                    result = results.get(timeout=PROGRESS_INTERVAL_S)
+                except queue.Empty:
+                    result = None
+                if isinstance(result, OSError):
+                    outstanding -= 1
+                    errors.append(f"{result.filename}: {result.strerror}")
+                elif result is not None:
+                    outstanding -= 1
+                    dirs += 1
+                    was_listed, children = result
+                    listed += was_listed
+                    if not cancel.is_set():
+                        for child in children:
+                            pool.submit(task, *child)
+                        outstanding += len(children)
+                if progress and time.monotonic() - last_progress >= PROGRESS_INTERVAL_S:
+                    last_progress = time.monotonic()
+                    progress(dirs, listed)
+
+        compute_totals(root)
+        if not cancel.is_set():
+            with self.lock:
+                self.cache[path] = root
+        return DiskUsageResult(root, dirs, listed, time.perf_counter() - start, cancel.is_set(), errors)
+
+
+class DiskUsageThread(QThread):
+    """Runs a disk usage scan off the GUI thread"""
+    progress = pyqtSignal(int, int)
+    completed = pyqtSignal(object)
+
+    def __init__(self, analyzer, path, full=False, parent=None):
+        super().__init__(parent)
+        self.analyzer = analyzer
+        self.path = path
+        self.full = full
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            result = self.analyzer.scan(self.path, self.full, progress=self.progress.emit,
+                                        cancel=self.cancel_event)
+        except OSError as e:
+            result = e
+        self.completed.emit(result)
@@ -0,0 +1,131 @@
+import time
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtWidgets import QComboBox, QHBoxLayout, QLabel, QPushButton
+from matplotlib.widgets import SpanSelector
+
+from timebase import from_plot_time, to_plot_times
+
+# Диапазоны для быстрого выбора; None означает живой режим
+RANGES = [
+    ("Live", None), ("15 minutes", 15 * 60), ("1 hour", 3600), ("6 hours", 6 * 3600),
+    ("24 hours", 24 * 3600), ("7 days", 7 * 24 * 3600)
+]
+DEBOUNCE_MS = 150
+PAN_FRACTION = 0.2
+
+
+class HistoryNavigator(QObject):
+    """Zoom/pan navigation over the stored history for a chart.
+
+    Drag on the chart zooms to the selected span, the mouse wheel pans and the
+    range selector jumps to a preset window. While navigating, the chart leaves
+    live mode and shows the visible range fetched from the history store at
+    one bucket per pixel; the owning tab keeps drawing live data only while
+    ``live`` is True.
+    """
+
+    def __init__(self, app, canvas, series, parent=None):
+        super().__init__(parent)
+        self.app = app
+        self.canvas = canvas
+        self.series = series
+        self.ax = series[0][0].axes
+        self.live = True
+        self.view_range = None
+        self.request_id = 0
+        self.envelopes = []
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.fetch)
+
+        # Twin axes sit on top of the main axes and receive the mouse events
+        event_ax = series[-1][0].axes
+        self.span = SpanSelector(event_ax, self.on_span, 'horizontal', useblit=True,
+                                 props=dict(alpha=0.2, facecolor='tab:gray'))
+        self.canvas.mpl_connect('scroll_event', self.on_scroll)
+        self.app.history_query_thread.result_ready.connect(self.on_result)
+
+    def create_controls(self):
+        """Build the range selector row shown above the chart"""
+        layout = QHBoxLayout()
+        layout.addWidget(QLabel("Range:"))
+        self.range_combo = QComboBox()
+        self.range_combo.addItems([title for title, _ in RANGES])
+        self.range_combo.activated.connect(self.on_range_selected)
+        layout.addWidget(self.range_combo)
+        live_btn = QPushButton("Back to Live")
+        live_btn.clicked.connect(lambda: self.on_range_selected(0))
+        layout.addWidget(live_btn)
+        layout.addStretch()
+        return layout
+
+    def on_range_selected(self, index):
+        seconds = RANGES[index][1]
+        self.range_combo.setCurrentIndex(index)
+        if seconds is None:
+            self.go_live()
+            return
+        end = time.time()
+        self.navigate(end - seconds, end, immediate=True)
+
+    def on_span(self, xmin, xmax):
+        if xmax - xmin <= 0:
+            return
+        self.navigate(from_plot_time(xmin), from_plot_time(xmax))
+
+    def on_scroll(self, event):
+        start, end = self.view_range or map(from_plot_time, self.ax.get_xlim())
+        shift = (end - start) * PAN_FRACTION
+        if event.button == 'up':
+            shift = -shift
+        self.navigate(start + shift, end + shift)
+
+    def navigate(self, start, end, immediate=False):
+        self.live = False
+        self.view_range = (start, end)
+        self.ax.set_xlim(*to_plot_times(np.array([start, end])))
+        self.canvas.draw_idle()
+        if immediate:
+            self.fetch()
+        else:
+            self.debounce_timer.start()
+
+    def go_live(self):
+        self.debounce_timer.stop()
+        self.live = True
+        self.view_range = None
+        self.request_id += 1
+        self.clear_envelopes()
+        self.app.rendered_versions.clear()
+        self.app.render_frame()
+
+    def fetch(self):
+        if self.live or self.view_range is None:
+            return
+        self.request_id += 1
+        start, end = self.view_range
+        max_points = max(50, int(self.ax.bbox.width))
+        self.app.history_query_thread.submit(
+            self, self.request_id, [metric for _, metric in self.series], start, end, max_points)
+
+    def on_result(self, owner, request_id, result):
+        if owner is not self or request_id != self.request_id or self.live:
+            return
+
+        self.clear_envelopes()
+        for line, metric in self.series:
+            times, mins, maxs, means = result[metric]
+            plot_times = to_plot_times(times)
+            line.set_data(plot_times, means)
+            if len(times) and mins is not means:
+                self.envelopes.append(line.axes.fill_between(
+                    plot_times, mins, maxs, color=line.get_color(), alpha=0.2, linewidth=0))
+        self.canvas.draw_idle()
+
+    def clear_envelopes(self):
+        for envelope in self.envelopes:
+            envelope.remove()
+        self.envelopes = []
@@ -0,0 +1,214 @@
+"""Columnar exports of the sample history for offline analysis.
+
+Both writers make a single pass over the history and hold at most one chunk
+of rows in memory:
+
+* CSV.gz: one row per sample, written in chunks through gzip;
+* NPZ: one float64 array per numeric metric plus ``timestamp`` (epoch
+  seconds), NaN where a sample lacks the metric. ``write_npy_dir`` writes
+  the same arrays as a directory of ``.npy`` files that load with
+  ``numpy.load(path, mmap_mode='r')``.
+
+Run as a script to convert an XLSX export or an NDJSON file of samples:
+
+    python src/export.py system_report.xlsx -f npz -o metrics.npz
+"""
+import argparse
+import csv
+import gzip
+import json
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from array import array
+from urllib.parse import quote
+
+import numpy as np
+
+from metrics import flatten_sample, sample_columns, scan_columns
+from reports import ReportCancelled, track_progress, discard_partial, report_filename
+
+CHUNK_ROWS = 4096
+
+
+def sample_rows(historical_data, columns, progress=None):
+    """(timestamp, values) per sample with values in the order of columns"""
+    for data in track_progress(historical_data, progress):
+        flat = flatten_sample(data)
+        yield data['timestamp'], [flat.get(name) for name in columns]
+
+
+def write_csv(rows, columns, filename, compresslevel=6):
+    """Write (timestamp, values) rows to a gzip-compressed CSV in chunks"""
+    with gzip.open(filename, 'wt', encoding='utf-8', newline='', compresslevel=compresslevel) as f:
+        writer = csv.writer(f)
+        writer.writerow(['timestamp'] + columns)
+        chunk = []
+        for timestamp, values in rows:
+            chunk.append([repr(timestamp)] + ['' if v is None else v for v in values])
+            if len(chunk) >= CHUNK_ROWS:
+                writer.writerows(chunk)
+                chunk.clear()
+        writer.writerows(chunk)
+
+
+class ColumnSpool:
+    """Accumulates float64 columns in temporary files, a chunk at a time"""
+
+    def __init__(self, names, directory):
+        self.names = names
+        self.count = 0
+        self.tmp = tempfile.TemporaryDirectory(dir=directory)
+        self.files = [open(os.path.join(self.tmp.name, f"{i}.bin"), 'w+b') for i in range(len(names))]
+        self.buffers = [array('d') for _ in names]
+
+    def append(self, values):
+        for buffer, value in zip(self.buffers, values):
+            buffer.append(np.nan if value is None else value)
+        self.count += 1
+        if len(self.buffers[0]) >= CHUNK_ROWS:
+            self.flush()
+
+    def flush(self):
+        for f, buffer in zip(self.files, self.buffers):
+            buffer.tofile(f)
+            del buffer[:]
+
+    def copy_npy(self, index, out):
+        """Write column index to out as a complete .npy file"""
+        header = {'descr': np.dtype('<f8').str, 'fortran_order': False, 'shape': (self.count,)}
+        np.lib.format.write_array_header_1_0(out, header)
+        f = self.files[index]
+        f.seek(0)
+        shutil.copyfileobj(f, out, 1 << 20)
+
+    def close(self):
+        for f in self.files:
+            f.close()
+        self.tmp.cleanup()
+
+
+def write_npz(rows, columns, filename, compress=True):
+    """Write (timestamp, values) rows as one .npy member per column of an .npz"""
+    names = ['timestamp'] + columns
+    spool = ColumnSpool(names, os.path.dirname(os.path.abspath(filename)))
+    try:
+        for timestamp, values in rows:
+            spool.append([timestamp] + values)
+        spool.flush()
+        mode = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        with zipfile.ZipFile(filename, 'w', mode, allowZip64=True) as zf:
+            for i, name in enumerate(names):
+                with zf.open(name + '.npy', 'w', force_zip64=True) as member:
+                    spool.copy_npy(i, member)
+    finally:
+        spool.close()
+
+
+def write_npy_dir(rows, columns, directory):
+    """Write (timestamp, values) rows as a directory of memory-mappable .npy files"""
+    names = ['timestamp'] + columns
+    os.makedirs(directory, exist_ok=True)
+    spool = ColumnSpool(names, directory)
+    try:
+        for timestamp, values in rows:
+            spool.append([timestamp] + values)
+        spool.flush()
+        for i, name in enumerate(names):
+            # Mount points contain '/', so file names are percent-encoded
+            with open(os.path.join(directory, quote(name, safe='.') + '.npy'), 'wb') as f:
+                spool.copy_npy(i, f)
+    finally:
+        spool.close()
+
+
+def generate_csv_report(historical_data, filename=None, progress=None):
+    """Export the history as a gzip-compressed CSV with one column per metric"""
+    filename = filename or report_filename("csv.gz")
+    try:
+        columns, _ = sample_columns(historical_data)
+        write_csv(sample_rows(historical_data, columns, progress), columns, filename)
+        return filename
+    except ReportCancelled:
+        discard_partial(filename)
+        raise
+    except Exception as e:
+        raise RuntimeError(f"CSV export failed: {str(e)}")
+
+
+def generate_npz_report(historical_data, filename=None, compress=True, progress=None):
+    """Export the numeric metrics of the history as float64 arrays in an .npz"""
+    filename = filename or report_filename("npz")
+    try:
+        columns = [name for name, numeric in scan_columns(historical_data).items() if numeric]
+        write_npz(sample_rows(historical_data, columns, progress), columns, filename, compress)
+        return filename
+    except ReportCancelled:
+        discard_partial(filename)
+        raise
+    except Exception as e:
+        raise RuntimeError(f"NPZ export failed: {str(e)}")
+
+
+def read_xlsx_rows(path):
+    """Columns and (timestamp, values) rows of an XLSX export, streamed"""
+    from datetime import datetime
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True)
+    ws = wb.worksheets[0]
+    rows = ws.iter_rows(values_only=True)
+    columns = list(next(rows))[1:]
+
+    def generate():
+        try:
+            for row in rows:
+                yield datetime.fromisoformat(row[0]).timestamp(), list(row[1:])
+        finally:
+            wb.close()
+    return columns, generate()
+
+
+def read_ndjson_samples(path):
+    """Samples from a file with one JSON-encoded sample per line"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert exported samples to CSV.gz, NPZ or a .npy directory")
+    parser.add_argument('input', help="XLSX export or NDJSON file of samples")
+    parser.add_argument('-f', '--format', choices=['csv', 'npz', 'npy'], default='npz')
+    parser.add_argument('-o', '--output', help="output file (directory for npy)")
+    parser.add_argument('--no-compress', action='store_true', help="store .npz members uncompressed")
+    args = parser.parse_args(argv)
+
+    if args.input.endswith('.xlsx'):
+        columns, rows = read_xlsx_rows(args.input)
+    else:
+        # NDJSON has no header: the columns come from a first pass over the whole file
+        columns = scan_columns(read_ndjson_samples(args.input))
+        columns = [name for name, numeric in columns.items() if numeric or args.format == 'csv']
+        rows = sample_rows(read_ndjson_samples(args.input), columns)
+
+    if args.format != 'csv':
+        # Values that are not numbers (e.g. text cells of an XLSX) become NaN
+        rows = ((t, [v if isinstance(v, (int, float)) else None for v in values]) for t, values in rows)
+
+    default_ext = {'csv': 'csv.gz', 'npz': 'npz', 'npy': 'npy'}[args.format]
+    output = args.output or os.path.splitext(args.input)[0] + '.' + default_ext
+    if args.format == 'csv':
+        write_csv(rows, columns, output)
+    elif args.format == 'npz':
+        write_npz(rows, columns, output, compress=not args.no_compress)
+    else:
+        write_npy_dir(rows, columns, output)
+    print(output)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
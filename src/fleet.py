@@ -0,0 +1,235 @@
+"""Fleet monitoring: an asyncio aggregator for many agents.
+
+Each agent address ("host:port", see agent.py) gets one task that keeps a
+persistent connection: it connects, reads HELLO, then either subscribes to
+pushed samples or polls with GET, and treats a connection that stays silent
+for STALE_INTERVALS sample intervals as lost. Failed and lost connections
+are retried with exponential backoff and jitter, so a fleet that goes down
+together does not reconnect in lockstep. A semaphore bounds concurrent
+connection attempts. All state lives on the aggregator's loop; about once
+a second FleetThread hands the GUI the agents that changed since the last
+update and the addresses that were removed.
+"""
+import asyncio
+import random
+import time
+from collections import deque
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from agent import GET, HELLO, SAMPLE, SUBSCRIBE, SAMPLE_FIELDS, pack_frame, read_frame, unpack_hello, unpack_sample
+
+DEFAULT_AGENT_PORT = 5300
+CONNECT_TIMEOUT_S = 5
+BACKOFF_MIN_S = 1
+BACKOFF_MAX_S = 60
+STALE_INTERVALS = 3
+MAX_CONNECTING = 64
+PUBLISH_INTERVAL_S = 1.0
+CPU_HISTORY_POINTS = 60
+
+
+def split_address(address):
+    """(host, port) of "host", "host:port" or "[ipv6]:port"; raises ValueError for an invalid address"""
+    if not isinstance(address, str):
+        raise ValueError(f"Invalid agent address: {address!r}")
+    address = address.strip()
+    if address.startswith('['):
+        host, _, rest = address[1:].partition(']')
+        port = rest[1:]
+    elif address.count(':') == 1:
+        host, port = address.split(':')
+    else:
+        host, port = address, ''
+    if not host:
+        raise ValueError(f"Invalid agent address: {address!r}")
+    if not port:
+        return host, DEFAULT_AGENT_PORT
+    if not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f"Invalid agent port: {port}")
+    return host, int(port)
+
+
+def check_agents(addresses):
+    """(valid addresses, {invalid address: reason}); duplicates are dropped"""
+    valid, invalid = [], {}
+    for address in addresses:
+        try:
+            split_address(address)
+        except ValueError as e:
+            invalid[str(address)] = str(e)
+            continue
+        if address not in valid:
+            valid.append(address)
+    return valid, invalid
+
+
+class AgentState:
+    def __init__(self, address):
+        self.address = address
+        self.host, self.port = split_address(address)
+        self.name = None
+        self.status = 'Connecting'
+        self.sample = None
+        self.last_seen = None
+        self.error = None
+        self.reconnects = 0
+        self.cpu_history = deque(maxlen=CPU_HISTORY_POINTS)
+
+    def snapshot(self):
+        device = {'address': self.address, 'name': self.name or self.address, 'status': self.status,
+                  'last_seen': self.last_seen, 'error': self.error, 'reconnects': self.reconnects,
+                  'cpu_history': tuple(self.cpu_history)}
+        sample = self.sample or {}
+        device.update((name, sample.get(name)) for name in SAMPLE_FIELDS)
+        return device
+
+
+class FleetAggregator:
+    """Keeps one connection per agent; methods must run on the aggregator's loop"""
+
+    def __init__(self, mode='subscribe', poll_interval_s=2.0):
+        self.mode = mode
+        self.poll_interval_s = poll_interval_s
+        self.states = {}
+        self.tasks = {}
+        # Адреса, изменившиеся и удалённые с последней публикации
+        self.dirty = set()
+        self.removed = set()
+        # Адреса, которые не удалось разобрать, с причиной
+        self.invalid = {}
+        self.connecting = None
+
+    def set_agents(self, addresses):
+        """Start tasks for new addresses and cancel those of removed ones; invalid addresses are skipped"""
+        if self.connecting is None:
+            self.connecting = asyncio.Semaphore(MAX_CONNECTING)
+        addresses, self.invalid = check_agents(addresses)
+        for address in set(self.states) - set(addresses):
+            self.tasks.pop(address).cancel()
+            del self.states[address]
+            self.dirty.discard(address)
+            self.removed.add(address)
+        for address in addresses:
+            if address not in self.states:
+                self.states[address] = AgentState(address)
+                self.tasks[address] = asyncio.ensure_future(self.maintain(self.states[address]))
+                self.dirty.add(address)
+
+    def snapshot(self):
+        return [state.snapshot() for state in self.states.values()]
+
+    def take_changes(self):
+        """(snapshots of agents changed since the last call, removed addresses)"""
+        changed = [self.states[address].snapshot() for address in self.dirty if address in self.states]
+        removed = list(self.removed)
+        self.dirty = set()
+        self.removed = set()
+        return changed, removed
+
+    def set_status(self, state, status, error=None):
+        state.status = status
+        state.error = error
+        self.dirty.add(state.address)
+
+    async def maintain(self, state):
+        backoff = BACKOFF_MIN_S
+        while True:
+            try:
+                async with self.connecting:
+                    reader, writer = await asyncio.wait_for(
+                        asyncio.open_connection(state.host, state.port), CONNECT_TIMEOUT_S)
+                try:
+                    await self.session(state, reader, writer)
+                finally:
+                    writer.close()
+            except asyncio.TimeoutError:
+                error = "Timed out" if state.status == 'Connecting' else "No samples received"
+            except asyncio.IncompleteReadError:
+                error = "Connection closed by agent"
+            except (OSError, ValueError) as e:
+                error = e.strerror if isinstance(e, OSError) and e.strerror else str(e)
+            except Exception as e:
+                # Непредвиденная ошибка не должна завершать задачу агента, иначе он навсегда застрянет
+                error = f"{type(e).__name__}: {e}"
+
+            # После удачного соединения ожидание начинается заново
+            if state.status == 'Online':
+                backoff = BACKOFF_MIN_S
+                state.reconnects += 1
+            self.set_status(state, 'Offline', error)
+            await asyncio.sleep(random.uniform(backoff / 2, backoff))
+            backoff = min(backoff * 2, BACKOFF_MAX_S)
+            self.set_status(state, 'Connecting', error)
+
+    async def session(self, state, reader, writer):
+        kind, payload = await asyncio.wait_for(read_frame(reader), CONNECT_TIMEOUT_S)
+        if kind != HELLO:
+            raise ValueError(f"Expected HELLO, got message type {kind}")
+        state.name, interval_s = unpack_hello(payload)
+        if self.mode == 'subscribe':
+            writer.write(pack_frame(SUBSCRIBE))
+        self.set_status(state, 'Online')
+        timeout = STALE_INTERVALS * max(interval_s, self.poll_interval_s if self.mode == 'poll' else 0)
+        while True:
+            if self.mode == 'poll':
+                writer.write(pack_frame(GET))
+            await writer.drain()
+            kind, payload = await asyncio.wait_for(read_frame(reader), timeout)
+            if kind == SAMPLE:
+                state.sample = unpack_sample(payload)
+                state.last_seen = time.time()
+                state.cpu_history.append(state.sample['cpu_percent'])
+                self.dirty.add(state.address)
+            if self.mode == 'poll':
+                await asyncio.sleep(self.poll_interval_s)
+
+    async def publish(self, emit):
+        """Call emit(changed, removed) whenever something changed, at most once per interval"""
+        while True:
+            if self.dirty or self.removed:
+                emit(*self.take_changes())
+            await asyncio.sleep(PUBLISH_INTERVAL_S)
+
+    async def close(self):
+        tasks = list(self.tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class FleetThread(QThread):
+    """Runs a FleetAggregator on its own asyncio loop"""
+    devices_updated = pyqtSignal(object, object)
+
+    def __init__(self, addresses=(), mode='subscribe', parent=None):
+        super().__init__(parent)
+        self.aggregator = FleetAggregator(mode)
+        self.addresses = list(addresses)
+        self.loop = asyncio.new_event_loop()
+        self.task = None
+
+    def set_agents(self, addresses):
+        self.addresses = list(addresses)
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.aggregator.set_agents, self.addresses)
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.aggregator.set_agents(self.addresses)
+        self.task = self.loop.create_task(self.aggregator.publish(self.devices_updated.emit))
+        try:
+            self.loop.run_until_complete(self.task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.loop.run_until_complete(self.aggregator.close())
+            self.loop.close()
+
+    def stop(self):
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.cancel_task)
+
+    def cancel_task(self):
+        if self.task is not None:
+            self.task.cancel()
@@ -0,0 +1,154 @@
+import queue
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from metrics import CORE_METRIC_NAMES, core_values
+from summary import HourlyRollups
+
+
+class HistoryStore:
+    """Append-only columnar history of the core metrics.
+
+    Columns are typed arrays indexed by sample; times are epoch seconds in
+    ascending order, so a time range maps to an index range by bisection.
+    Appends come from the GUI thread, queries from the query worker.
+    Samples are folded into hourly rollups before they are dropped, so
+    summaries can cover more than the retained samples.
+    """
+
+    def __init__(self, max_samples):
+        self.max_samples = max_samples
+        self.times = array('d')
+        self.columns = {name: array('d') for name in CORE_METRIC_NAMES}
+        self.lock = threading.Lock()
+        self.rollups = HourlyRollups()
+        self.rolled_up = 0
+
+    def __len__(self):
+        return len(self.times)
+
+    def set_max_samples(self, max_samples):
+        # Лишние точки удаляются при следующем append
+        with self.lock:
+            self.max_samples = max_samples
+
+    def append(self, data):
+        values = core_values(data)
+        with self.lock:
+            self.times.append(data['timestamp'])
+            for name, value in zip(CORE_METRIC_NAMES, values):
+                self.columns[name].append(value)
+
+            # Старые точки удаляются пачками, чтобы не сдвигать массивы на каждой выборке
+            excess = len(self.times) - self.max_samples
+            if excess > max(1, self.max_samples // 10):
+                self.fold_rollups()
+                del self.times[:excess]
+                for column in self.columns.values():
+                    del column[:excess]
+                self.rolled_up -= excess
+
+    def fold_rollups(self):
+        # Вызывается под self.lock
+        i0 = self.rolled_up
+        if i0 >= len(self.times):
+            return
+        times = np.array(self.times[i0:])
+        columns = {name: np.array(self.columns[name][i0:]) for name in self.rollups.metrics}
+        self.rollups.add(times, columns)
+        self.rolled_up = len(self.times)
+
+    def update_rollups(self):
+        """Fold the samples appended since the last update into the rollups"""
+        with self.lock:
+            self.fold_rollups()
+
+    def time_range(self):
+        with self.lock:
+            if not self.times:
+                return None
+            return self.times[0], self.times[-1]
+
+    def since(self, watermark):
+        """Times and all columns of the samples newer than watermark (all when None)"""
+        with self.lock:
+            i0 = 0 if watermark is None else bisect_right(self.times, watermark)
+            times = np.frombuffer(self.times[i0:], dtype=np.float64)
+            columns = {name: np.frombuffer(column[i0:], dtype=np.float64) for name, column in self.columns.items()}
+        return times, columns
+
+    def count(self, start, end):
+        with self.lock:
+            return bisect_right(self.times, end) - bisect_left(self.times, start)
+
+    def slice(self, metric, start, end):
+        """Copy the samples of metric with start <= time <= end as NumPy arrays"""
+        with self.lock:
+            i0 = bisect_left(self.times, start)
+            i1 = bisect_right(self.times, end)
+            times = np.frombuffer(self.times[i0:i1], dtype=np.float64)
+            values = np.frombuffer(self.columns[metric][i0:i1], dtype=np.float64)
+        return times, values
+
+    def query(self, metric, start, end, max_points):
+        """Return (times, mins, maxs, means) for a range, at most max_points long"""
+        times, values = self.slice(metric, start, end)
+        return downsample(times, values, max_points)
+
+
+def downsample(times, values, max_points):
+    """Reduce a series to max_points buckets keeping the min/max envelope"""
+    n = len(times)
+    if n <= max_points:
+        return times, values, values, values
+
+    starts = np.linspace(0, n, max_points, endpoint=False).astype(np.int64)
+    counts = np.diff(np.append(starts, n))
+    mins = np.fmin.reduceat(values, starts)
+    maxs = np.fmax.reduceat(values, starts)
+
+    valid = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+    valid_counts = np.add.reduceat(valid.astype(np.int64), starts)
+    means = np.divide(sums, valid_counts, out=np.full(len(starts), np.nan), where=valid_counts > 0)
+    return times[starts + counts // 2], mins, maxs, means
+
+
+class HistoryQueryThread(QThread):
+    """Runs history range queries off the GUI thread.
+
+    Only the newest pending request of each owner is executed, so a burst of
+    navigation events costs a single query.
+    """
+    result_ready = pyqtSignal(object, int, object)
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.requests = queue.Queue()
+
+    def submit(self, owner, request_id, metrics, start, end, max_points):
+        self.requests.put((owner, request_id, metrics, start, end, max_points))
+
+    def stop(self):
+        self.requests.put(None)
+
+    def run(self):
+        while True:
+            pending = {}
+            request = self.requests.get()
+            while True:
+                if request is None:
+                    return
+                pending[id(request[0])] = request
+                try:
+                    request = self.requests.get_nowait()
+                except queue.Empty:
+                    break
+
+            for owner, request_id, metrics, start, end, max_points in pending.values():
+                result = {metric: self.store.query(metric, start, end, max_points) for metric in metrics}
+                self.result_ready.emit(owner, request_id, result)
@@ -0,0 +1,83 @@
+import itertools
+import queue
+import threading
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from reports import ReportCancelled
+
+
+class ReportJob:
+    def __init__(self, job_id, title, func, args, kwargs):
+        self.job_id = job_id
+        self.title = title
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.cancel_event = threading.Event()
+
+
+class ReportWorker(QThread):
+    """Runs report jobs one after another off the GUI thread.
+
+    Jobs receive an immutable snapshot of their input and a progress callback;
+    cancelling a job makes its next progress call raise ReportCancelled.
+    """
+    job_started = pyqtSignal(int)
+    job_progress = pyqtSignal(int, int)
+    job_finished = pyqtSignal(int, str)
+    job_failed = pyqtSignal(int, str)
+    job_cancelled = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.jobs = queue.Queue()
+        self.active = {}
+        self.ids = itertools.count(1)
+
+    def submit(self, title, func, *args, **kwargs):
+        job = ReportJob(next(self.ids), title, func, args, kwargs)
+        self.active[job.job_id] = job
+        self.jobs.put(job)
+        return job.job_id
+
+    def cancel(self, job_id):
+        job = self.active.get(job_id)
+        if job is not None:
+            job.cancel_event.set()
+
+    def stop(self):
+        for job in list(self.active.values()):
+            job.cancel_event.set()
+        self.jobs.put(None)
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            self.run_job(job)
+            self.active.pop(job.job_id, None)
+
+    def run_job(self, job):
+        if job.cancel_event.is_set():
+            self.job_cancelled.emit(job.job_id)
+            return
+
+        last_percent = [-1]
+
+        def progress(done, total):
+            if job.cancel_event.is_set():
+                raise ReportCancelled()
+            percent = int(done * 100 / total) if total else 100
+            if percent != last_percent[0]:
+                last_percent[0] = percent
+                self.job_progress.emit(job.job_id, percent)
+
+        self.job_started.emit(job.job_id)
+        try:
+            filename = job.func(*job.args, progress=progress, **job.kwargs)
+            self.job_finished.emit(job.job_id, filename)
+        except ReportCancelled:
+            self.job_cancelled.emit(job.job_id)
+        except Exception as e:
+            self.job_failed.emit(job.job_id, str(e))
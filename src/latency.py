@@ -0,0 +1,250 @@
+"""Concurrent latency monitor.
+
+Targets are probed in rounds on an asyncio loop that runs in a QThread.
+``host:port`` targets are timed with a TCP connect and bare hosts with one
+``ping`` subprocess each. A semaphore bounds the number of probes in flight,
+so hundreds of targets share a limited number of sockets and processes.
+Each target keeps ring buffers of its last probe times and round trip times
+(NaN marks a lost probe).
+"""
+import asyncio
+import math
+import platform
+import re
+import socket
+import threading
+import time
+
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+
+HISTORY_SIZE = 720
+DEFAULT_INTERVAL_S = 5
+DEFAULT_TIMEOUT_S = 2
+DEFAULT_CONCURRENCY = 64
+PING_TIME_RE = re.compile(rb'time[=<]\s*([\d.]+)\s*ms')
+
+
+def parse_target(target):
+    """Split a target into (host, port); port is None for ICMP targets.
+
+    ``host:port`` and ``[ipv6]:port`` are TCP targets, a bare host or IPv6
+    address is pinged. Raises ValueError for an invalid target or port.
+    """
+    if not isinstance(target, str):
+        raise ValueError(f"Invalid target: {target!r}")
+    target = target.strip()
+    if target.startswith('['):
+        host, _, rest = target[1:].partition(']')
+        port = rest[1:] if rest.startswith(':') else ''
+    elif target.count(':') == 1:
+        host, port = target.split(':')
+    else:
+        host, port = target, ''
+    if not host:
+        raise ValueError(f"Invalid target: {target!r}")
+    if not port:
+        return host, None
+    if not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f"Invalid port: {port}")
+    return host, int(port)
+
+
+def check_targets(targets):
+    """(valid targets, {invalid target: reason}); duplicates are dropped"""
+    valid, invalid = [], {}
+    for target in targets:
+        try:
+            parse_target(target)
+        except ValueError as e:
+            invalid[str(target)] = str(e)
+            continue
+        if target not in valid:
+            valid.append(target)
+    return valid, invalid
+
+
+def ping_command(host, timeout_s):
+    system = platform.system()
+    if system == 'Windows':
+        return ['ping', '-n', '1', '-w', str(int(timeout_s * 1000)), host]
+    if system == 'Darwin':
+        return ['ping', '-c', '1', '-W', str(int(timeout_s * 1000)), host]
+    return ['ping', '-c', '1', '-W', str(max(1, math.ceil(timeout_s))), host]
+
+
+async def probe_tcp(host, port, timeout_s):
+    """Time a TCP connect to host:port; returns (rtt_ms or None, error or None)"""
+    loop = asyncio.get_running_loop()
+    try:
+        # Разрешение имени не входит в измеряемое время
+        infos = await asyncio.wait_for(loop.getaddrinfo(host, port, type=socket.SOCK_STREAM), timeout_s)
+        address = infos[0][4]
+        start = time.perf_counter()
+        _, writer = await asyncio.wait_for(asyncio.open_connection(address[0], port), timeout_s)
+    except asyncio.TimeoutError:
+        return None, "Timeout"
+    except OSError as e:
+        return None, e.strerror or str(e)
+    rtt_ms = (time.perf_counter() - start) * 1000
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return rtt_ms, None
+
+
+async def probe_icmp(host, timeout_s):
+    """Send one echo request with the system ping; returns (rtt_ms or None, error or None)"""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *ping_command(host, timeout_s), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+    except OSError as e:
+        return None, e.strerror or str(e)
+    try:
+        output, _ = await asyncio.wait_for(proc.communicate(), timeout_s + 1)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return None, "Timeout"
+    match = PING_TIME_RE.search(output)
+    if proc.returncode == 0 and match:
+        return float(match.group(1)), None
+    return None, "No reply"
+
+
+class LatencySeries:
+    """Ring buffers of probe times (epoch s) and RTTs (ms) for one target"""
+
+    def __init__(self, target, size=HISTORY_SIZE):
+        self.target = target
+        self.host, self.port = parse_target(target)
+        self.times = np.full(size, np.nan)
+        self.rtts = np.full(size, np.nan)
+        self.count = 0
+        self.error = None
+
+    @property
+    def method(self):
+        return "ICMP" if self.port is None else "TCP"
+
+    def add(self, t, rtt_ms, error=None):
+        i = self.count % len(self.times)
+        self.times[i] = t
+        self.rtts[i] = np.nan if rtt_ms is None else rtt_ms
+        self.count += 1
+        self.error = error
+
+    def ordered(self):
+        """Copies of the buffered times and RTTs, oldest first"""
+        n = min(self.count, len(self.times))
+        index = np.arange(self.count - n, self.count) % len(self.times)
+        return self.times[index], self.rtts[index]
+
+    def stats(self):
+        _, rtts = self.ordered()
+        ok = rtts[~np.isnan(rtts)]
+        last = rtts[-1] if len(rtts) else np.nan
+        return {
+            'target': self.target,
+            'method': self.method,
+            'last': None if math.isnan(last) else float(last),
+            'avg': float(ok.mean()) if len(ok) else None,
+            'p95': float(np.percentile(ok, 95)) if len(ok) else None,
+            'max': float(ok.max()) if len(ok) else None,
+            'loss': 100.0 * (len(rtts) - len(ok)) / len(rtts) if len(rtts) else None,
+            'probes': self.count,
+            'error': self.error,
+        }
+
+
+class LatencyMonitor:
+    """Probes a set of targets in rounds, at most concurrency at a time"""
+
+    def __init__(self, targets=(), interval_s=DEFAULT_INTERVAL_S, timeout_s=DEFAULT_TIMEOUT_S,
+                 concurrency=DEFAULT_CONCURRENCY, history_size=HISTORY_SIZE):
+        self.interval_s = interval_s
+        self.timeout_s = timeout_s
+        self.concurrency = concurrency
+        self.history_size = history_size
+        self.lock = threading.Lock()
+        self.series = {}
+        self.invalid = {}
+        self.set_targets(targets)
+
+    def set_targets(self, targets):
+        """Replace the target list; targets that stay keep their history.
+
+        Invalid targets are skipped and kept in invalid with the reason.
+        """
+        targets, invalid = check_targets(targets)
+        with self.lock:
+            self.series = {target: self.series.get(target) or LatencySeries(target, self.history_size)
+                           for target in targets}
+            self.invalid = invalid
+
+    def snapshot(self):
+        with self.lock:
+            return [series.stats() for series in self.series.values()]
+
+    def history(self, target):
+        """(times, rtts) of target, oldest first, or None for an unknown target"""
+        with self.lock:
+            series = self.series.get(target)
+            return series.ordered() if series is not None else None
+
+    async def probe(self, series, semaphore):
+        async with semaphore:
+            if series.port is None:
+                rtt_ms, error = await probe_icmp(series.host, self.timeout_s)
+            else:
+                rtt_ms, error = await probe_tcp(series.host, series.port, self.timeout_s)
+        with self.lock:
+            series.add(time.time(), rtt_ms, error)
+
+    async def run_round(self):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        with self.lock:
+            targets = list(self.series.values())
+        await asyncio.gather(*(self.probe(series, semaphore) for series in targets))
+
+    async def run(self, on_round=None):
+        """Probe every interval_s until cancelled, calling on_round after each round"""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await self.run_round()
+            if on_round:
+                on_round()
+            await asyncio.sleep(max(0.0, self.interval_s - (loop.time() - started)))
+
+
+class LatencyThread(QThread):
+    """Runs a LatencyMonitor on its own asyncio loop; emits a snapshot after each round"""
+    updated = pyqtSignal(object)
+
+    def __init__(self, monitor, parent=None):
+        super().__init__(parent)
+        self.monitor = monitor
+        self.loop = asyncio.new_event_loop()
+        self.task = None
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.task = self.loop.create_task(self.monitor.run(lambda: self.updated.emit(self.monitor.snapshot())))
+        try:
+            self.loop.run_until_complete(self.task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.loop.run_until_complete(self.loop.shutdown_default_executor())
+            self.loop.close()
+
+    def stop(self):
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.cancel_task)
+
+    def cancel_task(self):
+        if self.task is not None:
+            self.task.cancel()
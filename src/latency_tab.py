@@ -0,0 +1,208 @@
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QHeaderView, QSpinBox, QMessageBox,
+    QLineEdit
+)
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+import matplotlib.dates as mdates
+from datetime import datetime
+from models import KeyedTableModel, create_table_view
+
+
+class LatencyTab(QWidget):
+    CHART_LINES = 8
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.monitor = None
+        self.latency_thread = None
+        # Цели из настроек, которые удалось и не удалось разобрать (с причиной)
+        self.valid_targets = []
+        self.invalid_targets = {}
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.target_edit = QLineEdit()
+        self.target_edit.setPlaceholderText("host (ICMP) or host:port (TCP)")
+        self.target_edit.returnPressed.connect(self.add_target)
+        add_btn = QPushButton("Add")
+        add_btn.clicked.connect(self.add_target)
+        remove_btn = QPushButton("Remove Selected")
+        remove_btn.clicked.connect(self.remove_selected_targets)
+        self.interval_spin = QSpinBox()
+        self.interval_spin.setRange(1, 3600)
+        self.interval_spin.setSuffix(" s")
+        self.interval_spin.setValue(self.parent.settings.get('latency_interval_s', 5))
+        self.interval_spin.valueChanged.connect(self.apply_options)
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, 1024)
+        self.concurrency_spin.setValue(self.parent.settings.get('latency_concurrency', 64))
+        self.concurrency_spin.valueChanged.connect(self.apply_options)
+        self.start_btn = QPushButton("Start")
+        self.start_btn.clicked.connect(self.toggle_monitor)
+        controls.addWidget(self.target_edit, 1)
+        controls.addWidget(add_btn)
+        controls.addWidget(remove_btn)
+        controls.addWidget(QLabel("Every:"))
+        controls.addWidget(self.interval_spin)
+        controls.addWidget(QLabel("Parallel probes:"))
+        controls.addWidget(self.concurrency_spin)
+        controls.addWidget(self.start_btn)
+        layout.addLayout(controls)
+
+        self.fig = Figure(figsize=(10, 4), dpi=100)
+        self.canvas = FigureCanvas(self.fig)
+        self.ax = self.fig.add_subplot(111)
+        self.ax.set_title("Round Trip Time")
+        self.ax.set_ylabel("RTT (ms)")
+        self.ax.grid(True, linestyle='--', alpha=0.6)
+        self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
+        self.fig.tight_layout()
+        layout.addWidget(self.canvas)
+
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter targets...")
+        layout.addWidget(self.filter_edit)
+
+        ms = lambda v: "-" if v is None else f"{v:.1f} ms"
+        self.model = KeyedTableModel(
+            ["Target", "Method", "Last", "Average", "95th Percentile", "Max", "Loss", "Error"],
+            formatters={2: ms, 3: ms, 4: ms, 5: ms, 6: lambda v: "-" if v is None else f"{v:.0f}%"},
+            colorizers={6: lambda v: None if not v else 'red' if v >= 50 else 'orange'},
+            parent=self)
+        self.table, self.proxy = create_table_view(self.model, resize_mode=QHeaderView.ResizeToContents)
+        self.filter_edit.textChanged.connect(self.proxy.setFilterFixedString)
+        self.table.selectionModel().selectionChanged.connect(self.update_chart)
+        layout.addWidget(self.table)
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        self.targets_changed()
+
+    def targets(self):
+        return self.parent.settings.get('latency_targets', [])
+
+    def add_target(self):
+        from latency import parse_target
+
+        target = self.target_edit.text().strip()
+        if not target or target in self.targets():
+            return
+        try:
+            parse_target(target)
+        except ValueError as e:
+            QMessageBox.warning(self, "Latency Monitor", str(e))
+            return
+        self.target_edit.clear()
+        # Таблицу и монитор обновит settings_changed
+        self.parent.settings_store.update({'latency_targets': self.targets() + [target]})
+
+    def remove_selected_targets(self):
+        rows = {self.proxy.mapToSource(index).row() for index in self.table.selectionModel().selectedRows()}
+        removed = {self.model.key_at(row) for row in rows}
+        self.parent.settings_store.update({'latency_targets': [t for t in self.targets() if t not in removed]})
+
+    def targets_changed(self):
+        from latency import check_targets
+
+        # Цели могут прийти из правки файла настроек, поэтому неверные пропускаем, а не падаем
+        self.valid_targets, self.invalid_targets = check_targets(self.targets())
+        if self.monitor is not None:
+            self.monitor.set_targets(self.targets())
+        self.update_table(self.monitor.snapshot() if self.monitor is not None else None)
+        if self.latency_thread is None:
+            self.set_status("Stopped" if self.monitor is not None else "")
+
+    def set_status(self, text):
+        """Show text in the status line, followed by the targets that were skipped"""
+        if self.invalid_targets:
+            skipped = "; ".join(f"{target} ({reason})" for target, reason in self.invalid_targets.items())
+            text = f"{text}. Skipped invalid targets: {skipped}" if text else f"Skipped invalid targets: {skipped}"
+        self.status_label.setText(text)
+
+    def apply_options(self):
+        self.parent.settings_store.update({
+            'latency_interval_s': self.interval_spin.value(),
+            'latency_concurrency': self.concurrency_spin.value(),
+        })
+        if self.monitor is not None:
+            self.monitor.interval_s = self.interval_spin.value()
+            self.monitor.concurrency = self.concurrency_spin.value()
+
+    def settings_changed(self, keys):
+        if 'latency_targets' in keys:
+            self.targets_changed()
+        self.interval_spin.setValue(self.parent.settings.get('latency_interval_s', 5))
+        self.concurrency_spin.setValue(self.parent.settings.get('latency_concurrency', 64))
+
+    def toggle_monitor(self):
+        if self.latency_thread is None:
+            self.start_monitor()
+        else:
+            self.stop_monitor()
+
+    def start_monitor(self):
+        from latency import LatencyMonitor, LatencyThread
+
+        if self.latency_thread is not None:
+            return
+        if self.monitor is None:
+            self.monitor = LatencyMonitor(self.targets())
+        self.apply_options()
+        self.latency_thread = LatencyThread(self.monitor, self)
+        self.latency_thread.updated.connect(self.update_table)
+        self.latency_thread.start()
+        self.start_btn.setText("Stop")
+        self.set_status(f"Monitoring {len(self.valid_targets)} targets")
+
+    def stop_monitor(self):
+        if self.latency_thread is None:
+            return
+        self.latency_thread.stop()
+        self.latency_thread.wait()
+        self.latency_thread = None
+        self.start_btn.setText("Start")
+        self.set_status("Stopped")
+
+    def update_table(self, snapshot):
+        if snapshot is None:
+            snapshot = [{'target': target, 'method': None, 'last': None, 'avg': None, 'p95': None,
+                         'max': None, 'loss': None, 'error': None} for target in self.valid_targets]
+        self.model.set_rows(
+            (s['target'], (s['target'], s['method'] or "", s['last'], s['avg'], s['p95'], s['max'], s['loss'],
+                           s['error'] or ""))
+            for s in snapshot)
+        if self.latency_thread is not None:
+            self.set_status(f"Monitoring {len(snapshot)} targets, last round {datetime.now().strftime('%H:%M:%S')}")
+        self.update_chart()
+
+    def chart_targets(self):
+        """Selected targets, or the slowest ones when nothing is selected"""
+        rows = sorted({self.proxy.mapToSource(index).row() for index in self.table.selectionModel().selectedRows()})
+        if rows:
+            return [self.model.key_at(row) for row in rows[:self.CHART_LINES]]
+        averages = [(row[3], key) for key, row in zip(self.model.keys, self.model.rows) if row[3] is not None]
+        return [key for _, key in sorted(averages, reverse=True)[:self.CHART_LINES]]
+
+    def update_chart(self, *args):
+        if self.monitor is None:
+            return
+        from timebase import to_plot_times
+
+        for line in list(self.ax.lines):
+            line.remove()
+        for target in self.chart_targets():
+            history = self.monitor.history(target)
+            if history is not None and len(history[0]):
+                self.ax.plot(to_plot_times(history[0]), history[1], label=target)
+        if self.ax.lines:
+            self.ax.legend(loc='upper left', fontsize='small')
+            self.ax.relim()
+            self.ax.autoscale_view()
+        elif self.ax.get_legend() is not None:
+            self.ax.get_legend().remove()
+        self.canvas.draw_idle()
@@ -1,4 +1,9 @@
 import sys
+import time
+
+START_TIME = time.perf_counter()
+
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication
 from app import SystemMonitorApp
 
@@ -7,4 +12,5 @@ if __name__ == "__main__":
     app.setStyle('Fusion')
     window = SystemMonitorApp()
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    QTimer.singleShot(0, lambda: window.report_startup_time(START_TIME))
+    sys.exit(app.exec_())
@@ -0,0 +1,95 @@
+import math
+
+
+def get_path(data, *path):
+    """Walk nested sample dicts, returning None when any level is missing"""
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def disk_max_percent(data):
+    disks = data.get('disk') or {}
+    return max((usage.get('percent', 0) for usage in disks.values()), default=None)
+
+
+def network_total(data, counter):
+    nics = data.get('network') or {}
+    return sum(c.get(counter, 0) for c in nics.values()) if nics else None
+
+
+# Основные метрики, которые хранятся в истории по столбцам
+CORE_METRICS = [
+    ('cpu.percent', lambda d: get_path(d, 'cpu', 'percent')),
+    ('cpu.temperature', lambda d: get_path(d, 'cpu', 'temperature')),
+    ('memory.percent', lambda d: get_path(d, 'memory', 'virtual', 'percent')),
+    ('memory.used', lambda d: get_path(d, 'memory', 'virtual', 'used')),
+    ('swap.percent', lambda d: get_path(d, 'memory', 'swap', 'percent')),
+    ('gpu.load', lambda d: get_path(d, 'gpu', 'load')),
+    ('gpu.temp', lambda d: get_path(d, 'gpu', 'temp')),
+    ('disk.max_percent', disk_max_percent),
+    ('net.bytes_sent', lambda d: network_total(d, 'bytes_sent')),
+    ('net.bytes_recv', lambda d: network_total(d, 'bytes_recv')),
+]
+CORE_METRIC_NAMES = [name for name, _ in CORE_METRICS]
+
+
+def core_values(data):
+    """Extract the core metrics of a sample as floats, NaN where missing"""
+    values = []
+    for _, extract in CORE_METRICS:
+        value = extract(data)
+        values.append(math.nan if value is None else float(value))
+    return values
+
+
+def flatten_sample(data, prefix=''):
+    """Flatten a nested sample into {'cpu.percent': ..., 'disk./.used': ...}"""
+    flat = {}
+    for key, value in data.items():
+        name = prefix + key
+        if isinstance(value, dict):
+            flat.update(flatten_sample(value, name + '.'))
+        elif value is None or isinstance(value, (int, float, str)):
+            flat[name] = value
+    return flat
+
+
+def scan_sample(data, columns, prefix=''):
+    for key, value in data.items():
+        name = prefix + key
+        if isinstance(value, dict):
+            scan_sample(value, columns, name + '.')
+        elif value is None or isinstance(value, (int, float, str)):
+            numeric = value is None or isinstance(value, (int, float)) and not isinstance(value, bool)
+            columns[name] = columns.get(name, True) and numeric
+
+
+def scan_columns(samples):
+    """{flattened column name: numeric} over all samples, in first-seen order.
+
+    A column is numeric when every value seen in it is a number or missing.
+    Only names and types are looked at, so this pass is cheaper than
+    flattening every sample.
+    """
+    columns = {}
+    for data in samples:
+        scan_sample(data, columns)
+    columns.pop('t_ns', None)
+    columns.pop('timestamp', None)
+    return columns
+
+
+def sample_columns(samples, sample_size=200):
+    """Flattened column names of all samples and the first and last samples.
+
+    The columns come from a scan of the whole history, so a metric that
+    only exists for a while (a disk mounted mid-range) is still exported;
+    the returned samples are only for sizing columns.
+    """
+    count = len(samples)
+    head = [samples[i] for i in range(min(sample_size, count))]
+    tail = [samples[i] for i in range(max(sample_size, count - sample_size), count)]
+    return list(scan_columns(samples)), head + tail
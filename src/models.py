@@ -0,0 +1,428 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex, QPointF, QSortFilterProxyModel
+from PyQt5.QtGui import QColor, QPainter, QPainterPath, QPen
+from PyQt5.QtWidgets import QTableView, QHeaderView, QStyledItemDelegate
+
+# Роль с «сырым» значением ячейки, по ней сортирует прокси-модель
+SORT_ROLE = Qt.UserRole
+
+
+def row_ranges(rows):
+    """(first, last) of each run of consecutive numbers in rows sorted in descending order"""
+    rows = list(rows)
+    while rows:
+        last = first = rows.pop(0)
+        while rows and rows[0] == first - 1:
+            first = rows.pop(0)
+        yield first, last
+
+
+class KeyedTableModel(QAbstractTableModel):
+    """Table model whose rows keep their identity by key between updates.
+
+    Cells hold raw values; text and colors are produced on demand by the
+    per-column formatters and colorizers, so only visible cells are formatted.
+    """
+
+    def __init__(self, headers, formatters=None, colorizers=None, parent=None):
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.formatters = formatters or {}
+        self.colorizers = colorizers or {}
+        self.keys = []
+        self.rows = []
+        self.key_index = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        return self.cell_data(index.row(), index.column(), role)
+
+    def cell_data(self, row, column, role):
+        value = self.rows[row][column]
+        if role == Qt.DisplayRole:
+            return self.display_text(value, column)
+        if role == SORT_ROLE:
+            return value
+        if role == Qt.ForegroundRole:
+            colorizer = self.colorizers.get(column)
+            color = colorizer(value) if colorizer else None
+            return QColor(color) if color else None
+        return None
+
+    def display_text(self, value, column):
+        formatter = self.formatters.get(column)
+        if formatter:
+            return formatter(value)
+        return "" if value is None else str(value)
+
+    def key_at(self, row):
+        return self.keys[row]
+
+    def set_rows(self, rows):
+        """Replace the contents with rows, an iterable of (key, values).
+
+        Rows whose key disappeared are removed, new keys are appended and
+        one dataChanged spans the rows and columns that actually changed.
+        """
+        incoming = {}
+        for key, values in rows:
+            incoming[key] = tuple(values)
+
+        self.remove_keys([key for key in self.keys if key not in incoming])
+        self.upsert_rows(incoming.items())
+
+    def remove_keys(self, keys):
+        """Remove the rows of keys; unknown keys are ignored"""
+        stale = sorted((self.key_index[key] for key in set(keys) if key in self.key_index), reverse=True)
+        # Подряд идущие строки удаляются одним сигналом, начиная с конца, чтобы номера не сдвигались
+        for first, last in row_ranges(stale):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.keys[first:last + 1]
+            del self.rows[first:last + 1]
+            self.endRemoveRows()
+        if stale:
+            self.key_index = {key: row for row, key in enumerate(self.keys)}
+
+    def upsert_rows(self, rows):
+        """Update or append rows without touching keys that are not given"""
+        new_rows = []
+        changed_rows = []
+        first_col, last_col = len(self.headers), -1
+        for key, values in rows:
+            values = tuple(values)
+            row = self.key_index.get(key)
+            if row is None:
+                new_rows.append((key, values))
+                continue
+
+            old = self.rows[row]
+            if old == values:
+                continue
+            changed = [col for col, value in enumerate(values) if col >= len(old) or old[col] != value]
+            self.rows[row] = values
+            changed_rows.append(row)
+            first_col, last_col = min(first_col, changed[0]), max(last_col, changed[-1])
+
+        # Один сигнал на всё обновление: прокси пересортировывает строки один раз, а не на каждую строку
+        if changed_rows:
+            self.dataChanged.emit(self.index(min(changed_rows), first_col), self.index(max(changed_rows), last_col))
+
+        if new_rows:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+            for offset, (key, values) in enumerate(new_rows):
+                self.key_index[key] = first + offset
+                self.keys.append(key)
+                self.rows.append(values)
+            self.endInsertRows()
+
+
+class KeyedSortFilterProxy(QAbstractProxyModel):
+    """Sorting and filtering proxy for a KeyedTableModel, done in Python.
+
+    QSortFilterProxyModel asks the source model for both values of every
+    comparison, so re-sorting after thousands of rows changed costs hundreds
+    of milliseconds. This proxy sorts the source's raw rows with a key
+    function instead and tells the view about the new order once. Rows
+    are filtered by a substring of the display text of filter_columns and by
+    exact values of single columns (set_column_filter).
+    """
+
+    def __init__(self, filter_columns=None, sort_keys=None, parent=None):
+        super().__init__(parent)
+        self.filter_columns = filter_columns
+        self.sort_keys = sort_keys or {}
+        self.filter_text = ""
+        self.column_filters = {}
+        self.sort_column = -1
+        self.sort_order = Qt.AscendingOrder
+        # Строки источника в порядке отображения и обратное соответствие
+        self.visible = []
+        self.proxy_rows = {}
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.dataChanged.connect(self.source_data_changed)
+        model.rowsInserted.connect(self.source_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self.source_rows_about_to_be_removed)
+        model.rowsRemoved.connect(self.source_rows_removed)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self.rebuild)
+        self.beginResetModel()
+        self.rebuild()
+
+    def rebuild(self):
+        """Filter and sort all source rows; ends a reset begun by the caller"""
+        self.visible = self.sorted_rows(row for row in range(len(self.sourceModel().rows)) if self.accepts(row))
+        self.proxy_rows = {row: position for position, row in enumerate(self.visible)}
+        self.endResetModel()
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not 0 <= row < len(self.visible) or not 0 <= column < self.columnCount():
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.visible)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.sourceModel().headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        return self.sourceModel().headerData(section, orientation, role)
+
+    # Ячейки читаются прямо из строк источника, минуя mapToSource и индексы источника
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        return self.sourceModel().cell_data(self.visible[index.row()], index.column(), role)
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable if index.isValid() else Qt.NoItemFlags
+
+    def mapToSource(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        return self.sourceModel().index(self.visible[index.row()], index.column())
+
+    def mapFromSource(self, index):
+        row = self.proxy_rows.get(index.row()) if index.isValid() else None
+        return QModelIndex() if row is None else self.createIndex(row, index.column())
+
+    def accepts(self, row):
+        model = self.sourceModel()
+        values = model.rows[row]
+        if any(values[column] != value for column, value in self.column_filters.items()):
+            return False
+        if not self.filter_text:
+            return True
+        columns = range(len(values)) if self.filter_columns is None else self.filter_columns
+        return any(self.filter_text in model.display_text(values[column], column).lower() for column in columns)
+
+    def sorted_rows(self, rows):
+        rows = list(rows)
+        if self.sort_column < 0:
+            return sorted(rows)
+        rows_data = self.sourceModel().rows
+        column = self.sort_column
+        value_key = self.sort_keys.get(column, lambda value: value)
+
+        # Пустые значения идут первыми при сортировке по возрастанию, как в QSortFilterProxyModel
+        def key(row):
+            value = rows_data[row][column]
+            return (False, 0) if value is None else (True, value_key(value))
+        return sorted(rows, key=key, reverse=self.sort_order == Qt.DescendingOrder)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sort_column = column
+        self.sort_order = order
+        self.relayout()
+
+    def set_filter_text(self, text):
+        self.filter_text = text.lower()
+        self.beginResetModel()
+        self.rebuild()
+
+    def set_column_filter(self, column, value):
+        """Show only rows whose column equals value; None removes the filter"""
+        if value is None:
+            self.column_filters.pop(column, None)
+        else:
+            self.column_filters[column] = value
+        self.beginResetModel()
+        self.rebuild()
+
+    def relayout(self):
+        """Re-sort the visible rows, keeping selection and current index on their rows"""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        sources = [(self.visible[index.row()], index.column()) for index in persistent]
+        self.visible = self.sorted_rows(self.visible)
+        self.proxy_rows = {row: position for position, row in enumerate(self.visible)}
+        self.changePersistentIndexList(persistent, [self.index(self.proxy_rows[row], column)
+                                                    for row, column in sources])
+        self.layoutChanged.emit()
+
+    def drop_visible(self, rows):
+        """Remove rows from visible; proxy_rows is left for the caller to rebuild"""
+        positions = sorted((self.proxy_rows[row] for row in rows), reverse=True)
+        for first, last in row_ranges(positions):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.visible[first:last + 1]
+            self.endRemoveRows()
+
+    def remove_visible(self, rows):
+        self.drop_visible(rows)
+        self.proxy_rows = {row: position for position, row in enumerate(self.visible)}
+
+    def append_visible(self, rows):
+        first = len(self.visible)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for row in rows:
+            self.proxy_rows[row] = len(self.visible)
+            self.visible.append(row)
+        self.endInsertRows()
+
+    def source_rows_inserted(self, parent, first, last):
+        rows = [row for row in range(first, last + 1) if self.accepts(row)]
+        if rows:
+            self.append_visible(rows)
+            self.relayout()
+
+    def source_rows_about_to_be_removed(self, parent, first, last):
+        rows = [row for row in range(first, last + 1) if row in self.proxy_rows]
+        if rows:
+            self.drop_visible(rows)
+
+    def source_rows_removed(self, parent, first, last):
+        # Строки источника после удалённых сдвигаются вверх, позиции в прокси остаются прежними
+        count = last - first + 1
+        self.visible = [row - count if row > last else row for row in self.visible]
+        self.proxy_rows = {row: position for position, row in enumerate(self.visible)}
+
+    def source_data_changed(self, top_left, bottom_right, roles=()):
+        rows = range(top_left.row(), bottom_right.row() + 1)
+        if self.column_filters or self.filter_text:
+            hidden = [row for row in rows if row in self.proxy_rows and not self.accepts(row)]
+            shown = [row for row in rows if row not in self.proxy_rows and self.accepts(row)]
+            if hidden:
+                self.remove_visible(hidden)
+            if shown:
+                self.append_visible(shown)
+        else:
+            shown = []
+
+        positions = [self.proxy_rows[row] for row in rows if row in self.proxy_rows]
+        if positions:
+            self.dataChanged.emit(self.index(min(positions), top_left.column()),
+                                  self.index(max(positions), bottom_right.column()))
+        if shown or top_left.column() <= self.sort_column <= bottom_right.column():
+            self.relayout()
+
+
+class SparklineDelegate(QStyledItemDelegate):
+    """Draws a cell whose raw value is a sequence of numbers as a small line chart"""
+
+    def __init__(self, maximum=100.0, color='#2a82da', parent=None):
+        super().__init__(parent)
+        self.maximum = maximum
+        self.color = QColor(color)
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        values = [value for value in index.data(SORT_ROLE) or () if value is not None]
+        if len(values) < 2:
+            return
+        rect = option.rect.adjusted(2, 3, -2, -3)
+        step = rect.width() / (len(values) - 1)
+        scale = rect.height() / self.maximum
+        path = QPainterPath(QPointF(rect.left(), rect.bottom() - min(values[0], self.maximum) * scale))
+        for i, value in enumerate(values[1:], 1):
+            path.lineTo(QPointF(rect.left() + i * step, rect.bottom() - min(value, self.maximum) * scale))
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(self.color, 1.2))
+        painter.drawPath(path)
+        painter.restore()
+
+
+def create_table_view(model, sortable=True, resize_mode=QHeaderView.Stretch, proxy=None):
+    """Create a read-only view over model, sorted and filtered through a proxy"""
+    view = QTableView()
+    view.setEditTriggers(QTableView.NoEditTriggers)
+    view.setSelectionBehavior(QTableView.SelectRows)
+    view.verticalHeader().setVisible(False)
+    view.horizontalHeader().setSectionResizeMode(resize_mode)
+    view.horizontalHeader().setStretchLastSection(True)
+
+    if proxy is None:
+        proxy = QSortFilterProxyModel(view)
+        proxy.setSortRole(SORT_ROLE)
+        proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        proxy.setFilterKeyColumn(-1)
+    else:
+        proxy.setParent(view)
+    proxy.setSourceModel(model)
+    view.setModel(proxy)
+    view.setSortingEnabled(sortable)
+    return view, proxy
+
+
+class AlertLogModel(QAbstractTableModel):
+    """Lazy table model over the persistent alert log.
+
+    Holds only the positions of the matching alerts; rows are read from the
+    log a page at a time when the view asks for them, and a few recently
+    used pages are cached.
+    """
+    PAGE_SIZE = 200
+    MAX_PAGES = 8
+    COLUMNS = [("Time", 'time'), ("Component", 'component'), ("Severity", 'severity'), ("Message", 'message')]
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.filters = {}
+        self.positions = store.query()
+        self.pages = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.positions)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][0]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ForegroundRole):
+            return None
+        record = self.record(index.row())
+        if role == Qt.ForegroundRole:
+            return QColor('purple') if record.get('severity') == 'anomaly' else None
+        return record.get(self.COLUMNS[index.column()][1])
+
+    def record(self, row):
+        page_number = row // self.PAGE_SIZE
+        page = self.pages.pop(page_number, None)
+        if page is None:
+            first = page_number * self.PAGE_SIZE
+            page = self.store.read(self.positions[first:first + self.PAGE_SIZE])
+            if len(self.pages) >= self.MAX_PAGES:
+                del self.pages[next(iter(self.pages))]
+        # Recently used pages move to the end of the dict
+        self.pages[page_number] = page
+        return page[row % self.PAGE_SIZE]
+
+    def set_filters(self, component=None, severity=None, start=None, end=None):
+        self.beginResetModel()
+        self.filters = {'component': component, 'severity': severity, 'start': start, 'end': end}
+        self.positions = self.store.query(**self.filters)
+        self.pages = {}
+        self.endResetModel()
+
+    def alert_added(self, position):
+        """Show a newly appended alert at the top if it passes the filters"""
+        if not self.store.matches(position, **self.filters):
+            return
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self.positions.insert(0, position)
+        self.pages = {}
+        self.endInsertRows()
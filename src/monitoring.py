@@ -1,10 +1,11 @@
+import threading
 import time
 import subprocess
 import platform
 import psutil
 import requests
-from datetime import datetime
 from PyQt5.QtCore import QThread, pyqtSignal
+from timebase import monotonic_ns, to_epoch
 
 # Platform-specific imports
 if platform.system() == 'Windows':
@@ -18,11 +19,18 @@ else:
 
 class DataCollectorThread(QThread):
     data_updated = pyqtSignal(dict)
+    alert_changed = pyqtSignal(dict)
+    anomaly_detected = pyqtSignal(dict)
 
-    def __init__(self, poll_interval_ms, parent=None):
+    def __init__(self, poll_interval_ms, alert_engine=None, anomaly_monitor=None, parent=None):
         super().__init__(parent)
         self.poll_interval_s = poll_interval_ms / 1000.0
+        self.alert_engine = alert_engine
+        self.anomaly_monitor = anomaly_monitor
         self._running = True
+        self._wake = threading.Event()
+        self.process = psutil.Process()
+        self.process.cpu_percent(interval=None)
         self.wmi_instance = None
         if platform.system() == 'Windows' and wmi:
             try:
@@ -32,6 +40,21 @@ class DataCollectorThread(QThread):
 
     def stop(self):
         self._running = False
+        self._wake.set()
+
+    def set_poll_interval(self, poll_interval_ms):
+        """Change the cadence; a wait in progress is shortened or extended to match"""
+        self.poll_interval_s = poll_interval_ms / 1000.0
+        self._wake.set()
+
+    def wait_next_poll(self, started):
+        # Ожидание пересчитывается, если интервал изменился во время сна
+        while self._running:
+            remaining = started + self.poll_interval_s - time.monotonic()
+            if remaining <= 0:
+                return
+            self._wake.wait(remaining)
+            self._wake.clear()
 
     def get_cpu_temperature(self):
         try:
@@ -88,7 +111,9 @@ class DataCollectorThread(QThread):
 
     def run(self):
         while self._running:
-            data_bundle = {'timestamp': datetime.now()}
+            started = time.monotonic()
+            t_ns = monotonic_ns()
+            data_bundle = {'t_ns': t_ns, 'timestamp': to_epoch(t_ns)}
             try:
                 # CPU data
                 data_bundle['cpu'] = {
@@ -125,35 +150,66 @@ class DataCollectorThread(QThread):
                 net_io_pernic = psutil.net_io_counters(pernic=True)
                 data_bundle['network'] = {k.replace(":", "_").replace(" ", "_"): v._asdict() for k, v in
                                           net_io_pernic.items()}
+
+                # Resource usage of the monitor itself
+                data_bundle['process'] = {
+                    'cpu_percent': self.process.cpu_percent(interval=None),
+                    'rss': self.process.memory_info().rss
+                }
             except Exception as e:
                 print(f"Error collecting data: {e}")
 
+            # Alert rules are evaluated here; only state changes reach the GUI
+            if self.alert_engine:
+                try:
+                    for transition in self.alert_engine.evaluate(data_bundle):
+                        self.alert_changed.emit(transition)
+                except Exception as e:
+                    print(f"Error evaluating alert rules: {e}")
+            if self.anomaly_monitor:
+                try:
+                    for event in self.anomaly_monitor.evaluate(data_bundle):
+                        self.anomaly_detected.emit(event)
+                except Exception as e:
+                    print(f"Error detecting anomalies: {e}")
+
             self.data_updated.emit(data_bundle)
-            time.sleep(self.poll_interval_s)
+            self.wait_next_poll(started)
 
 
 class SpeedTestThread(QThread):
     result_ready = pyqtSignal(str)
 
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.target = "http://speedtest.tele2.net/1MB.zip"
+        self.direction = 'download'
+        self.streams = 4
+        self.duration_s = 10
+        self.cancel_event = threading.Event()
+
+    def configure(self, target, direction, streams, duration_s):
+        self.target = target
+        self.direction = direction
+        self.streams = streams
+        self.duration_s = duration_s
+
+    def cancel(self):
+        self.cancel_event.set()
+
     def run(self):
+        from throughput import run_test
+
+        self.cancel_event.clear()
         try:
             self.result_ready.emit("Running speed test...")
-            test_file_url = "http://speedtest.tele2.net/1MB.zip"
-            start_time = time.time()
-            with requests.get(test_file_url, stream=True, timeout=20) as r:
-                r.raise_for_status()
-                total_length = 0
-                for chunk in r.iter_content(chunk_size=8192):
-                    if chunk: total_length += len(chunk)
-            duration = time.time() - start_time
-            if duration > 0:
-                speed_mbps = (total_length * 8) / (duration * 1024 * 1024)
-                result_text = (f"Downloaded {total_length / 1024:.2f} KB in {duration:.2f} seconds\n"
-                               f"Download Speed: {speed_mbps:.2f} Mbps")
-            else:
-                result_text = "Speed test failed: duration was zero."
-            self.result_ready.emit(result_text)
-        except requests.RequestException as e:
+            result = run_test(
+                self.target, self.direction, self.streams, self.duration_s,
+                progress=lambda elapsed, mbps: self.result_ready.emit(
+                    f"Running speed test... {elapsed:.1f} s, {mbps:.2f} Mbps"),
+                cancel=self.cancel_event)
+            self.result_ready.emit("\n".join(result.summary_lines()))
+        except (requests.RequestException, OSError) as e:
             self.result_ready.emit(f"Speed test failed: Network error\n{str(e)}")
         except Exception as e:
             self.result_ready.emit(f"Speed test failed: An unexpected error occurred.\n{str(e)}")
\ No newline at end of file
@@ -0,0 +1,255 @@
+import os
+import queue
+import smtplib
+import threading
+import time
+from email.mime.text import MIMEText
+
+from timebase import to_iso
+
+
+class ToastSink:
+    """Shows alerts as non-modal toasts through a thread-safe callback"""
+    name = 'toast'
+
+    def __init__(self, show, batch_window_s=0.5):
+        self.show = show
+        self.batch_window_s = batch_window_s
+
+    def deliver(self, batch):
+        if len(batch) == 1:
+            self.show(f"{batch[0]['component']} Alert", batch[0]['message'])
+        else:
+            lines = [f"{n['component']}: {n['message']}" for n in batch[:5]]
+            if len(batch) > 5:
+                lines.append(f"... and {len(batch) - 5} more")
+            self.show(f"{len(batch)} Alerts", "\n".join(lines))
+
+
+class FileSink:
+    """Appends one line per alert to a text file"""
+    name = 'file'
+
+    def __init__(self, path, batch_window_s=1.0):
+        self.path = path
+        self.batch_window_s = batch_window_s
+
+    def deliver(self, batch):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for n in batch:
+                f.write(f"{to_iso(n['timestamp'])}\t{n['severity']}\t{n['component']}\t{n['message']}\n")
+
+
+class SmtpSink:
+    """Sends alerts as a digest e-mail per batch"""
+    name = 'smtp'
+
+    def __init__(self, server, port, sender, recipients, username='', password='', use_tls=True,
+                 batch_window_s=60.0, timeout=10):
+        self.server = server
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients
+        self.username = username or sender
+        self.password = password
+        self.use_tls = use_tls
+        self.batch_window_s = batch_window_s
+        self.timeout = timeout
+
+    def build_message(self, batch):
+        subject = (f"[System Monitor] {batch[0]['component']} alert" if len(batch) == 1
+                   else f"[System Monitor] {len(batch)} alerts")
+        body = "\n".join(f"{to_iso(n['timestamp'])}  [{n['severity']}] {n['component']}: {n['message']}"
+                         for n in batch)
+        msg = MIMEText(body, 'plain', 'utf-8')
+        msg['Subject'] = subject
+        msg['From'] = self.sender
+        msg['To'] = ", ".join(self.recipients)
+        return msg
+
+    def deliver(self, batch):
+        with smtplib.SMTP(self.server, self.port, timeout=self.timeout) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.password:
+                smtp.login(self.username, self.password)
+            smtp.send_message(self.build_message(batch))
+
+
+class SinkWorker(threading.Thread):
+    """Batches and delivers notifications for one sink on its own thread"""
+
+    def __init__(self, sink, dispatcher):
+        super().__init__(name=f"NotificationSink-{sink.name}", daemon=True)
+        self.sink = sink
+        self.dispatcher = dispatcher
+        self.condition = threading.Condition()
+        self.items = []
+        self.due = None
+        self.attempt = 0
+        self.stopping = False
+        self.flush_on_stop = False
+
+    def add(self, notification):
+        with self.condition:
+            self.items.append(notification)
+            if self.due is None:
+                self.due = time.monotonic() + self.sink.batch_window_s
+            self.condition.notify()
+
+    def set_sink(self, sink):
+        with self.condition:
+            self.sink = sink
+
+    def stop(self, flush):
+        with self.condition:
+            self.stopping = True
+            self.flush_on_stop = flush
+            self.condition.notify()
+
+    def next_batch(self):
+        """Wait until a batch is due; returns (sink, batch, final) or None to exit"""
+        max_batch = self.dispatcher.max_batch
+        with self.condition:
+            while not self.stopping:
+                now = time.monotonic()
+                # Полная пачка уходит сразу, но только если это не повтор после ошибки
+                if self.items and (self.due <= now or (self.attempt == 0 and len(self.items) >= max_batch)):
+                    break
+                self.condition.wait(None if not self.items else self.due - now)
+            if self.stopping and not (self.flush_on_stop and self.items):
+                return None
+            return self.sink, self.items[:max_batch], self.stopping
+
+    def run(self):
+        while True:
+            next_batch = self.next_batch()
+            if next_batch is None:
+                return
+            sink, batch, final = next_batch
+            try:
+                sink.deliver(batch)
+                error = None
+            except Exception as e:
+                error = e
+
+            with self.condition:
+                now = time.monotonic()
+                if error is not None:
+                    self.attempt += 1
+                    if self.attempt <= self.dispatcher.max_retries and not final:
+                        self.due = now + self.dispatcher.backoff_s * 2 ** (self.attempt - 1)
+                        continue
+                del self.items[:len(batch)]
+                self.attempt = 0
+                self.due = now + sink.batch_window_s if self.items else None
+            if error is not None:
+                self.dispatcher.delivery_failed(sink, batch, error)
+
+
+class NotificationDispatcher:
+    """Delivers alert notifications to sinks from background threads.
+
+    ``notify`` never blocks: notifications go into a bounded queue and are
+    dropped (and counted) when it is full. Each sink has its own worker that
+    batches notifications over the sink's ``batch_window_s`` and retries
+    failed deliveries with exponential backoff, so a slow or failing sink
+    (a hung SMTP server) never delays the others. Workers are keyed by sink
+    name: replacing the sinks after a settings change keeps queued
+    notifications and retry state. Deliveries that finally fail are counted
+    and passed to ``on_error``.
+    """
+
+    def __init__(self, sinks=(), max_queue=1000, max_batch=100, max_retries=4, backoff_s=2.0, on_error=None):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.on_error = on_error
+        self.dropped = 0
+        self.failed = 0
+        self.lock = threading.Lock()
+        self.workers = {}
+        self.started = False
+        self.set_sinks(sinks)
+        self.thread = threading.Thread(target=self.run, name="NotificationDispatcher", daemon=True)
+
+    def set_sinks(self, sinks):
+        with self.lock:
+            sinks = {sink.name: sink for sink in sinks}
+            for name in set(self.workers) - set(sinks):
+                self.workers.pop(name).stop(flush=False)
+            for name, sink in sinks.items():
+                if name in self.workers:
+                    self.workers[name].set_sink(sink)
+                else:
+                    self.workers[name] = SinkWorker(sink, self)
+                    if self.started:
+                        self.workers[name].start()
+
+    def start(self):
+        with self.lock:
+            self.started = True
+            for worker in self.workers.values():
+                worker.start()
+        self.thread.start()
+
+    def stop(self, timeout=5.0):
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self.thread.join(timeout)
+
+    def notify(self, component, message, severity='warning', timestamp=None):
+        notification = {
+            'timestamp': time.time() if timestamp is None else timestamp,
+            'component': component,
+            'message': message,
+            'severity': severity,
+        }
+        try:
+            self.queue.put_nowait(notification)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            with self.lock:
+                workers = list(self.workers.values())
+            if item is None:
+                # Оставшиеся уведомления отправляются по одной попытке
+                deadline = time.monotonic() + 5.0
+                for worker in workers:
+                    worker.stop(flush=True)
+                for worker in workers:
+                    worker.join(max(0.0, deadline - time.monotonic()))
+                return
+            for worker in workers:
+                worker.add(item)
+
+    def delivery_failed(self, sink, batch, error):
+        with self.lock:
+            self.failed += len(batch)
+        if self.on_error is not None:
+            self.on_error(f"Failed to deliver {len(batch)} notification(s) via {sink.name}: {error}")
+
+
+def build_sinks(settings, show_toast):
+    """Create the notification sinks enabled in settings"""
+    sinks = []
+    if settings.get('popup_alerts', True):
+        sinks.append(ToastSink(show_toast))
+    if settings.get('alert_file_notifications'):
+        path = settings.get('alert_file_path') or os.path.join(os.path.expanduser('~'), 'system_monitor_alerts.log')
+        sinks.append(FileSink(path))
+    if settings.get('email_notifications'):
+        recipients = [r.strip() for r in settings.get('email_to', '').split(',') if r.strip()]
+        sinks.append(SmtpSink(
+            settings.get('email_server'), settings.get('email_port', 587), settings.get('email_from'),
+            recipients, settings.get('email_username', ''), settings.get('email_password', ''),
+            settings.get('email_use_tls', True), settings.get('email_digest_s', 60)))
+    return sinks
@@ -1,20 +1,85 @@
 import os
+import io
+import gzip
 import tempfile
+import platform
 from datetime import datetime
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from xml.sax.saxutils import XMLGenerator
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font
 from openpyxl.utils import get_column_letter
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
+from reportlab.lib import colors
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet
-import matplotlib.pyplot as plt
+from timebase import to_iso
+from metrics import flatten_sample, sample_columns
+from summary import summarize, summary_table, summary_records, SUMMARY_RECORD_HEADERS
 
+MAX_COLUMN_WIDTH = 50
+XML_BUFFER_SIZE = 1 << 16
 
-def generate_pdf_report(cpu_fig, gpu_fig):
+
+class ReportCancelled(Exception):
+    """Raised by a progress callback to abort a report"""
+
+
+def track_progress(samples, progress):
+    """Iterate over samples, calling progress(done, total) about every 1%"""
+    if progress is None:
+        yield from samples
+        return
+    total = len(samples)
+    step = max(1, total // 100)
+    for i, data in enumerate(samples):
+        if i % step == 0:
+            progress(i, total)
+        yield data
+    progress(total, total)
+
+
+def discard_partial(filename):
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
+
+
+def report_filename(extension):
+    return os.path.join(tempfile.gettempdir(),
+                        f"system_report_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.{extension}")
+
+
+def samples_summary(historical_data, history, thresholds=None):
+    """Summary of the HistoryStore over the time span of historical_data"""
+    if history is None:
+        return None
+    if not historical_data:
+        return summarize(history, thresholds=thresholds)
+    return summarize(history, historical_data[0]['timestamp'], historical_data[-1]['timestamp'], thresholds)
+
+
+def summary_flowable(summary):
+    table = Table(summary_table(summary), repeatRows=1)
+    table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 7),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+        ('ALIGN', (1, 1), (5, -1), 'RIGHT'),
+    ]))
+    return table
+
+
+def generate_pdf_report(history, filename=None, start=None, end=None, thresholds=None, progress=None):
+    """Build a PDF with a summary table and charts of a HistoryStore, rendered off-screen"""
+    from charts import render_history_charts, CHART_SIZE
+
+    filename = filename or report_filename("pdf")
     try:
-        filename = os.path.join(tempfile.gettempdir(), f"system_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
+        charts = render_history_charts(history, start, end, progress)
+        summary = summarize(history, start, end, thresholds)
         doc = SimpleDocTemplate(filename, pagesize=letter)
         styles = getSampleStyleSheet()
         elements = []
@@ -22,101 +87,210 @@ def generate_pdf_report(cpu_fig, gpu_fig):
         # Title
         elements.append(Paragraph("System Monitoring Report", styles['Title']))
         elements.append(Spacer(1, 12))
+        if not charts:
+            elements.append(Paragraph("No data collected yet.", styles['Normal']))
 
-        # CPU Chart
-        cpu_path = os.path.join(tempfile.gettempdir(), "cpu_chart.png")
-        cpu_fig.savefig(cpu_path)
-        elements.append(Paragraph("CPU Usage and Temperature", styles['Heading2']))
-        elements.append(Image(cpu_path, width=400, height=300))
-        elements.append(Spacer(1, 12))
+        if summary['metrics']:
+            elements.append(Paragraph("Summary", styles['Heading2']))
+            elements.append(Paragraph(
+                f"{to_iso(summary['start'])[:19].replace('T', ' ')} - {to_iso(summary['end'])[:19].replace('T', ' ')}",
+                styles['Normal']))
+            elements.append(Spacer(1, 6))
+            elements.append(summary_flowable(summary))
+            elements.append(Spacer(1, 12))
 
-        # GPU Chart
-        gpu_path = os.path.join(tempfile.gettempdir(), "gpu_chart.png")
-        gpu_fig.savefig(gpu_path)
-        elements.append(Paragraph("GPU Usage and Temperature", styles['Heading2']))
-        elements.append(Image(gpu_path, width=400, height=300))
+        width = doc.width
+        height = width * CHART_SIZE[1] / CHART_SIZE[0]
+        for title, png in charts:
+            elements.append(Paragraph(title, styles['Heading2']))
+            elements.append(Image(io.BytesIO(png), width=width, height=height))
+            elements.append(Spacer(1, 12))
 
         doc.build(elements)
+        if progress:
+            progress(1, 1)
         return filename
+    except ReportCancelled:
+        discard_partial(filename)
+        raise
     except Exception as e:
         raise RuntimeError(f"PDF generation failed: {str(e)}")
 
 
-def generate_xml_report(historical_data):
+class XmlStreamWriter:
+    """Minimal incremental XML writer on top of XMLGenerator with optional indentation"""
+
+    def __init__(self, stream, indent="  "):
+        self.generator = XMLGenerator(stream, encoding='utf-8', short_empty_elements=True)
+        self.indent = indent
+        self.depth = 0
+        self.generator.startDocument()
+
+    def newline(self):
+        if self.indent:
+            self.generator.ignorableWhitespace("\n" + self.indent * self.depth)
+
+    def start(self, name, attrs=None):
+        if self.depth:
+            self.newline()
+        self.generator.startElement(name, attrs or {})
+        self.depth += 1
+
+    def end(self, name):
+        self.depth -= 1
+        self.newline()
+        self.generator.endElement(name)
+
+    def element(self, name, text, attrs=None):
+        self.newline()
+        self.generator.startElement(name, attrs or {})
+        self.generator.characters(text)
+        self.generator.endElement(name)
+
+    def close(self):
+        if self.indent:
+            self.generator.ignorableWhitespace("\n")
+        self.generator.endDocument()
+
+
+def write_xml_summary(writer, summary):
+    writer.start("Summary", {'start': to_iso(summary['start']), 'end': to_iso(summary['end']),
+                             'source': summary['source']})
+    for m in summary['metrics']:
+        writer.start("Metric", {'name': m['metric'], 'label': m['label'], 'unit': m['unit']})
+        writer.element("Samples", str(m['count']))
+        for key in ('mean', 'p50', 'p95', 'p99', 'max'):
+            writer.element(key.capitalize(), f"{m[key]:.3f}")
+        if m['above_s'] is not None:
+            writer.element("SecondsAboveThreshold", f"{m['above_s']:.0f}", {'threshold': f"{m['threshold']:g}"})
+        writer.element("WorstHour", f"{m['worst_hour_mean']:.3f}", {'start': to_iso(m['worst_hour'])})
+        writer.end("Metric")
+    writer.end("Summary")
+
+
+def generate_xml_report(historical_data, filename=None, indent=True, compress=False, history=None,
+                        thresholds=None, progress=None):
+    """Stream the history to an XML file, optionally gzip-compressed.
+
+    Samples are written one at a time through a buffered stream, so peak
+    memory does not depend on the length of the history. With a HistoryStore
+    a Summary section for the same time span precedes the samples.
+    """
+    filename = filename or report_filename("xml.gz" if compress else "xml")
     try:
-        filename = os.path.join(tempfile.gettempdir(), f"system_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xml")
-        root = ET.Element("SystemReport")
-
-        # System Info
-        sys_info = ET.SubElement(root, "SystemInfo")
-        uname = platform.uname()
-        ET.SubElement(sys_info, "System").text = uname.system
-        ET.SubElement(sys_info, "Node").text = uname.node
-        ET.SubElement(sys_info, "Release").text = uname.release
-        ET.SubElement(sys_info, "Version").text = uname.version
-        ET.SubElement(sys_info, "Machine").text = uname.machine
-        ET.SubElement(sys_info, "Processor").text = uname.processor
-
-        # Metrics
-        metrics = ET.SubElement(root, "Metrics")
-        for data in historical_data:
-            sample = ET.SubElement(metrics, "Sample", timestamp=data['timestamp'].isoformat())
-            if 'cpu' in data:
-                cpu = ET.SubElement(sample, "CPU")
-                ET.SubElement(cpu, "Usage").text = str(data['cpu'].get('percent', ''))
-                ET.SubElement(cpu, "Temperature").text = str(data['cpu'].get('temperature', ''))
-
-            if 'memory' in data and 'virtual' in data['memory']:
-                mem = ET.SubElement(sample, "Memory")
-                ET.SubElement(mem, "Used").text = str(data['memory']['virtual'].get('used', ''))
-                ET.SubElement(mem, "Total").text = str(data['memory']['virtual'].get('total', ''))
-                ET.SubElement(mem, "Percent").text = str(data['memory']['virtual'].get('percent', ''))
-
-        # Format and save
-        xml_str = ET.tostring(root, 'utf-8')
-        reparsed = minidom.parseString(xml_str)
-        pretty_xml = reparsed.toprettyxml(indent="  ")
-
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(pretty_xml)
+        raw = gzip.open(filename, 'wb', compresslevel=6) if compress else open(filename, 'wb')
+        with raw, io.BufferedWriter(raw, buffer_size=XML_BUFFER_SIZE) as stream:
+            writer = XmlStreamWriter(stream, "  " if indent else "")
+            writer.start("SystemReport")
+
+            # System Info
+            writer.start("SystemInfo")
+            uname = platform.uname()
+            writer.element("System", uname.system)
+            writer.element("Node", uname.node)
+            writer.element("Release", uname.release)
+            writer.element("Version", uname.version)
+            writer.element("Machine", uname.machine)
+            writer.element("Processor", uname.processor)
+            writer.end("SystemInfo")
+
+            summary = samples_summary(historical_data, history, thresholds)
+            if summary is not None:
+                write_xml_summary(writer, summary)
+
+            # Metrics
+            writer.start("Metrics")
+            for data in track_progress(historical_data, progress):
+                writer.start("Sample", {'timestamp': to_iso(data['timestamp'])})
+                if 'cpu' in data:
+                    writer.start("CPU")
+                    writer.element("Usage", str(data['cpu'].get('percent', '')))
+                    writer.element("Temperature", str(data['cpu'].get('temperature', '')))
+                    writer.end("CPU")
+
+                if 'memory' in data and 'virtual' in data['memory']:
+                    writer.start("Memory")
+                    writer.element("Used", str(data['memory']['virtual'].get('used', '')))
+                    writer.element("Total", str(data['memory']['virtual'].get('total', '')))
+                    writer.element("Percent", str(data['memory']['virtual'].get('percent', '')))
+                    writer.end("Memory")
+                writer.end("Sample")
+            writer.end("Metrics")
+
+            writer.end("SystemReport")
+            writer.close()
 
         return filename
+    except ReportCancelled:
+        discard_partial(filename)
+        raise
     except Exception as e:
         raise RuntimeError(f"XML generation failed: {str(e)}")
 
 
-def generate_excel_report(historical_data):
+def write_excel_summary(wb, summary):
+    ws = wb.create_sheet("Summary")
+    for col, header in enumerate(SUMMARY_RECORD_HEADERS, 1):
+        ws.column_dimensions[get_column_letter(col)].width = max(len(header), 10) + 2
+    ws.column_dimensions['A'].width = 24
+    bold = Font(bold=True)
+    header_cells = []
+    for header in SUMMARY_RECORD_HEADERS:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = bold
+        header_cells.append(cell)
+    ws.append(header_cells)
+    for row in summary_records(summary):
+        ws.append(row)
+
+
+def generate_excel_report(historical_data, filename=None, history=None, thresholds=None, progress=None):
+    """Stream the history into an XLSX file with one column per flattened metric.
+
+    The workbook is written in write-only mode: rows are appended from a
+    generator and never held in memory, and column widths come from a sample
+    of the rows instead of a scan over every cell. With a HistoryStore a
+    Summary sheet for the same time span is added after the data sheet.
+    """
+    filename = filename or report_filename("xlsx")
     try:
-        filename = os.path.join(tempfile.gettempdir(), f"system_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "System Metrics"
-
-        # Headers
-        headers = ["Timestamp", "CPU Usage (%)", "CPU Temp (°C)", "Memory Used (GB)", "Memory Total (GB)",
-                   "Memory Usage (%)"]
-        for col, header in enumerate(headers, 1):
-            ws.cell(row=1, column=col, value=header).font = Font(bold=True)
-
-        # Data
-        for row, data in enumerate(historical_data, 2):
-            timestamp = data['timestamp']
-            cpu = data.get('cpu', {})
-            mem = data.get('memory', {}).get('virtual', {})
-
-            ws.cell(row=row, column=1, value=timestamp.isoformat())
-            ws.cell(row=row, column=2, value=cpu.get('percent'))
-            ws.cell(row=row, column=3, value=cpu.get('temperature'))
-            ws.cell(row=row, column=4, value=mem.get('used', 0) / (1024 ** 3) if mem else 0)
-            ws.cell(row=row, column=5, value=mem.get('total', 0) / (1024 ** 3) if mem else 0)
-            ws.cell(row=row, column=6, value=mem.get('percent', 0) if mem else 0)
-
-        # Auto-size columns
-        for col in range(1, len(headers) + 1):
-            col_letter = get_column_letter(col)
-            ws.column_dimensions[col_letter].width = 20
+        columns, sample = sample_columns(historical_data)
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("System Metrics")
+
+        # Column widths from the sampled rows
+        headers = ["Timestamp"] + columns
+        widths = [len(header) for header in headers]
+        widths[0] = max(widths[0], 23)
+        for data in sample:
+            flat = flatten_sample(data)
+            for col, name in enumerate(columns, 1):
+                value = flat.get(name)
+                if value is not None:
+                    widths[col] = max(widths[col], len(str(value)))
+        for col, width in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(col)].width = min(width + 2, MAX_COLUMN_WIDTH)
+
+        bold = Font(bold=True)
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = bold
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        for data in track_progress(historical_data, progress):
+            flat = flatten_sample(data)
+            ws.append([to_iso(data['timestamp'])] + [flat.get(name) for name in columns])
+
+        summary = samples_summary(historical_data, history, thresholds)
+        if summary is not None and summary['metrics']:
+            write_excel_summary(wb, summary)
 
         wb.save(filename)
         return filename
+    except ReportCancelled:
+        discard_partial(filename)
+        raise
     except Exception as e:
-        raise RuntimeError(f"Excel generation failed: {str(e)}")
\ No newline at end of file
+        raise RuntimeError(f"Excel generation failed: {str(e)}")
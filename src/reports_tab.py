@@ -0,0 +1,218 @@
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QGroupBox, QPushButton,
+    QHeaderView, QFormLayout, QComboBox, QLineEdit, QProgressBar
+)
+from datetime import datetime
+from scheduled import INTERVALS, default_report_directory, load_state
+
+
+class ReportsTab(QWidget):
+    JOB_COLUMNS = ["Report", "Status", "Progress", ""]
+    SCHEDULE_COLUMNS = ["Name", "Interval", "Format", "Directory", "Last Run", "Exported Up To"]
+    SCHEDULE_FORMATS = [("CSV.gz", 'csv'), ("NDJSON", 'ndjson'), ("XLSX", 'xlsx')]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.job_rows = {}
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        group = QGroupBox("Generate Report")
+        form_layout = QFormLayout(group)
+        self.report_type_combo = QComboBox()
+        self.report_type_combo.addItems(["System Summary"])
+        form_layout.addRow("Report Type:", self.report_type_combo)
+        group.setLayout(form_layout)
+
+        button_layout = QHBoxLayout()
+        pdf_button = QPushButton("Generate PDF")
+        pdf_button.clicked.connect(self.generate_pdf)
+        xml_button = QPushButton("Generate XML")
+        xml_button.clicked.connect(self.generate_xml)
+        excel_button = QPushButton("Generate Excel")
+        excel_button.clicked.connect(self.generate_excel)
+        csv_button = QPushButton("Export CSV.gz")
+        csv_button.clicked.connect(self.export_csv)
+        npz_button = QPushButton("Export NPZ")
+        npz_button.clicked.connect(self.export_npz)
+        button_layout.addWidget(pdf_button)
+        button_layout.addWidget(xml_button)
+        button_layout.addWidget(excel_button)
+        button_layout.addWidget(csv_button)
+        button_layout.addWidget(npz_button)
+
+        # Report jobs run in the background
+        jobs_group = QGroupBox("Report Jobs")
+        jobs_layout = QVBoxLayout(jobs_group)
+        self.jobs_table = QTableWidget(0, len(self.JOB_COLUMNS))
+        self.jobs_table.setHorizontalHeaderLabels(self.JOB_COLUMNS)
+        self.jobs_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.jobs_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.jobs_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.jobs_table.verticalHeader().setVisible(False)
+        jobs_layout.addWidget(self.jobs_table)
+
+        # Scheduled incremental reports
+        schedule_group = QGroupBox("Scheduled Reports")
+        schedule_layout = QVBoxLayout(schedule_group)
+        add_layout = QHBoxLayout()
+        self.schedule_interval_combo = QComboBox()
+        self.schedule_interval_combo.addItems([interval.capitalize() for interval in INTERVALS])
+        self.schedule_format_combo = QComboBox()
+        self.schedule_format_combo.addItems([label for label, _ in self.SCHEDULE_FORMATS])
+        self.schedule_dir_edit = QLineEdit()
+        self.schedule_dir_edit.setPlaceholderText(default_report_directory())
+        add_schedule_btn = QPushButton("Add")
+        add_schedule_btn.clicked.connect(self.add_scheduled_report)
+        add_layout.addWidget(self.schedule_interval_combo)
+        add_layout.addWidget(self.schedule_format_combo)
+        add_layout.addWidget(self.schedule_dir_edit, 1)
+        add_layout.addWidget(add_schedule_btn)
+
+        self.schedule_table = QTableWidget(0, len(self.SCHEDULE_COLUMNS))
+        self.schedule_table.setHorizontalHeaderLabels(self.SCHEDULE_COLUMNS)
+        self.schedule_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.schedule_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.schedule_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.schedule_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.schedule_table.verticalHeader().setVisible(False)
+
+        schedule_buttons = QHBoxLayout()
+        run_schedule_btn = QPushButton("Run Now")
+        run_schedule_btn.clicked.connect(self.run_scheduled_report)
+        remove_schedule_btn = QPushButton("Remove")
+        remove_schedule_btn.clicked.connect(self.remove_scheduled_report)
+        schedule_buttons.addStretch()
+        schedule_buttons.addWidget(run_schedule_btn)
+        schedule_buttons.addWidget(remove_schedule_btn)
+
+        schedule_layout.addLayout(add_layout)
+        schedule_layout.addWidget(self.schedule_table)
+        schedule_layout.addLayout(schedule_buttons)
+
+        layout.addWidget(group)
+        layout.addLayout(button_layout)
+        layout.addWidget(jobs_group)
+        layout.addWidget(schedule_group)
+
+        self.parent.report_scheduler.job_submitted.connect(self.add_job_row)
+        self.update_schedule_table()
+
+        worker = self.parent.report_worker()
+        worker.job_started.connect(lambda job_id: self.set_job_status(job_id, "Running"))
+        worker.job_progress.connect(self.set_job_progress)
+        worker.job_finished.connect(lambda job_id, filename: self.finish_job(job_id, f"Saved: {filename}"))
+        worker.job_failed.connect(lambda job_id, error: self.finish_job(job_id, f"Failed: {error}"))
+        worker.job_cancelled.connect(lambda job_id: self.finish_job(job_id, "Cancelled"))
+
+    def submit_job(self, title, func, *args, **kwargs):
+        job_id = self.parent.report_worker().submit(title, func, *args, **kwargs)
+        self.add_job_row(job_id, title)
+
+    def add_job_row(self, job_id, title):
+        row = self.jobs_table.rowCount()
+        self.jobs_table.insertRow(row)
+        self.jobs_table.setItem(row, 0, QTableWidgetItem(title))
+        self.jobs_table.setItem(row, 1, QTableWidgetItem("Queued"))
+        progress_bar = QProgressBar()
+        progress_bar.setRange(0, 100)
+        self.jobs_table.setCellWidget(row, 2, progress_bar)
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(lambda: self.parent.report_worker().cancel(job_id))
+        self.jobs_table.setCellWidget(row, 3, cancel_btn)
+        self.job_rows[job_id] = row
+
+    def set_job_status(self, job_id, status):
+        row = self.job_rows.get(job_id)
+        if row is not None:
+            self.jobs_table.item(row, 1).setText(status)
+
+    def set_job_progress(self, job_id, percent):
+        row = self.job_rows.get(job_id)
+        if row is not None:
+            self.jobs_table.cellWidget(row, 2).setValue(percent)
+
+    def finish_job(self, job_id, status):
+        self.set_job_status(job_id, status)
+        row = self.job_rows.get(job_id)
+        if row is not None:
+            self.jobs_table.cellWidget(row, 3).setEnabled(False)
+            if self.jobs_table.item(row, 0).text().startswith("Scheduled:"):
+                self.update_schedule_table()
+
+    def update_schedule_table(self):
+        def format_time(t):
+            return datetime.fromtimestamp(t).strftime('%Y-%m-%d %H:%M:%S') if t else "-"
+
+        reports = self.parent.settings.get('scheduled_reports', [])
+        self.schedule_table.setRowCount(len(reports))
+        for row, report in enumerate(reports):
+            state = load_state(report)
+            values = [report['name'], report['interval'].capitalize(), report['format'].upper(),
+                      report.get('directory') or default_report_directory(),
+                      format_time(state.get('last_run')), format_time(state.get('watermark'))]
+            for col, value in enumerate(values):
+                self.schedule_table.setItem(row, col, QTableWidgetItem(value))
+
+    def add_scheduled_report(self):
+        interval = list(INTERVALS)[self.schedule_interval_combo.currentIndex()]
+        report_format = self.SCHEDULE_FORMATS[self.schedule_format_combo.currentIndex()][1]
+        reports = self.parent.settings.get('scheduled_reports', [])
+        names = {report['name'] for report in reports}
+        name = f"{interval}-{report_format}"
+        suffix = 2
+        while name in names:
+            name = f"{interval}-{report_format}-{suffix}"
+            suffix += 1
+        report = {'name': name, 'interval': interval, 'format': report_format,
+                  'directory': self.schedule_dir_edit.text().strip()}
+        # Новый список, чтобы хранилище заметило изменение и оповестило остальных
+        self.parent.settings_store.update({'scheduled_reports': reports + [report]})
+
+    def selected_scheduled_report(self):
+        row = self.schedule_table.currentRow()
+        reports = self.parent.settings.get('scheduled_reports', [])
+        return reports[row] if 0 <= row < len(reports) else None
+
+    def run_scheduled_report(self):
+        report = self.selected_scheduled_report()
+        if report is not None:
+            self.parent.report_scheduler.run(report)
+
+    def remove_scheduled_report(self):
+        report = self.selected_scheduled_report()
+        if report is not None:
+            reports = self.parent.settings.get('scheduled_reports', [])
+            self.parent.settings_store.update({'scheduled_reports': [r for r in reports if r is not report]})
+
+    def settings_changed(self, keys):
+        if 'scheduled_reports' in keys:
+            self.update_schedule_table()
+
+    def summary_thresholds(self):
+        from summary import summary_thresholds
+        return summary_thresholds(self.parent.settings)
+
+    def generate_pdf(self):
+        from reports import generate_pdf_report
+        self.submit_job("PDF", generate_pdf_report, self.parent.history, thresholds=self.summary_thresholds())
+
+    def generate_xml(self):
+        from reports import generate_xml_report
+        self.submit_job("XML", generate_xml_report, tuple(self.parent.historical_data),
+                        history=self.parent.history, thresholds=self.summary_thresholds())
+
+    def generate_excel(self):
+        from reports import generate_excel_report
+        self.submit_job("Excel", generate_excel_report, tuple(self.parent.historical_data),
+                        history=self.parent.history, thresholds=self.summary_thresholds())
+
+    def export_csv(self):
+        from export import generate_csv_report
+        self.submit_job("CSV.gz", generate_csv_report, tuple(self.parent.historical_data))
+
+    def export_npz(self):
+        from export import generate_npz_report
+        self.submit_job("NPZ", generate_npz_report, tuple(self.parent.historical_data))
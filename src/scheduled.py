@@ -0,0 +1,280 @@
+"""Scheduled incremental reports.
+
+A scheduled report is a settings entry ``{'name', 'interval', 'format',
+'directory'}``. Each run reads only the HistoryStore samples newer than the
+report's watermark, appends them to a per-day segment (CSV.gz or NDJSON),
+folds them into the report's hourly rollups and rewrites the summary from
+the rollups. XLSX files cannot be appended to, so XLSX reports stage the
+current day in a CSV.gz segment and convert it to a one-sheet workbook once
+the day is over. After every day segment the watermark is saved inside the
+rollups file, in the same atomic replace as the rollups. Before a segment
+is appended, the output file's size is recorded in the state. A run that
+is cancelled, fails or crashes therefore resumes after the last committed
+segment, and first truncates any half-committed append.
+"""
+import csv
+import gzip
+import json
+import math
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from metrics import CORE_METRIC_NAMES
+from summary import HourlyRollups, SUMMARY_RECORD_HEADERS, summary_records, summary_result, summary_thresholds
+from timebase import to_iso, to_plot_time, to_plot_times
+
+INTERVALS = {'hourly': 3600, 'daily': 86400}
+SUMMARY_WINDOWS = {'hourly': 86400, 'daily': 7 * 86400}
+FORMATS = {'csv': 'csv.gz', 'ndjson': 'ndjson', 'xlsx': 'xlsx'}
+CHECK_INTERVAL_MS = 60 * 1000
+
+
+def default_report_directory():
+    return os.path.join(os.path.expanduser('~'), 'system_monitor_reports')
+
+
+def report_paths(report):
+    directory = report.get('directory') or default_report_directory()
+    base = os.path.join(directory, report['name'])
+    return {
+        'directory': directory,
+        'state': os.path.join(directory, f".{report['name']}.state.json"),
+        'rollups': os.path.join(directory, f".{report['name']}.rollups.npz"),
+        'summary': base + "-summary.csv",
+        'base': base,
+    }
+
+
+def load_state(report):
+    try:
+        with open(report_paths(report)['state'], encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'watermark': None, 'last_run': None}
+
+
+def save_state(report, state):
+    path = report_paths(report)['state']
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def period_index(t, interval):
+    """Number of the hour (UTC) or the local day that contains t"""
+    if interval == 'daily':
+        return math.floor(to_plot_time(t))
+    return int(t // INTERVALS[interval])
+
+
+def is_due(report, now, state=None):
+    state = state or load_state(report)
+    if state.get('last_run') is None:
+        return True
+    return period_index(now, report['interval']) > period_index(state['last_run'], report['interval'])
+
+
+def day_segments(times):
+    """(start, end) index ranges of times that fall on the same local day"""
+    days = np.floor(to_plot_times(times)).astype(np.int64)
+    bounds = [0] + (np.flatnonzero(np.diff(days)) + 1).tolist() + [len(times)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def segment_rows(times, columns):
+    for i in range(len(times)):
+        yield times[i], [None if math.isnan(columns[name][i]) else float(columns[name][i])
+                         for name in CORE_METRIC_NAMES]
+
+
+def append_csv(path, times, columns):
+    """Append rows to a gzip CSV; each run adds a new gzip member to the file"""
+    new = not os.path.exists(path)
+    with gzip.open(path, 'at', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        if new:
+            writer.writerow(['timestamp'] + CORE_METRIC_NAMES)
+        writer.writerows([repr(float(t))] + ['' if v is None else v for v in values]
+                         for t, values in segment_rows(times, columns))
+
+
+def append_ndjson(path, times, columns):
+    with open(path, 'a', encoding='utf-8') as f:
+        for t, values in segment_rows(times, columns):
+            f.write(json.dumps({'timestamp': float(t), **dict(zip(CORE_METRIC_NAMES, values))}) + '\n')
+
+
+def write_day_workbook(staging_path, path, sheet_name):
+    """Convert a completed day's staging CSV.gz to an XLSX workbook"""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+    ws.column_dimensions['A'].width = 25
+    bold = Font(bold=True)
+    with gzip.open(staging_path, 'rt', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header_cells = []
+        for header in next(reader):
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = bold
+            header_cells.append(cell)
+        ws.append(header_cells)
+        for row in reader:
+            ws.append([to_iso(float(row[0]))] + [float(v) if v else None for v in row[1:]])
+    tmp = path + '.tmp'
+    wb.save(tmp)
+    os.replace(tmp, path)
+    os.remove(staging_path)
+
+
+def segment_path(report, day):
+    base = report_paths(report)['base']
+    if report['format'] == 'xlsx':
+        return f"{base}-{day:%Y-%m-%d}.staging.csv.gz"
+    return f"{base}-{day:%Y-%m-%d}.{FORMATS[report['format']]}"
+
+
+def append_segment(report, times, columns):
+    """Append one day of samples to the report's output; return the output path"""
+    path = segment_path(report, datetime.fromtimestamp(times[0]))
+    if report['format'] == 'ndjson':
+        append_ndjson(path, times, columns)
+    else:
+        append_csv(path, times, columns)
+    return path
+
+
+def finish_days(report, watermark):
+    """Turn the staged days of an XLSX report that ended before watermark into workbooks"""
+    directory = report_paths(report)['directory']
+    current = segment_path(report, datetime.fromtimestamp(watermark))
+    prefix = report['name'] + '-'
+    written = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if not (name.startswith(prefix) and name.endswith('.staging.csv.gz')) or path == current:
+            continue
+        day = name[len(prefix):-len('.staging.csv.gz')]
+        xlsx_path = os.path.join(directory, f"{report['name']}-{day}.xlsx")
+        write_day_workbook(path, xlsx_path, day)
+        written.append(xlsx_path)
+    return written
+
+
+def write_summary(report, rollups, end, thresholds):
+    start = end - SUMMARY_WINDOWS[report['interval']]
+    summary = summary_result(start, end, 'rollups', rollups.summarize(start, end, thresholds), thresholds)
+    path = report_paths(report)['summary']
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(SUMMARY_RECORD_HEADERS)
+        writer.writerows(summary_records(summary))
+    os.replace(tmp, path)
+    return path
+
+
+def discard_uncommitted_segment(state, watermark):
+    """Undo an append whose rollups were never saved (the run died in between)"""
+    pending = state.pop('pending', None)
+    if pending is None or (watermark is not None and watermark >= pending['watermark']):
+        return
+    if pending['size'] is None:
+        if os.path.exists(pending['path']):
+            os.remove(pending['path'])
+    else:
+        with open(pending['path'], 'r+b') as f:
+            f.truncate(pending['size'])
+
+
+def run_scheduled_report(report, history, thresholds=None, progress=None, now=None):
+    """Export the samples added since the last run and refresh the summary.
+
+    Runs in the report worker; returns the last file written.
+    """
+    paths = report_paths(report)
+    os.makedirs(paths['directory'], exist_ok=True)
+    state = load_state(report)
+    rollups = HourlyRollups()
+    if os.path.exists(paths['rollups']):
+        rollups.load(paths['rollups'])
+    # Водяной знак из файла сводок: он записан одним атомарным шагом вместе с ними
+    state['watermark'] = rollups.meta.get('watermark', state.get('watermark'))
+    discard_uncommitted_segment(state, state['watermark'])
+
+    times, columns = history.since(state['watermark'])
+    segments = day_segments(times) if len(times) else []
+    output = paths['summary']
+    for i, (i0, i1) in enumerate(segments):
+        if progress:
+            progress(i, len(segments))
+        segment = {name: column[i0:i1] for name, column in columns.items()}
+        watermark = float(times[i1 - 1])
+        path = segment_path(report, datetime.fromtimestamp(times[i0]))
+        state['pending'] = {'path': path, 'size': os.path.getsize(path) if os.path.exists(path) else None,
+                            'watermark': watermark}
+        save_state(report, state)
+        output = append_segment(report, times[i0:i1], segment)
+        rollups.add(times[i0:i1], segment)
+        rollups.meta['watermark'] = watermark
+        rollups.save(paths['rollups'])
+        state['watermark'] = watermark
+    state.pop('pending', None)
+
+    if state.get('watermark') is not None:
+        if report['format'] == 'xlsx':
+            output = (finish_days(report, state['watermark']) or [output])[-1]
+        write_summary(report, rollups, state['watermark'], thresholds or {})
+    state['last_run'] = time.time() if now is None else now
+    save_state(report, state)
+    if progress:
+        progress(1, 1)
+    return output
+
+
+class ReportScheduler(QObject):
+    """Submits due scheduled reports to the application's report worker"""
+    job_submitted = pyqtSignal(int, str)
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.app = app
+        self.pending = {}
+        self.connected = False
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check)
+        self.timer.start(CHECK_INTERVAL_MS)
+
+    def reports(self):
+        return list(self.app.settings.get('scheduled_reports', []))
+
+    def check(self):
+        now = time.time()
+        for report in self.reports():
+            if is_due(report, now):
+                self.run(report)
+
+    def run(self, report):
+        """Queue a run of report unless one is already queued; return the job id"""
+        if report['name'] in self.pending.values():
+            return None
+        worker = self.app.report_worker()
+        if not self.connected:
+            for signal in (worker.job_finished, worker.job_failed):
+                signal.connect(lambda job_id, _: self.pending.pop(job_id, None))
+            worker.job_cancelled.connect(lambda job_id: self.pending.pop(job_id, None))
+            self.connected = True
+        title = f"Scheduled: {report['name']}"
+        job_id = worker.submit(title, run_scheduled_report, dict(report),
+                               self.app.history, thresholds=summary_thresholds(self.app.settings))
+        self.pending[job_id] = report['name']
+        self.job_submitted.emit(job_id, title)
+        return job_id
@@ -0,0 +1,193 @@
+"""Live settings: debounced atomic saves and reload of external edits.
+
+The application keeps its settings in one dict. Code that changes it calls
+SettingsStore.update() (or schedule_save() after editing the dict in place);
+writes are coalesced and done atomically by utils.save_settings. The file's
+mtime is polled, and an edit made outside the application is merged into
+the dict. Either way ``changed`` is emitted with the keys whose values
+changed, so the application can apply them without a restart. Values read
+from the file are checked against SETTINGS_SCHEMA first: a value of the
+wrong type or out of range is not merged, the old value stays and
+``rejected`` is emitted with the offending keys.
+"""
+import copy
+import json
+import os
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from scheduled import FORMATS, INTERVALS
+from utils import DEFAULT_SETTINGS, save_settings, settings_path
+
+SAVE_DELAY_MS = 500
+POLL_INTERVAL_MS = 2000
+
+ALERT_KEYS = {'cpu_temp_threshold', 'gpu_temp_threshold', 'ram_threshold', 'disk_threshold',
+              'alert_sustained_s', 'alert_hysteresis', 'alert_cooldown_s', 'alert_rules'}
+NOTIFICATION_KEYS = {'popup_alerts', 'alert_file_notifications', 'alert_file_path', 'email_notifications',
+                     'email_server', 'email_port', 'email_use_tls', 'email_from', 'email_to', 'email_username',
+                     'email_password', 'email_digest_s'}
+ANOMALY_KEYS = {'anomaly_detection', 'anomaly_seasonal', 'anomaly_z_threshold'}
+HISTORY_KEYS = {'poll_interval', 'history_retention_hours'}
+
+# Ключ -> (тип, минимум, максимум); у списков вместо границ тип элементов.
+# float допускает и целые числа, bool не считается числом
+SETTINGS_SCHEMA = {
+    'poll_interval': (int, 100, 3600000),
+    'cpu_temp_threshold': (int, 50, 120),
+    'gpu_temp_threshold': (int, 50, 120),
+    'ram_threshold': (int, 50, 100),
+    'disk_threshold': (int, 50, 100),
+    'popup_alerts': (bool, None, None),
+    'max_fps': (int, 1, 30),
+    'history_retention_hours': (int, 1, 87600),
+    'alert_sustained_s': (float, 0, 86400),
+    'alert_hysteresis': (float, 0, 100),
+    'alert_cooldown_s': (float, 0, 604800),
+    'alert_rules': (list, None, None),
+    'alert_file_notifications': (bool, None, None),
+    'alert_file_path': (str, None, None),
+    'email_notifications': (bool, None, None),
+    'email_server': (str, None, None),
+    'email_port': (int, 1, 65535),
+    'email_use_tls': (bool, None, None),
+    'email_from': (str, None, None),
+    'email_to': (str, None, None),
+    'email_username': (str, None, None),
+    'email_password': (str, None, None),
+    'email_digest_s': (int, 1, 3600),
+    'anomaly_detection': (bool, None, None),
+    'anomaly_seasonal': (bool, None, None),
+    'anomaly_z_threshold': (float, 0.5, 100),
+    'alert_log_path': (str, None, None),
+    'scheduled_reports': (list, dict, None),
+    'latency_targets': (list, None, None),
+    'latency_interval_s': (int, 1, 3600),
+    'latency_concurrency': (int, 1, 1024),
+    'speed_test_target': (str, None, None),
+    'speed_test_streams': (int, 1, 64),
+    'speed_test_duration_s': (int, 2, 300),
+    'speed_test_server_port': (int, 1, 65535),
+    'smartctl_path': (str, None, None),
+    'smart_cache_ttl_s': (int, 0, 86400),
+    'fleet_agents': (list, None, None),
+    'fleet_mode': (str, None, None),
+}
+# Допустимые значения строковых настроек
+SETTING_CHOICES = {
+    'fleet_mode': ('subscribe', 'poll'),
+}
+
+
+def valid_scheduled_report(report):
+    return (isinstance(report.get('name'), str) and bool(report['name'])
+            and report.get('interval') in INTERVALS and report.get('format') in FORMATS
+            and isinstance(report.get('directory', ''), str))
+
+
+def valid_setting(key, value):
+    """Whether value fits the schema of key; keys without a schema accept anything"""
+    if key not in SETTINGS_SCHEMA:
+        return True
+    kind, minimum, maximum = SETTINGS_SCHEMA[key]
+    if kind in (int, float):
+        if isinstance(value, bool) or not isinstance(value, int if kind is int else (int, float)):
+            return False
+        return minimum <= value <= maximum
+    if not isinstance(value, kind):
+        return False
+    if kind is str:
+        return key not in SETTING_CHOICES or value in SETTING_CHOICES[key]
+    if kind is list and minimum is not None:
+        if not all(isinstance(item, minimum) for item in value):
+            return False
+        if key == 'scheduled_reports':
+            return all(valid_scheduled_report(report) for report in value)
+    return True
+
+
+def invalid_settings(values):
+    """Keys of values that do not fit SETTINGS_SCHEMA"""
+    return {key for key, value in values.items() if not valid_setting(key, value)}
+
+
+class SettingsStore(QObject):
+    changed = pyqtSignal(object)
+    rejected = pyqtSignal(object)
+    save_failed = pyqtSignal(str)
+
+    def __init__(self, settings, path=None, parent=None):
+        super().__init__(parent)
+        self.settings = settings
+        self.path = path or settings_path()
+        # Неверные значения из файла при запуске заменяются значениями по умолчанию
+        self.invalid_at_start = invalid_settings(settings)
+        settings.update((key, copy.deepcopy(DEFAULT_SETTINGS[key])) for key in self.invalid_at_start)
+        self.known_mtime = self.file_mtime()
+
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(SAVE_DELAY_MS)
+        self.save_timer.timeout.connect(self.save)
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll)
+        self.poll_timer.start(POLL_INTERVAL_MS)
+
+    def file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def update(self, values):
+        """Set values, schedule a save and emit changed; returns the changed keys"""
+        keys = {key for key, value in values.items() if self.settings.get(key) != value}
+        if keys:
+            self.settings.update((key, values[key]) for key in keys)
+            self.schedule_save()
+            self.changed.emit(keys)
+        return keys
+
+    def schedule_save(self):
+        # Повторные изменения откладывают запись, на диск попадает только последнее состояние
+        self.save_timer.start()
+
+    def save(self):
+        """Write the settings now; returns False (and emits save_failed) on error"""
+        self.save_timer.stop()
+        try:
+            save_settings(self.settings, self.path)
+        except OSError as e:
+            self.save_failed.emit(f"Failed to save settings: {e}")
+            return False
+        self.known_mtime = self.file_mtime()
+        return True
+
+    def flush(self):
+        """Write a pending save now; returns False if it failed"""
+        if self.save_timer.isActive():
+            return self.save()
+        return True
+
+    def poll(self):
+        mtime = self.file_mtime()
+        if mtime is None or mtime == self.known_mtime:
+            return
+        self.known_mtime = mtime
+        try:
+            with open(self.path, 'r') as f:
+                loaded = json.load(f)
+        except (OSError, ValueError):
+            # Файл мог быть прочитан посреди записи редактором; дождёмся следующего изменения
+            return
+        if not isinstance(loaded, dict):
+            return
+        keys = {key for key, value in loaded.items() if self.settings.get(key) != value}
+        # Неверные значения не попадают в настройки, остаются прежние
+        invalid = invalid_settings({key: loaded[key] for key in keys})
+        keys -= invalid
+        if invalid:
+            self.rejected.emit(invalid)
+        if keys:
+            self.settings.update((key, loaded[key]) for key in keys)
+            self.changed.emit(keys)
@@ -0,0 +1,191 @@
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QPushButton, QFormLayout, QComboBox, QSpinBox, QCheckBox, QTabWidget,
+    QMessageBox, QLineEdit
+)
+from PyQt5.QtCore import Qt
+
+
+class SettingsTab(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        tabs = QTabWidget()
+
+        # General tab
+        general_tab = QWidget()
+        general_layout = QFormLayout(general_tab)
+        self.poll_map = {
+            "1 second": 1000, "2 seconds": 2000, "5 seconds": 5000,
+            "10 seconds": 10000, "30 seconds": 30000
+        }
+        self.poll_combo = QComboBox()
+        self.poll_combo.addItems(self.poll_map.keys())
+        general_layout.addRow("Polling Interval:", self.poll_combo)
+        self.fps_spin = QSpinBox()
+        self.fps_spin.setRange(1, 30)
+        self.fps_spin.setSuffix(" FPS")
+        general_layout.addRow("Max Refresh Rate:", self.fps_spin)
+        tabs.addTab(general_tab, "General")
+
+        # Alerts tab
+        alert_tab = QWidget()
+        alert_layout = QFormLayout(alert_tab)
+        self.cpu_temp_spin = QSpinBox()
+        self.cpu_temp_spin.setRange(50, 120)
+        self.cpu_temp_spin.setSuffix(" °C")
+        self.gpu_temp_spin = QSpinBox()
+        self.gpu_temp_spin.setRange(50, 120)
+        self.gpu_temp_spin.setSuffix(" °C")
+        self.ram_spin = QSpinBox()
+        self.ram_spin.setRange(50, 100)
+        self.ram_spin.setSuffix(" %")
+        self.disk_spin = QSpinBox()
+        self.disk_spin.setRange(50, 100)
+        self.disk_spin.setSuffix(" %")
+        self.popup_check = QCheckBox("Show popup alerts")
+        alert_layout.addRow("CPU Temp Threshold:", self.cpu_temp_spin)
+        alert_layout.addRow("GPU Temp Threshold:", self.gpu_temp_spin)
+        alert_layout.addRow("RAM Usage Threshold:", self.ram_spin)
+        alert_layout.addRow("Disk Usage Threshold:", self.disk_spin)
+        alert_layout.addRow(self.popup_check)
+        tabs.addTab(alert_tab, "Alerts")
+
+        # Notifications tab
+        notify_tab = QWidget()
+        notify_layout = QFormLayout(notify_tab)
+        self.file_check = QCheckBox("Append alerts to a log file")
+        self.file_path_edit = QLineEdit()
+        self.file_path_edit.setPlaceholderText("~/system_monitor_alerts.log")
+        self.email_check = QCheckBox("Send e-mail digests")
+        self.email_server_edit = QLineEdit()
+        self.email_port_spin = QSpinBox()
+        self.email_port_spin.setRange(1, 65535)
+        self.email_tls_check = QCheckBox("Use STARTTLS")
+        self.email_from_edit = QLineEdit()
+        self.email_to_edit = QLineEdit()
+        self.email_to_edit.setPlaceholderText("Comma-separated addresses")
+        self.email_user_edit = QLineEdit()
+        self.email_password_edit = QLineEdit()
+        self.email_password_edit.setEchoMode(QLineEdit.Password)
+        self.email_digest_spin = QSpinBox()
+        self.email_digest_spin.setRange(1, 3600)
+        self.email_digest_spin.setSuffix(" s")
+        notify_layout.addRow(self.file_check)
+        notify_layout.addRow("Log File:", self.file_path_edit)
+        notify_layout.addRow(self.email_check)
+        notify_layout.addRow("SMTP Server:", self.email_server_edit)
+        notify_layout.addRow("SMTP Port:", self.email_port_spin)
+        notify_layout.addRow(self.email_tls_check)
+        notify_layout.addRow("From:", self.email_from_edit)
+        notify_layout.addRow("To:", self.email_to_edit)
+        notify_layout.addRow("Username:", self.email_user_edit)
+        notify_layout.addRow("Password:", self.email_password_edit)
+        notify_layout.addRow("Digest Interval:", self.email_digest_spin)
+        tabs.addTab(notify_tab, "Notifications")
+
+        layout.addWidget(tabs)
+
+        save_btn = QPushButton("Save Settings")
+        save_btn.clicked.connect(self.save_settings)
+        layout.addWidget(save_btn, 0, Qt.AlignRight)
+
+        # Ключ настроек -> (виджет, значение по умолчанию)
+        self.fields = {
+            'poll_interval': (self.poll_combo, 2000),
+            'max_fps': (self.fps_spin, 5),
+            'cpu_temp_threshold': (self.cpu_temp_spin, 80),
+            'gpu_temp_threshold': (self.gpu_temp_spin, 85),
+            'ram_threshold': (self.ram_spin, 90),
+            'disk_threshold': (self.disk_spin, 90),
+            'popup_alerts': (self.popup_check, True),
+            'alert_file_notifications': (self.file_check, False),
+            'alert_file_path': (self.file_path_edit, ''),
+            'email_notifications': (self.email_check, False),
+            'email_server': (self.email_server_edit, ''),
+            'email_port': (self.email_port_spin, 587),
+            'email_use_tls': (self.email_tls_check, True),
+            'email_from': (self.email_from_edit, ''),
+            'email_to': (self.email_to_edit, ''),
+            'email_username': (self.email_user_edit, ''),
+            'email_password': (self.email_password_edit, ''),
+            'email_digest_s': (self.email_digest_spin, 60),
+        }
+        # Поля, изменённые пользователем после загрузки или сохранения
+        self.edited = set()
+        self.loading = False
+        for key, (widget, _) in self.fields.items():
+            self.edited_signal(widget).connect(lambda *args, key=key: self.field_edited(key))
+
+        self.load_settings()
+
+    @staticmethod
+    def edited_signal(widget):
+        if isinstance(widget, QComboBox):
+            return widget.currentIndexChanged
+        if isinstance(widget, QSpinBox):
+            return widget.valueChanged
+        if isinstance(widget, QCheckBox):
+            return widget.toggled
+        return widget.textChanged
+
+    def field_edited(self, key):
+        if not self.loading:
+            self.edited.add(key)
+
+    def load_settings(self, keys=None):
+        """Show the stored values of keys (all by default); fields edited since the last save are kept"""
+        settings = self.parent.settings
+        rev_map = {v: k for k, v in self.poll_map.items()}
+        if keys is None:
+            keys = self.fields
+            self.edited.clear()
+        self.loading = True
+        for key in keys:
+            if key not in self.fields or key in self.edited:
+                continue
+            widget, default = self.fields[key]
+            value = settings.get(key, default)
+            if widget is self.poll_combo:
+                widget.setCurrentText(rev_map.get(value, "2 seconds"))
+            elif isinstance(widget, QSpinBox):
+                widget.setValue(value)
+            elif isinstance(widget, QCheckBox):
+                widget.setChecked(value)
+            else:
+                widget.setText(value)
+        self.loading = False
+
+    def save_settings(self):
+        self.parent.settings_store.update({
+            'poll_interval': self.poll_map[self.poll_combo.currentText()],
+            'max_fps': self.fps_spin.value(),
+            'cpu_temp_threshold': self.cpu_temp_spin.value(),
+            'gpu_temp_threshold': self.gpu_temp_spin.value(),
+            'ram_threshold': self.ram_spin.value(),
+            'disk_threshold': self.disk_spin.value(),
+            'popup_alerts': self.popup_check.isChecked(),
+            'alert_file_notifications': self.file_check.isChecked(),
+            'alert_file_path': self.file_path_edit.text().strip(),
+            'email_notifications': self.email_check.isChecked(),
+            'email_server': self.email_server_edit.text().strip(),
+            'email_port': self.email_port_spin.value(),
+            'email_use_tls': self.email_tls_check.isChecked(),
+            'email_from': self.email_from_edit.text().strip(),
+            'email_to': self.email_to_edit.text().strip(),
+            'email_username': self.email_user_edit.text().strip(),
+            'email_password': self.email_password_edit.text(),
+            'email_digest_s': self.email_digest_spin.value(),
+        })
+        self.edited.clear()
+        # Изменения уже применены; ошибку записи на диск показываем сразу
+        if self.parent.settings_store.flush():
+            QMessageBox.information(self, "Success", "Settings saved successfully")
+        else:
+            QMessageBox.critical(self, "Error", "Failed to save settings, see the status bar")
+
+    def settings_changed(self, keys):
+        self.load_settings(keys)
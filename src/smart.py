@@ -0,0 +1,289 @@
+"""SMART health of all drives through smartctl's JSON output.
+
+Devices come from ``smartctl --scan --json``; each one is queried with
+``smartctl -i -A -H --json`` in a thread pool, so a slow or hung drive only
+costs its own timeout. Reports are normalised to one flat dict per device
+(health, temperature, reallocated/pending sectors, wear, ...) and cached for
+ttl_s seconds; failed queries are not cached, so the next check retries
+them. Every fresh report is appended to an NDJSON history, which is used to
+show how the counters changed since the previous check. The file is
+rewritten with the last HISTORY_LENGTH reports per device once it grows to
+twice that.
+"""
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from timebase import to_iso
+
+DEFAULT_TTL_S = 300
+DEFAULT_TIMEOUT_S = 30
+DEFAULT_WORKERS = 8
+HISTORY_LENGTH = 100
+WEAR_WARNING_PERCENT = 90
+
+# ATA-атрибуты: id -> поле результата
+ATA_COUNTERS = {5: 'reallocated_sectors', 197: 'pending_sectors', 198: 'uncorrectable'}
+# Нормализованное значение этих атрибутов - оставшийся ресурс SSD в процентах
+ATA_WEAR_IDS = (177, 231, 233, 202)
+TRACKED_FIELDS = ('passed', 'temperature', 'power_on_hours', 'reallocated_sectors', 'pending_sectors',
+                  'uncorrectable', 'media_errors', 'wear_percent')
+
+
+def default_history_path():
+    return os.path.join(os.path.expanduser('~'), '.system_monitor_smart.ndjson')
+
+
+def run_smartctl(smartctl, args, timeout_s):
+    """Run smartctl with --json and return the parsed output"""
+    proc = subprocess.run([smartctl, *args, '--json'], capture_output=True, timeout=timeout_s)
+    try:
+        output = json.loads(proc.stdout)
+    except ValueError:
+        raise OSError(f"smartctl returned no JSON (exit status {proc.returncode})")
+    return output
+
+
+def scan_devices(smartctl, timeout_s=DEFAULT_TIMEOUT_S):
+    """[(name, type)] of the devices smartctl can see"""
+    output = run_smartctl(smartctl, ['--scan'], timeout_s)
+    return [(device['name'], device.get('type')) for device in output.get('devices', [])]
+
+
+def smartctl_error(output):
+    messages = output.get('smartctl', {}).get('messages', [])
+    errors = [m['string'] for m in messages if m.get('severity') == 'error']
+    # Биты 0 и 1 кода возврата: ошибка командной строки или устройство не открылось
+    if output.get('smartctl', {}).get('exit_status', 0) & 0b11:
+        return "; ".join(errors) or "smartctl failed"
+    return None
+
+
+def parse_report(output):
+    """Flatten smartctl -i -A -H JSON into the fields used by the monitor"""
+    result = dict.fromkeys(TRACKED_FIELDS)
+    result['model'] = output.get('model_name') or output.get('model_family')
+    result['serial'] = output.get('serial_number')
+    result['passed'] = output.get('smart_status', {}).get('passed')
+    result['temperature'] = output.get('temperature', {}).get('current')
+    result['power_on_hours'] = output.get('power_on_time', {}).get('hours')
+
+    attributes = {a['id']: a for a in output.get('ata_smart_attributes', {}).get('table', [])}
+    for attr_id, field in ATA_COUNTERS.items():
+        if attr_id in attributes:
+            result[field] = attributes[attr_id]['raw']['value']
+    for attr_id in ATA_WEAR_IDS:
+        if attr_id in attributes:
+            result['wear_percent'] = max(0, 100 - attributes[attr_id]['value'])
+            break
+
+    nvme = output.get('nvme_smart_health_information_log')
+    if nvme:
+        result['wear_percent'] = nvme.get('percentage_used')
+        result['media_errors'] = nvme.get('media_errors')
+        if result['temperature'] is None:
+            result['temperature'] = nvme.get('temperature')
+        if result['power_on_hours'] is None:
+            result['power_on_hours'] = nvme.get('power_on_hours')
+    return result
+
+
+def query_device(smartctl, name, device_type=None, timeout_s=DEFAULT_TIMEOUT_S):
+    args = ['-i', '-A', '-H']
+    if device_type:
+        args += ['-d', device_type]
+    result = {'device': name, 'checked_at': time.time(), 'error': None}
+    try:
+        output = run_smartctl(smartctl, args + [name], timeout_s)
+    except subprocess.TimeoutExpired:
+        result['error'] = f"No answer in {timeout_s} s"
+        return result
+    except OSError as e:
+        result['error'] = str(e)
+        return result
+    result['error'] = smartctl_error(output)
+    if result['error'] is None:
+        result.update(parse_report(output))
+    return result
+
+
+def device_warnings(result):
+    if result.get('error'):
+        return [result['error']]
+    warnings = []
+    if result.get('passed') is False:
+        warnings.append("SMART overall health test FAILED")
+    for field, label in (('reallocated_sectors', "reallocated sectors"), ('pending_sectors', "pending sectors"),
+                         ('uncorrectable', "uncorrectable sectors"), ('media_errors', "media errors")):
+        if result.get(field):
+            warnings.append(f"{result[field]} {label}")
+    if (result.get('wear_percent') or 0) >= WEAR_WARNING_PERCENT:
+        warnings.append(f"{result['wear_percent']}% of rated endurance used")
+    return warnings
+
+
+class SmartCollector:
+    """Parallel smartctl queries with a per-device TTL cache and history"""
+
+    def __init__(self, smartctl='smartctl', ttl_s=DEFAULT_TTL_S, timeout_s=DEFAULT_TIMEOUT_S,
+                 workers=DEFAULT_WORKERS, history_path=None):
+        self.smartctl = smartctl
+        self.ttl_s = ttl_s
+        self.timeout_s = timeout_s
+        self.workers = workers
+        self.history_path = history_path
+        self.lock = threading.Lock()
+        self.devices = None
+        self.devices_at = 0.0
+        self.cache = {}
+        self.history = {}
+        # Строк в файле истории и ошибка последней записи в него
+        self.history_lines = 0
+        self.history_error = None
+        if history_path:
+            self.load_history()
+
+    def load_history(self):
+        try:
+            with open(self.history_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self.history_lines += 1
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.history.setdefault(record['device'], deque(maxlen=HISTORY_LENGTH)).append(record)
+        except OSError:
+            pass
+
+    def record(self, results):
+        """Add successful results to the history; a failed write is kept in history_error"""
+        results = [result for result in results if result['error'] is None]
+        with self.lock:
+            for result in results:
+                self.history.setdefault(result['device'], deque(maxlen=HISTORY_LENGTH)).append(result)
+        if not self.history_path or not results:
+            return
+        try:
+            # Файл переписывается только последними записями, когда вырастает вдвое
+            if self.history_lines + len(results) > 2 * HISTORY_LENGTH * max(1, len(self.history)):
+                self.rewrite_history()
+            else:
+                with open(self.history_path, 'a', encoding='utf-8') as f:
+                    for result in results:
+                        f.write(json.dumps(result) + '\n')
+                self.history_lines += len(results)
+            self.history_error = None
+        except OSError as e:
+            self.history_error = str(e)
+
+    def rewrite_history(self):
+        """Replace the history file with the records kept in memory, atomically"""
+        with self.lock:
+            records = [record for device in self.history.values() for record in device]
+        records.sort(key=lambda record: record['checked_at'])
+        directory = os.path.dirname(os.path.abspath(self.history_path))
+        fd, tmp = tempfile.mkstemp(prefix='.smart.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record) + '\n')
+            os.replace(tmp, self.history_path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        self.history_lines = len(records)
+
+    def previous(self, result):
+        """The last recorded report of the device before result, or None"""
+        with self.lock:
+            earlier = [r for r in self.history.get(result['device'], ()) if r['checked_at'] < result['checked_at']]
+        return earlier[-1] if earlier else None
+
+    def collect(self, force=False):
+        """SMART reports of all devices; only stale cache entries are queried"""
+        now = time.time()
+        if force or self.devices is None or now - self.devices_at >= self.ttl_s:
+            self.devices = scan_devices(self.smartctl, self.timeout_s)
+            self.devices_at = now
+
+        with self.lock:
+            stale = [(name, device_type) for name, device_type in self.devices
+                     if force or name not in self.cache or now - self.cache[name]['checked_at'] >= self.ttl_s]
+        if stale:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(stale))) as pool:
+                fresh = list(pool.map(lambda device: query_device(self.smartctl, *device, self.timeout_s), stale))
+            # Ошибки не кэшируются: разовый таймаут не должен показываться весь ttl_s
+            with self.lock:
+                self.cache.update((result['device'], result) for result in fresh if result['error'] is None)
+                for result in fresh:
+                    if result['error'] is not None:
+                        self.cache.pop(result['device'], None)
+            self.record(fresh)
+        else:
+            fresh = []
+
+        failed = {result['device']: result for result in fresh if result['error'] is not None}
+        with self.lock:
+            return [failed.get(name) or self.cache[name] for name, _ in self.devices
+                    if name in failed or name in self.cache]
+
+    def report_lines(self, results):
+        if not results:
+            return ["No SMART capable devices found"]
+        lines = []
+        if self.history_error is not None:
+            lines.append(f"Warning: could not save SMART history: {self.history_error}")
+        for result in results:
+            warnings = device_warnings(result)
+            status = "ERROR" if result['error'] else "WARNING" if warnings else "OK"
+            lines.append(f"{result['device']}: {status}  (checked {to_iso(result['checked_at'])})")
+            if result['error'] is None:
+                lines.append(f"  {result.get('model') or 'Unknown model'}, serial {result.get('serial') or '-'}")
+                previous = self.previous(result)
+                details = []
+                for field, label in (('temperature', "temperature °C"), ('power_on_hours', "power-on hours"),
+                                     ('reallocated_sectors', "reallocated"), ('pending_sectors', "pending"),
+                                     ('uncorrectable', "uncorrectable"), ('media_errors', "media errors"),
+                                     ('wear_percent', "wear %")):
+                    value = result.get(field)
+                    if value is None:
+                        continue
+                    text = f"{label}: {value}"
+                    if (field not in ('temperature', 'power_on_hours') and previous is not None
+                            and previous.get(field) is not None and previous[field] != value):
+                        text += f" ({value - previous[field]:+d} since {to_iso(previous['checked_at'])})"
+                    details.append(text)
+                lines.append("  " + ", ".join(details))
+            lines.extend(f"  ! {warning}" for warning in warnings if warning != result['error'])
+        return lines
+
+
+class SmartThread(QThread):
+    """Runs a SMART collection off the GUI thread"""
+    completed = pyqtSignal(object)
+
+    def __init__(self, collector, force=False, parent=None):
+        super().__init__(parent)
+        self.collector = collector
+        self.force = force
+
+    def run(self):
+        try:
+            results = self.collector.collect(self.force)
+            self.completed.emit(self.collector.report_lines(results))
+        except FileNotFoundError:
+            self.completed.emit([f"smartctl not found at '{self.collector.smartctl}'. "
+                                 f"Install smartmontools or set smartctl_path in the settings."])
+        except (OSError, subprocess.SubprocessError) as e:
+            self.completed.emit([f"Error: {e}"])
@@ -0,0 +1,303 @@
+"""Statistical summary of the history for reports.
+
+For each metric: mean, p50/p95/p99, max, time spent above the alert
+threshold and the hour with the highest mean. Ranges that are still held
+sample by sample in the HistoryStore are summarised exactly; longer ranges
+come from hourly rollups, whose percentiles are read from a fixed histogram
+(to within one bin, HIST_BINS per metric range).
+"""
+import json
+import os
+
+import numpy as np
+
+# Метрики сводки: имя, подпись, единица, верхняя граница гистограммы, порог из настроек
+SUMMARY_METRICS = [
+    ('cpu.percent', "CPU Usage", '%', 100.0, None),
+    ('cpu.temperature', "CPU Temperature", '°C', 150.0, 'cpu_temp_threshold'),
+    ('memory.percent', "Memory Usage", '%', 100.0, 'ram_threshold'),
+    ('swap.percent', "Swap Usage", '%', 100.0, None),
+    ('gpu.load', "GPU Load", '%', 100.0, None),
+    ('gpu.temp', "GPU Temperature", '°C', 150.0, 'gpu_temp_threshold'),
+    ('disk.max_percent', "Disk Usage (fullest)", '%', 100.0, 'disk_threshold'),
+]
+PERCENTILES = (50, 95, 99)
+HIST_BINS = 200
+MAX_GAP_S = 60.0
+ROLLUP_MAX_HOURS = 90 * 24
+MAX_RAW_SAMPLES = 5_000_000
+
+
+def summary_thresholds(settings):
+    """Alert thresholds of the summary metrics, from the settings"""
+    return {metric: settings[key] for metric, _, _, _, key in SUMMARY_METRICS if key and key in settings}
+
+
+def sample_durations(times, previous=None, max_gap_s=MAX_GAP_S):
+    """Seconds covered by each sample: the interval since the previous sample.
+
+    Intervals longer than max_gap_s (the monitor was not running) count as 0.
+    """
+    durations = np.empty_like(times)
+    if len(times) == 0:
+        return durations
+    durations[1:] = np.diff(times)
+    durations[0] = 0.0 if previous is None else times[0] - previous
+    durations[(durations > max_gap_s) | (durations < 0)] = 0.0
+    return durations
+
+
+def summarize_series(times, values, threshold=None):
+    """Exact statistics of one series, or None when it has no values"""
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return None
+    durations = sample_durations(times)[valid]
+    times = times[valid]
+    values = values[valid]
+
+    hours = (times // 3600).astype(np.int64)
+    offsets = hours - hours[0]
+    counts = np.bincount(offsets)
+    sums = np.bincount(offsets, weights=values)
+    means = np.divide(sums, counts, out=np.full(len(counts), -np.inf), where=counts > 0)
+    worst = int(np.argmax(means))
+
+    p50, p95, p99 = np.percentile(values, PERCENTILES)
+    return {
+        'count': int(values.size),
+        'mean': float(values.mean()),
+        'p50': float(p50),
+        'p95': float(p95),
+        'p99': float(p99),
+        'max': float(values.max()),
+        'above_s': None if threshold is None else float(durations[values > threshold].sum()),
+        'worst_hour': float((hours[0] + worst) * 3600),
+        'worst_hour_mean': float(means[worst]),
+    }
+
+
+class HourlyRollups:
+    """Per-hour aggregates of the summary metrics.
+
+    For every hour and metric: sample count, sum, max, seconds covered and a
+    histogram of the values over [0, upper bound]. Hours are keyed by
+    ``epoch // 3600``; only the newest ``max_hours`` are kept. ``meta`` is a
+    small JSON-able dict saved in the same file, so a caller's bookkeeping
+    (e.g. a watermark) is replaced atomically together with the rollups.
+    """
+    COUNT, SUM, MAX, SECONDS = range(4)
+
+    def __init__(self, metrics=SUMMARY_METRICS, bins=HIST_BINS, max_hours=ROLLUP_MAX_HOURS):
+        self.metrics = [name for name, _, _, _, _ in metrics]
+        self.upper = np.array([upper for _, _, _, upper, _ in metrics])
+        self.bins = bins
+        self.max_hours = max_hours
+        self.stats = {}
+        self.hists = {}
+        self.last_time = None
+        self.meta = {}
+
+    def __len__(self):
+        return len(self.stats)
+
+    def hour_range(self):
+        if not self.stats:
+            return None
+        return min(self.stats), max(self.stats)
+
+    def add(self, times, columns):
+        """Fold samples into the rollups; columns maps metric -> values aligned with times"""
+        if len(times) == 0:
+            return
+        durations = sample_durations(times, self.last_time)
+        self.last_time = float(times[-1])
+        hours, inverse = np.unique((times // 3600).astype(np.int64), return_inverse=True)
+
+        n = len(hours)
+        stats = np.zeros((n, len(self.metrics), 4))
+        hists = np.zeros((n, len(self.metrics), self.bins), dtype=np.uint32)
+        for i, name in enumerate(self.metrics):
+            values = columns[name]
+            valid = ~np.isnan(values)
+            index = inverse[valid]
+            v = values[valid]
+            stats[:, i, self.COUNT] = np.bincount(index, minlength=n)
+            stats[:, i, self.SUM] = np.bincount(index, weights=v, minlength=n)
+            stats[:, i, self.SECONDS] = np.bincount(index, weights=durations[valid], minlength=n)
+            maxs = np.full(n, -np.inf)
+            np.maximum.at(maxs, index, v)
+            stats[:, i, self.MAX] = maxs
+            bins = np.clip((v * (self.bins / self.upper[i])).astype(np.int64), 0, self.bins - 1)
+            hists[:, i] = np.bincount(index * self.bins + bins, minlength=n * self.bins).reshape(n, self.bins)
+
+        for k, hour in enumerate(hours.tolist()):
+            if hour in self.stats:
+                old = self.stats[hour]
+                old[:, [self.COUNT, self.SUM, self.SECONDS]] += stats[k][:, [self.COUNT, self.SUM, self.SECONDS]]
+                np.maximum(old[:, self.MAX], stats[k][:, self.MAX], out=old[:, self.MAX])
+                self.hists[hour] += hists[k]
+            else:
+                self.stats[hour] = stats[k]
+                self.hists[hour] = hists[k]
+
+        for hour in sorted(self.stats)[:-self.max_hours]:
+            del self.stats[hour]
+            del self.hists[hour]
+
+    def save(self, path):
+        """Write the rollups to an .npz file, replacing it atomically"""
+        hours = sorted(self.stats)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez(f, metrics=np.array(self.metrics), upper=self.upper,
+                     hours=np.array(hours, dtype=np.int64),
+                     stats=np.array([self.stats[h] for h in hours]).reshape(len(hours), len(self.metrics), 4),
+                     hists=np.array([self.hists[h] for h in hours], dtype=np.uint32).reshape(
+                         len(hours), len(self.metrics), self.bins),
+                     last_time=np.array(np.nan if self.last_time is None else self.last_time),
+                     meta=np.array(json.dumps(self.meta)))
+        os.replace(tmp, path)
+
+    def load(self, path):
+        """Replace the contents with rollups saved by save(), if the layout matches"""
+        with np.load(path) as data:
+            if list(data['metrics']) != self.metrics or data['hists'].shape[2] != self.bins:
+                return False
+            self.stats = {int(h): s.copy() for h, s in zip(data['hours'], data['stats'])}
+            self.hists = {int(h): s.copy() for h, s in zip(data['hours'], data['hists'])}
+            last_time = float(data['last_time'])
+            self.last_time = None if np.isnan(last_time) else last_time
+            self.meta = json.loads(str(data['meta'])) if 'meta' in data.files else {}
+        return True
+
+    def summarize(self, start, end, thresholds=None):
+        """Approximate statistics per metric over the hours overlapping [start, end]"""
+        thresholds = thresholds or {}
+        hours = sorted(h for h in self.stats if start // 3600 <= h <= end // 3600)
+        if not hours:
+            return {}
+        stats = np.stack([self.stats[h] for h in hours])
+        hists = np.stack([self.hists[h] for h in hours])
+
+        results = {}
+        width = self.upper / self.bins
+        for i, name in enumerate(self.metrics):
+            counts = stats[:, i, self.COUNT]
+            count = counts.sum()
+            if count == 0:
+                continue
+            vmax = stats[:, i, self.MAX].max()
+            cumulative = np.cumsum(hists[:, i].sum(axis=0))
+            # Верхняя граница корзины, в которую попал перцентиль
+            ranks = np.array(PERCENTILES) / 100.0 * count
+            p50, p95, p99 = np.minimum((np.searchsorted(cumulative, ranks) + 1) * width[i], vmax)
+
+            above_s = None
+            threshold = thresholds.get(name)
+            if threshold is not None:
+                first_bin = min(int(threshold // width[i]) + 1, self.bins)
+                above = hists[:, i, first_bin:].sum(axis=1)
+                above_s = float(np.sum(np.divide(stats[:, i, self.SECONDS] * above, counts,
+                                                 out=np.zeros(len(hours)), where=counts > 0)))
+
+            means = np.divide(stats[:, i, self.SUM], counts, out=np.full(len(hours), -np.inf), where=counts > 0)
+            worst = int(np.argmax(means))
+            results[name] = {
+                'count': int(count),
+                'mean': float(stats[:, i, self.SUM].sum() / count),
+                'p50': float(p50),
+                'p95': float(p95),
+                'p99': float(p99),
+                'max': float(vmax),
+                'above_s': above_s,
+                'worst_hour': float(hours[worst] * 3600),
+                'worst_hour_mean': float(means[worst]),
+            }
+        return results
+
+
+def summarize(history, start=None, end=None, thresholds=None):
+    """Summary of a time range of a HistoryStore.
+
+    Returns {'start', 'end', 'source', 'metrics'}, where metrics is a list of
+    per-metric statistics (metrics without data are left out) and source
+    tells whether raw samples or hourly rollups were used.
+    """
+    thresholds = thresholds or {}
+    raw_range = history.time_range()
+    hour_range = history.rollups.hour_range()
+    starts, ends = [], []
+    if raw_range:
+        starts.append(raw_range[0])
+        ends.append(raw_range[1])
+    if hour_range:
+        starts.append(hour_range[0] * 3600.0)
+        ends.append((hour_range[1] + 1) * 3600.0)
+    start = min(starts, default=0.0) if start is None else start
+    end = max(ends, default=0.0) if end is None else end
+
+    use_raw = (raw_range is not None and start >= raw_range[0]
+               and history.count(start, end) <= MAX_RAW_SAMPLES)
+    if use_raw:
+        stats = {}
+        for name, _, _, _, _ in SUMMARY_METRICS:
+            times, values = history.slice(name, start, end)
+            result = summarize_series(times, values, thresholds.get(name))
+            if result is not None:
+                stats[name] = result
+    else:
+        history.update_rollups()
+        stats = history.rollups.summarize(start, end, thresholds)
+
+    return summary_result(start, end, 'samples' if use_raw else 'rollups', stats, thresholds)
+
+
+def summary_result(start, end, source, stats, thresholds):
+    """Assemble a summary from per-metric statistics, in SUMMARY_METRICS order"""
+    metrics = []
+    for name, label, unit, _, _ in SUMMARY_METRICS:
+        if name in stats:
+            metrics.append({'metric': name, 'label': label, 'unit': unit,
+                            'threshold': thresholds.get(name), **stats[name]})
+    return {'start': start, 'end': end, 'source': source, 'metrics': metrics}
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "-"
+    hours, rest = divmod(int(round(seconds)), 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+SUMMARY_HEADERS = ["Metric", "Mean", "p50", "p95", "p99", "Max", "Above Threshold", "Worst Hour"]
+
+
+def summary_table(summary):
+    """Rows of formatted text for the summary table in reports, header first"""
+    from datetime import datetime
+
+    rows = [SUMMARY_HEADERS]
+    for m in summary['metrics']:
+        unit = m['unit']
+        above = format_duration(m['above_s'])
+        if m['threshold'] is not None:
+            above += f" (>{m['threshold']:g}{unit})"
+        worst = datetime.fromtimestamp(m['worst_hour']).strftime('%Y-%m-%d %H:00')
+        rows.append([m['label']] + [f"{m[key]:.1f}{unit}" for key in ('mean', 'p50', 'p95', 'p99', 'max')]
+                    + [above, f"{worst} ({m['worst_hour_mean']:.1f}{unit})"])
+    return rows
+
+
+SUMMARY_RECORD_HEADERS = ["Metric", "Unit", "Samples", "Mean", "p50", "p95", "p99", "Max", "Threshold",
+                          "Seconds Above Threshold", "Worst Hour", "Worst Hour Mean"]
+
+
+def summary_records(summary):
+    """Unformatted summary rows for spreadsheets and CSV, matching SUMMARY_RECORD_HEADERS"""
+    from timebase import to_iso
+
+    return [[m['label'], m['unit'], m['count'], m['mean'], m['p50'], m['p95'], m['p99'], m['max'],
+             m['threshold'], m['above_s'], to_iso(m['worst_hour'])[:16].replace('T', ' '), m['worst_hour_mean']]
+            for m in summary['metrics']]
@@ -0,0 +1,310 @@
+"""Multi-stream throughput test with a built-in server.
+
+A test runs N parallel TCP streams for a fixed duration, either against an
+HTTP(S) URL (download only, the URL is fetched again until time is up) or
+against another host running ``python throughput.py server``. Each stream
+reads with ``recv_into``/``readinto`` into its own preallocated 1 MB buffer,
+so the Python cost per byte stays small. Throughput is sampled every
+SAMPLE_INTERVAL_S and the first ``warmup_s`` seconds are left out of the
+result, which keeps TCP slow start from dominating short tests.
+
+Protocol of the built-in server: the client sends a header (magic, mode,
+duration). For a download (mode D) the server sends data for the duration
+and closes; for an upload (mode U) it reads until the client shuts down its
+side and replies with the number of bytes it received.
+"""
+import argparse
+import socket
+import socketserver
+import statistics
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+MAGIC = b'SMT1'
+HEADER = struct.Struct('!4scd')
+COUNT = struct.Struct('!Q')
+DEFAULT_PORT = 5201
+BUFFER_SIZE = 1 << 20
+SAMPLE_INTERVAL_S = 0.1
+MAX_DURATION_S = 300
+RTT_PROBES = 10
+
+
+def split_target(target):
+    """(host, port) of a built-in server target: host, host:port or [ipv6]:port"""
+    parts = urlsplit('//' + target.strip())
+    if not parts.hostname:
+        raise ValueError(f"Invalid target: {target!r}")
+    return parts.hostname, parts.port or DEFAULT_PORT
+
+
+def is_url(target):
+    return target.startswith(('http://', 'https://'))
+
+
+def recv_exact(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed by peer")
+        data += chunk
+    return bytes(data)
+
+
+class ThroughputHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        sock = self.request
+        try:
+            magic, mode, duration = HEADER.unpack(recv_exact(sock, HEADER.size))
+        except ConnectionError:
+            # Замер RTT: клиент только устанавливает соединение
+            return
+        if magic != MAGIC:
+            return
+        buffer = bytearray(BUFFER_SIZE)
+        if mode == b'D':
+            data = memoryview(buffer)
+            deadline = time.monotonic() + min(duration, MAX_DURATION_S)
+            try:
+                while time.monotonic() < deadline:
+                    sock.sendall(data)
+            except OSError:
+                return
+        elif mode == b'U':
+            total = 0
+            while True:
+                n = sock.recv_into(buffer)
+                if not n:
+                    break
+                total += n
+            sock.sendall(COUNT.pack(total))
+
+
+class ThroughputServer(socketserver.ThreadingTCPServer):
+    """Serves download and upload streams to throughput test clients"""
+    allow_reuse_address = True
+    daemon_threads = True
+    # Замеры RTT открывают соединения подряд; при очереди 5 часть SYN теряется
+    request_queue_size = 128
+
+    def __init__(self, host='', port=DEFAULT_PORT):
+        super().__init__((host, port), ThroughputHandler)
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+
+def start_server(host='', port=DEFAULT_PORT):
+    """Run a ThroughputServer in a daemon thread; stop it with shutdown()"""
+    server = ThroughputServer(host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class StreamCounter:
+    """Bytes moved by one stream; written by the stream, read by the sampler"""
+
+    def __init__(self):
+        self.bytes = 0
+        self.ttfb_s = None
+
+
+def download_stream(host, port, duration_s, timeout_s, counter, cancel):
+    buffer = bytearray(BUFFER_SIZE)
+    with socket.create_connection((host, port), timeout_s) as sock:
+        start = time.perf_counter()
+        sock.sendall(HEADER.pack(MAGIC, b'D', duration_s))
+        while not cancel.is_set():
+            n = sock.recv_into(buffer)
+            if not n:
+                break
+            if counter.ttfb_s is None:
+                counter.ttfb_s = time.perf_counter() - start
+            counter.bytes += n
+
+
+def upload_stream(host, port, duration_s, timeout_s, counter, cancel):
+    data = memoryview(bytearray(BUFFER_SIZE))
+    with socket.create_connection((host, port), timeout_s) as sock:
+        sock.sendall(HEADER.pack(MAGIC, b'U', duration_s))
+        deadline = time.monotonic() + duration_s
+        while time.monotonic() < deadline and not cancel.is_set():
+            sock.sendall(data)
+            counter.bytes += len(data)
+        sock.shutdown(socket.SHUT_WR)
+        return COUNT.unpack(recv_exact(sock, COUNT.size))[0]
+
+
+def http_stream(url, duration_s, timeout_s, counter, cancel):
+    import requests
+
+    buffer = bytearray(BUFFER_SIZE)
+    deadline = time.monotonic() + duration_s
+    with requests.Session() as session:
+        while time.monotonic() < deadline and not cancel.is_set():
+            start = time.perf_counter()
+            with session.get(url, stream=True, timeout=timeout_s) as response:
+                response.raise_for_status()
+                while time.monotonic() < deadline and not cancel.is_set():
+                    n = response.raw.readinto(buffer)
+                    if not n:
+                        break
+                    if counter.ttfb_s is None:
+                        counter.ttfb_s = time.perf_counter() - start
+                    counter.bytes += n
+
+
+def connect_times(host, port, count=RTT_PROBES, timeout_s=5):
+    """TCP connect times in ms; a connect takes one round trip"""
+    times = []
+    for _ in range(count):
+        start = time.perf_counter()
+        with socket.create_connection((host, port), timeout_s):
+            times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def jitter(times):
+    """Mean difference between consecutive delays, as in RFC 3550"""
+    if len(times) < 2:
+        return None
+    return statistics.mean(abs(b - a) for a, b in zip(times, times[1:]))
+
+
+class ThroughputResult:
+    def __init__(self, target, direction, streams):
+        self.target = target
+        self.direction = direction
+        self.streams = streams
+        self.bytes = 0
+        self.measured_s = 0.0
+        self.mbps = 0.0
+        self.interval_mbps = []
+        self.ttfb_ms = []
+        self.rtt_ms = []
+        self.server_bytes = None
+        self.cancelled = False
+        self.errors = []
+
+    def summary_lines(self):
+        lines = [f"{self.direction.capitalize()} test: {self.target}, {self.streams} streams"]
+        if self.cancelled:
+            lines.append("Cancelled")
+        lines.append(f"Throughput: {self.mbps:.2f} Mbps "
+                     f"({self.bytes / 1024 / 1024:.1f} MB in {self.measured_s:.1f} s after warm-up)")
+        if len(self.interval_mbps) > 1:
+            lines.append(f"Interval throughput: min {min(self.interval_mbps):.2f}, "
+                         f"max {max(self.interval_mbps):.2f}, "
+                         f"stdev {statistics.pstdev(self.interval_mbps):.2f} Mbps")
+        if self.ttfb_ms:
+            lines.append(f"Time to first byte: {statistics.median(self.ttfb_ms):.1f} ms (median)")
+        if self.rtt_ms:
+            lines.append(f"RTT: {statistics.median(self.rtt_ms):.2f} ms (median), "
+                         f"jitter {jitter(self.rtt_ms):.2f} ms")
+        if self.server_bytes is not None:
+            lines.append(f"Received by server: {self.server_bytes / 1024 / 1024:.1f} MB")
+        lines.extend(self.errors)
+        return lines
+
+
+def run_test(target, direction='download', streams=4, duration_s=10, warmup_s=1, timeout_s=10,
+             progress=None, cancel=None):
+    """Run a throughput test against target (URL or built-in server) and return a ThroughputResult.
+
+    progress, if given, is called with (elapsed s, current Mbps) every
+    SAMPLE_INTERVAL_S from the calling thread.
+    """
+    cancel = cancel or threading.Event()
+    if is_url(target):
+        if direction != 'download':
+            raise ValueError("HTTP targets only support download tests")
+        parts = urlsplit(target)
+        host, port = parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80)
+    else:
+        host, port = split_target(target)
+    warmup_s = min(warmup_s, duration_s / 2)
+
+    result = ThroughputResult(target, direction, streams)
+    result.rtt_ms = connect_times(host, port, timeout_s=timeout_s)
+    counters = [StreamCounter() for _ in range(streams)]
+    with ThreadPoolExecutor(max_workers=streams) as pool:
+        if is_url(target):
+            futures = [pool.submit(http_stream, target, duration_s, timeout_s, c, cancel) for c in counters]
+        else:
+            stream = download_stream if direction == 'download' else upload_stream
+            futures = [pool.submit(stream, host, port, duration_s, timeout_s, c, cancel) for c in counters]
+
+        start = time.monotonic()
+        samples = [(0.0, 0)]
+        while not all(f.done() for f in futures):
+            time.sleep(SAMPLE_INTERVAL_S)
+            elapsed = time.monotonic() - start
+            total = sum(c.bytes for c in counters)
+            last_elapsed, last_total = samples[-1]
+            samples.append((elapsed, total))
+            if progress:
+                progress(elapsed, (total - last_total) * 8 / (elapsed - last_elapsed) / 1e6)
+            if elapsed > duration_s + timeout_s:
+                cancel.set()
+
+    for future in futures:
+        try:
+            server_bytes = future.result()
+        except (OSError, ValueError) as e:
+            result.errors.append(f"Stream failed: {e}")
+            continue
+        if server_bytes is not None:
+            result.server_bytes = (result.server_bytes or 0) + server_bytes
+    result.ttfb_ms = [c.ttfb_s * 1000 for c in counters if c.ttfb_s is not None]
+    result.cancelled = cancel.is_set()
+
+    # Замер начинается после прогрева, чтобы не учитывать медленный старт TCP
+    measured = [(t, total) for t, total in samples if t >= warmup_s] or samples
+    (t0, b0), (t1, b1) = measured[0], measured[-1]
+    result.bytes = b1 - b0
+    result.measured_s = t1 - t0
+    result.mbps = result.bytes * 8 / result.measured_s / 1e6 if result.measured_s > 0 else 0.0
+    result.interval_mbps = [(b - a) * 8 / (u - s) / 1e6
+                            for (s, a), (u, b) in zip(measured, measured[1:]) if u > s]
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-stream throughput test and server")
+    commands = parser.add_subparsers(dest='command', required=True)
+    server_parser = commands.add_parser('server', help="serve throughput test clients")
+    server_parser.add_argument('--host', default='', help="address to listen on (default: all)")
+    server_parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT)
+    client_parser = commands.add_parser('client', help="run a test against a server or URL")
+    client_parser.add_argument('target', help="host[:port] of a throughput server, or an HTTP(S) URL")
+    client_parser.add_argument('-P', '--streams', type=int, default=4)
+    client_parser.add_argument('-t', '--duration', type=float, default=10)
+    client_parser.add_argument('-w', '--warmup', type=float, default=1)
+    client_parser.add_argument('-u', '--upload', action='store_true', help="upload instead of download")
+    args = parser.parse_args(argv)
+
+    if args.command == 'server':
+        server = ThroughputServer(args.host, args.port)
+        print(f"Listening on port {server.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+
+    result = run_test(args.target, 'upload' if args.upload else 'download', args.streams,
+                      args.duration, args.warmup)
+    print("\n".join(result.summary_lines()))
+    return 1 if result.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
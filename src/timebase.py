@@ -0,0 +1,36 @@
+import time
+from datetime import datetime
+
+# Смещение монотонных часов относительно эпохи, фиксируется один раз при запуске
+EPOCH_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+
+def monotonic_ns():
+    return time.monotonic_ns()
+
+
+def to_epoch(t_ns):
+    """Convert a monotonic timestamp in ns to wall-clock epoch seconds"""
+    return (t_ns + EPOCH_OFFSET_NS) / 1e9
+
+
+def to_plot_time(epoch):
+    """Convert epoch seconds to a matplotlib date number in local time"""
+    return (epoch + time.localtime(epoch).tm_gmtoff) / 86400.0
+
+
+def to_iso(epoch):
+    return datetime.fromtimestamp(epoch).isoformat(timespec='milliseconds')
+
+
+def from_plot_time(days):
+    """Inverse of to_plot_time"""
+    local = days * 86400.0
+    return local - time.localtime(local).tm_gmtoff
+
+
+def to_plot_times(epochs):
+    """Vectorised to_plot_time for NumPy arrays of epoch seconds"""
+    if len(epochs) == 0:
+        return epochs
+    return (epochs + time.localtime(epochs[-1]).tm_gmtoff) / 86400.0
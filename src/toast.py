@@ -0,0 +1,64 @@
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QFrame, QVBoxLayout, QLabel
+
+TOAST_MS = 6000
+TOAST_WIDTH = 320
+MARGIN = 12
+
+
+class Toast(QFrame):
+    """Non-modal notification shown in the bottom-right corner of a window"""
+    closed = pyqtSignal()
+
+    def __init__(self, title, message, parent):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.setStyleSheet("QFrame { background-color: #2c3e50; border-radius: 6px; } "
+                           "QLabel { color: white; background: transparent; }")
+        layout = QVBoxLayout(self)
+        title_label = QLabel(f"<b>{title}</b>")
+        message_label = QLabel(message)
+        message_label.setWordWrap(True)
+        layout.addWidget(title_label)
+        layout.addWidget(message_label)
+        self.setFixedWidth(TOAST_WIDTH)
+        self.adjustSize()
+        QTimer.singleShot(TOAST_MS, self.close)
+
+    def mousePressEvent(self, event):
+        self.close()
+
+    def closeEvent(self, event):
+        self.closed.emit()
+        super().closeEvent(event)
+
+
+class ToastStack:
+    """Keeps the toasts of a window stacked upwards from its bottom-right corner"""
+
+    def __init__(self, window, max_visible=4):
+        self.window = window
+        self.max_visible = max_visible
+        self.toasts = []
+
+    def show(self, title, message):
+        toast = Toast(title, message, self.window)
+        toast.closed.connect(lambda: self.remove(toast))
+        self.toasts.append(toast)
+        while len(self.toasts) > self.max_visible:
+            self.toasts.pop(0).close()
+        toast.show()
+        toast.raise_()
+        self.reposition()
+
+    def remove(self, toast):
+        if toast in self.toasts:
+            self.toasts.remove(toast)
+            self.reposition()
+
+    def reposition(self):
+        y = self.window.height() - MARGIN
+        for toast in reversed(self.toasts):
+            y -= toast.height()
+            toast.move(self.window.width() - toast.width() - MARGIN, y)
+            y -= MARGIN
@@ -0,0 +1,355 @@
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QGroupBox, QPushButton, QTextEdit, QHeaderView,
+    QComboBox, QSpinBox, QCheckBox, QMessageBox, QLineEdit, QFileDialog
+)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont
+import os
+import tempfile
+import platform
+from models import KeyedTableModel, create_table_view
+from utils import format_bytes
+
+
+class ToolsTab(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        # Disk cleanup
+        disk_group = QGroupBox("Disk Cleanup")
+        disk_layout = QVBoxLayout(disk_group)
+        self.temp_check = QCheckBox("Delete temporary files")
+        self.temp_check.setChecked(True)
+        self.cache_check = QCheckBox("Clear system cache")
+        disk_layout.addWidget(self.temp_check)
+        disk_layout.addWidget(self.cache_check)
+
+        filter_layout = QHBoxLayout()
+        self.cleanup_age_spin = QSpinBox()
+        self.cleanup_age_spin.setRange(0, 3650)
+        self.cleanup_age_spin.setSuffix(" days")
+        self.cleanup_size_spin = QSpinBox()
+        self.cleanup_size_spin.setRange(0, 10 ** 7)
+        self.cleanup_size_spin.setSuffix(" KB")
+        filter_layout.addWidget(QLabel("Older than:"))
+        filter_layout.addWidget(self.cleanup_age_spin)
+        filter_layout.addWidget(QLabel("Larger than:"))
+        filter_layout.addWidget(self.cleanup_size_spin)
+        filter_layout.addStretch()
+        disk_layout.addLayout(filter_layout)
+
+        cleanup_buttons = QHBoxLayout()
+        self.preview_btn = QPushButton("Preview")
+        self.preview_btn.clicked.connect(lambda: self.start_cleanup(delete=False))
+        self.cleanup_btn = QPushButton("Run Cleanup")
+        self.cleanup_btn.clicked.connect(self.run_cleanup)
+        self.cancel_cleanup_btn = QPushButton("Cancel")
+        self.cancel_cleanup_btn.setEnabled(False)
+        self.cancel_cleanup_btn.clicked.connect(self.cancel_cleanup)
+        cleanup_buttons.addWidget(self.preview_btn)
+        cleanup_buttons.addWidget(self.cleanup_btn)
+        cleanup_buttons.addWidget(self.cancel_cleanup_btn)
+        disk_layout.addLayout(cleanup_buttons)
+        self.cleanup_status = QLabel("")
+        disk_layout.addWidget(self.cleanup_status)
+        layout.addWidget(disk_group)
+        self.cleanup_thread = None
+        self.cleanup_preview = None
+
+        # Disk usage analyzer
+        usage_group = QGroupBox("Disk Usage")
+        usage_layout = QVBoxLayout(usage_group)
+        path_layout = QHBoxLayout()
+        self.usage_path_edit = QLineEdit(os.path.expanduser('~'))
+        browse_btn = QPushButton("Browse...")
+        browse_btn.clicked.connect(self.browse_usage_path)
+        self.analyze_btn = QPushButton("Analyze")
+        self.analyze_btn.clicked.connect(lambda: self.start_usage_scan(full=False))
+        self.full_scan_btn = QPushButton("Full Scan")
+        self.full_scan_btn.clicked.connect(lambda: self.start_usage_scan(full=True))
+        self.cancel_usage_btn = QPushButton("Cancel")
+        self.cancel_usage_btn.setEnabled(False)
+        self.cancel_usage_btn.clicked.connect(lambda: self.usage_thread and self.usage_thread.cancel())
+        path_layout.addWidget(self.usage_path_edit, 1)
+        path_layout.addWidget(browse_btn)
+        path_layout.addWidget(self.analyze_btn)
+        path_layout.addWidget(self.full_scan_btn)
+        path_layout.addWidget(self.cancel_usage_btn)
+        usage_layout.addLayout(path_layout)
+        self.usage_status = QLabel("")
+        usage_layout.addWidget(self.usage_status)
+
+        tables_layout = QHBoxLayout()
+        self.usage_dirs_model = KeyedTableModel(
+            ["Directory", "Files", "Size", "With Subdirectories"],
+            formatters={2: format_bytes, 3: format_bytes}, parent=self)
+        self.usage_dirs_table, _ = create_table_view(self.usage_dirs_model, resize_mode=QHeaderView.Interactive)
+        self.usage_dirs_table.sortByColumn(2, Qt.DescendingOrder)
+        self.usage_files_model = KeyedTableModel(["File", "Size"], formatters={1: format_bytes}, parent=self)
+        self.usage_files_table, _ = create_table_view(self.usage_files_model, resize_mode=QHeaderView.Interactive)
+        self.usage_files_table.sortByColumn(1, Qt.DescendingOrder)
+        tables_layout.addWidget(self.usage_dirs_table)
+        tables_layout.addWidget(self.usage_files_table)
+        usage_layout.addLayout(tables_layout)
+        layout.addWidget(usage_group)
+        self.disk_usage = None
+        self.usage_thread = None
+
+        # Diagnostics
+        diag_group = QGroupBox("Diagnostics")
+        diag_layout = QVBoxLayout(diag_group)
+        btn_layout = QHBoxLayout()
+        disk_btn = QPushButton("Disk Health")
+        disk_btn.clicked.connect(lambda: self.check_disk())
+        # Повторный опрос всех дисков в обход кэша
+        disk_refresh_btn = QPushButton("Refresh Disk Health")
+        disk_refresh_btn.clicked.connect(lambda: self.check_disk(force=True))
+        ping_btn = QPushButton("Ping Test")
+        ping_btn.clicked.connect(self.run_ping)
+        speed_btn = QPushButton("Speed Test")
+        speed_btn.clicked.connect(self.run_speed_test)
+        btn_layout.addWidget(disk_btn)
+        btn_layout.addWidget(disk_refresh_btn)
+        btn_layout.addWidget(ping_btn)
+        btn_layout.addWidget(speed_btn)
+        diag_layout.addLayout(btn_layout)
+
+        # Параметры теста скорости и встроенный сервер
+        settings = self.parent.settings
+        speed_layout = QHBoxLayout()
+        self.speed_target_edit = QLineEdit(settings.get('speed_test_target', ''))
+        self.speed_target_edit.setPlaceholderText("http(s) URL or host[:port] of a throughput server")
+        self.speed_direction_combo = QComboBox()
+        self.speed_direction_combo.addItems(["Download", "Upload"])
+        self.speed_streams_spin = QSpinBox()
+        self.speed_streams_spin.setRange(1, 64)
+        self.speed_streams_spin.setValue(settings.get('speed_test_streams', 4))
+        self.speed_duration_spin = QSpinBox()
+        self.speed_duration_spin.setRange(2, 300)
+        self.speed_duration_spin.setSuffix(" s")
+        self.speed_duration_spin.setValue(settings.get('speed_test_duration_s', 10))
+        speed_layout.addWidget(QLabel("Target:"))
+        speed_layout.addWidget(self.speed_target_edit, 1)
+        speed_layout.addWidget(self.speed_direction_combo)
+        speed_layout.addWidget(QLabel("Streams:"))
+        speed_layout.addWidget(self.speed_streams_spin)
+        speed_layout.addWidget(self.speed_duration_spin)
+        diag_layout.addLayout(speed_layout)
+
+        server_layout = QHBoxLayout()
+        self.speed_port_spin = QSpinBox()
+        self.speed_port_spin.setRange(1, 65535)
+        self.speed_port_spin.setValue(settings.get('speed_test_server_port', 5201))
+        self.speed_server_btn = QPushButton("Start Server")
+        self.speed_server_btn.clicked.connect(self.toggle_speed_server)
+        server_layout.addWidget(QLabel("Server port:"))
+        server_layout.addWidget(self.speed_port_spin)
+        server_layout.addWidget(self.speed_server_btn)
+        server_layout.addStretch()
+        diag_layout.addLayout(server_layout)
+        self.speed_server = None
+        self.smart_collector = None
+        self.smart_thread = None
+
+        self.output = QTextEdit()
+        self.output.setReadOnly(True)
+        self.output.setFont(QFont("Courier", 9))
+        diag_layout.addWidget(self.output)
+        layout.addWidget(diag_group)
+        self.parent.speed_test_thread.result_ready.connect(self.output.setPlainText)
+
+    def cleanup_paths(self):
+        paths = []
+        if self.temp_check.isChecked():
+            paths.append(tempfile.gettempdir())
+        if self.cache_check.isChecked():
+            if platform.system() == 'Windows':
+                paths.append(os.path.join(os.environ['LOCALAPPDATA'], 'Temp'))
+            else:
+                paths.append(os.path.expanduser('~/.cache'))
+        return paths
+
+    def cleanup_options(self):
+        return (tuple(self.cleanup_paths()), self.cleanup_age_spin.value(), self.cleanup_size_spin.value())
+
+    def run_cleanup(self):
+        # Перед удалением всегда показывается результат предварительного просмотра
+        preview = self.cleanup_preview
+        if preview is None or preview[0] != self.cleanup_options():
+            self.start_cleanup(delete=False, then_confirm=True)
+            return
+        stats = preview[1]
+        reply = QMessageBox.question(
+            self, "Confirm Cleanup",
+            f"Delete {stats.totals['matched']} files "
+            f"({stats.totals['matched_bytes'] / (1024 * 1024):.2f} MB)?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply == QMessageBox.Yes:
+            self.start_cleanup(delete=True)
+
+    def start_cleanup(self, delete, then_confirm=False):
+        from cleanup import CleanupFilter, CleanupThread
+
+        if self.cleanup_thread is not None:
+            return
+        options = self.cleanup_options()
+        paths, age_days, min_size_kb = options
+        if not paths:
+            QMessageBox.warning(self, "Warning", "No cleanup options selected")
+            return
+
+        self.cleanup_preview = None
+        self.cleanup_thread = CleanupThread(list(paths), CleanupFilter(age_days, min_size_kb * 1024), delete, self)
+        self.cleanup_thread.progress.connect(self.show_cleanup_progress)
+        self.cleanup_thread.completed.connect(
+            lambda stats: self.cleanup_completed(stats, options, then_confirm))
+        self.preview_btn.setEnabled(False)
+        self.cleanup_btn.setEnabled(False)
+        self.cancel_cleanup_btn.setEnabled(True)
+        self.cleanup_thread.start()
+
+    def cancel_cleanup(self):
+        if self.cleanup_thread is not None:
+            self.cleanup_thread.cancel()
+
+    def show_cleanup_progress(self, progress):
+        mb = progress['deleted_bytes' if progress['delete'] else 'matched_bytes'] / (1024 * 1024)
+        action = "deleted" if progress['delete'] else "reclaimable"
+        self.cleanup_status.setText(
+            f"{progress['dirs']} directories, {progress['files']} files scanned, {mb:.2f} MB {action}"
+            + (f", {progress['errors']} errors" if progress['errors'] else ""))
+
+    def cleanup_completed(self, stats, options, then_confirm):
+        self.cleanup_thread.wait()
+        self.cleanup_thread = None
+        self.preview_btn.setEnabled(True)
+        self.cleanup_btn.setEnabled(True)
+        self.cancel_cleanup_btn.setEnabled(False)
+        self.output.setPlainText("\n".join(stats.log_lines()))
+        if stats.cancelled:
+            return
+        if stats.delete:
+            QMessageBox.information(self, "Success", "Cleanup completed")
+            return
+        self.cleanup_preview = (options, stats)
+        if then_confirm:
+            self.run_cleanup()
+
+    def browse_usage_path(self):
+        path = QFileDialog.getExistingDirectory(self, "Select Directory", self.usage_path_edit.text())
+        if path:
+            self.usage_path_edit.setText(path)
+
+    def start_usage_scan(self, full):
+        from diskusage import DiskUsageAnalyzer, DiskUsageThread
+
+        if self.usage_thread is not None:
+            return
+        if self.disk_usage is None:
+            self.disk_usage = DiskUsageAnalyzer()
+        self.usage_thread = DiskUsageThread(self.disk_usage, self.usage_path_edit.text(), full, self)
+        self.usage_thread.progress.connect(
+            lambda dirs, listed: self.usage_status.setText(f"{dirs} directories checked, {listed} read"))
+        self.usage_thread.completed.connect(self.usage_scan_completed)
+        self.analyze_btn.setEnabled(False)
+        self.full_scan_btn.setEnabled(False)
+        self.cancel_usage_btn.setEnabled(True)
+        self.usage_thread.start()
+
+    def usage_scan_completed(self, result):
+        self.usage_thread.wait()
+        self.usage_thread = None
+        self.analyze_btn.setEnabled(True)
+        self.full_scan_btn.setEnabled(True)
+        self.cancel_usage_btn.setEnabled(False)
+        if isinstance(result, OSError):
+            self.usage_status.setText(f"Error: {result.strerror}: {result.filename}")
+            return
+
+        self.usage_dirs_model.set_rows(
+            (node.path, (node.path, node.file_count, node.file_size, node.total_size))
+            for node in result.largest_dirs())
+        self.usage_files_model.set_rows((path, (path, size)) for size, path in result.largest_files())
+        status = (f"{format_bytes(result.root.total_size)} in {result.root.total_files} files, "
+                  f"{result.dirs} directories ({result.listed} read) in {result.elapsed_s:.1f} s")
+        if result.cancelled:
+            status += " - cancelled, partial results"
+        if result.errors:
+            status += f", {len(result.errors)} unreadable"
+        self.usage_status.setText(status)
+
+    def check_disk(self, force=False):
+        from smart import SmartCollector, SmartThread, default_history_path
+
+        if self.smart_thread is not None:
+            return
+        settings = self.parent.settings
+        smartctl = settings.get('smartctl_path') or 'smartctl'
+        ttl_s = settings.get('smart_cache_ttl_s', 300)
+        collector = self.smart_collector
+        if collector is None or (collector.smartctl, collector.ttl_s) != (smartctl, ttl_s):
+            self.smart_collector = SmartCollector(smartctl, ttl_s, history_path=default_history_path())
+        self.output.setPlainText("Checking disk health...")
+        self.smart_thread = SmartThread(self.smart_collector, force, parent=self)
+        self.smart_thread.completed.connect(self.disk_health_completed)
+        self.smart_thread.start()
+
+    def disk_health_completed(self, lines):
+        self.smart_thread.wait()
+        self.smart_thread = None
+        self.output.setPlainText("\n".join(lines))
+
+    def run_ping(self):
+        # Пинг выполняет монитор задержек на вкладке Latency
+        from app import LATENCY_TAB
+        self.parent.tabs.setCurrentIndex(LATENCY_TAB)
+        self.parent.ensure_tab(LATENCY_TAB).start_monitor()
+
+    def run_speed_test(self):
+        if not self.parent.speed_test_thread.isRunning():
+            settings = self.parent.settings
+            self.parent.settings_store.update({
+                'speed_test_target': self.speed_target_edit.text().strip(),
+                'speed_test_streams': self.speed_streams_spin.value(),
+                'speed_test_duration_s': self.speed_duration_spin.value(),
+            })
+            self.output.setPlainText("Starting speed test...")
+            self.parent.speed_test_thread.configure(
+                settings['speed_test_target'], self.speed_direction_combo.currentText().lower(),
+                settings['speed_test_streams'], settings['speed_test_duration_s'])
+            self.parent.speed_test_thread.start()
+        else:
+            QMessageBox.warning(self, "Warning", "Speed test already in progress")
+
+    def toggle_speed_server(self):
+        if self.speed_server is not None:
+            self.stop_speed_server()
+            self.output.setPlainText("Throughput server stopped")
+            return
+
+        from throughput import start_server
+        port = self.speed_port_spin.value()
+        try:
+            self.speed_server = start_server(port=port)
+        except OSError as e:
+            QMessageBox.warning(self, "Warning", f"Cannot listen on port {port}: {e.strerror}")
+            return
+        self.parent.settings_store.update({'speed_test_server_port': port})
+        self.speed_server_btn.setText("Stop Server")
+        self.speed_port_spin.setEnabled(False)
+        self.output.setPlainText(f"Throughput server listening on port {port}\n"
+                                 f"Other hosts can test against {platform.node()}:{port}")
+
+    def stop_speed_server(self):
+        if self.speed_server is None:
+            return
+        self.speed_server.shutdown()
+        self.speed_server.server_close()
+        self.speed_server = None
+        self.speed_server_btn.setText("Start Server")
+        self.speed_port_spin.setEnabled(True)
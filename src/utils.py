@@ -1,21 +1,72 @@
 import os
+import copy
 import json
 import tempfile
 import platform
 import subprocess
-import psutil
 
 
-def load_settings():
-    path = os.path.join(os.path.expanduser('~'), '.system_monitor_settings.json')
-    default_settings = {
-        'poll_interval': 2000,
-        'cpu_temp_threshold': 80,
-        'gpu_temp_threshold': 85,
-        'ram_threshold': 90,
-        'disk_threshold': 90,
-        'popup_alerts': True
-    }
+def format_bytes(size):
+    """Convert bytes to human-readable format"""
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size < 1024.0:
+            if unit == 'B':
+                return f"{size:.0f} {unit}"
+            return f"{size:.2f} {unit}"
+        size /= 1024.0
+    return f"{size:.2f} PB"
+
+
+def settings_path():
+    return os.path.join(os.path.expanduser('~'), '.system_monitor_settings.json')
+
+
+DEFAULT_SETTINGS = {
+    'poll_interval': 2000,
+    'cpu_temp_threshold': 80,
+    'gpu_temp_threshold': 85,
+    'ram_threshold': 90,
+    'disk_threshold': 90,
+    'popup_alerts': True,
+    'max_fps': 5,
+    'history_retention_hours': 168,
+    'alert_sustained_s': 10,
+    'alert_hysteresis': 5,
+    'alert_cooldown_s': 300,
+    'alert_rules': [],
+    'alert_file_notifications': False,
+    'alert_file_path': '',
+    'email_notifications': False,
+    'email_server': 'smtp.example.com',
+    'email_port': 587,
+    'email_use_tls': True,
+    'email_from': 'monitor@example.com',
+    'email_to': 'admin@example.com',
+    'email_username': '',
+    'email_password': '',
+    'email_digest_s': 60,
+    'anomaly_detection': True,
+    'anomaly_seasonal': False,
+    'anomaly_z_threshold': 4.0,
+    'alert_log_path': '',
+    'scheduled_reports': [],
+    'latency_targets': ['8.8.8.8', '1.1.1.1:443'],
+    'latency_interval_s': 5,
+    'latency_concurrency': 64,
+    'speed_test_target': 'http://speedtest.tele2.net/1MB.zip',
+    'speed_test_streams': 4,
+    'speed_test_duration_s': 10,
+    'speed_test_server_port': 5201,
+    'smartctl_path': 'smartctl',
+    'smart_cache_ttl_s': 300,
+    'fleet_agents': [],
+    'fleet_mode': 'subscribe'
+}
+
+
+def load_settings(path=None):
+    path = path or settings_path()
+    default_settings = copy.deepcopy(DEFAULT_SETTINGS)
 
     if not os.path.exists(path):
         return default_settings
@@ -27,69 +78,40 @@ def load_settings():
         return default_settings
 
 
-def save_settings(settings):
-    path = os.path.join(os.path.expanduser('~'), '.system_monitor_settings.json')
+def save_settings(settings, path=None):
+    """Write settings atomically; raises OSError if they cannot be written.
+
+    The JSON goes to a temporary file in the same directory that then
+    replaces the old file, so readers never see a partly written file.
+    """
+    path = path or settings_path()
+    fd, tmp = tempfile.mkstemp(prefix='.system_monitor_settings.', suffix='.tmp', dir=os.path.dirname(path))
     try:
-        with open(path, 'w') as f:
+        with os.fdopen(fd, 'w') as f:
             json.dump(settings, f, indent=4)
-    except Exception:
-        pass
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
 
 
 def run_disk_cleanup(paths):
-    log = ["Starting disk cleanup..."]
-    total_files = 0
-    total_size = 0
-
-    for path in paths:
-        if not os.path.exists(path):
-            log.append(f"Skipping non-existent path: {path}")
-            continue
-
-        log.append(f"Cleaning: {path}")
-        files = 0
-        size = 0
-
-        for root, dirs, filenames in os.walk(path):
-            for filename in filenames:
-                try:
-                    file_path = os.path.join(root, filename)
-                    file_size = os.path.getsize(file_path)
-                    os.remove(file_path)
-                    files += 1
-                    size += file_size
-                except Exception as e:
-                    log.append(f"Error deleting {file_path}: {str(e)}")
-
-        total_files += files
-        total_size += size
-        log.append(f"Deleted {files} files ({size / (1024 * 1024):.2f} MB)")
-
-    log.append(f"Total deleted: {total_files} files ({total_size / (1024 * 1024):.2f} MB)")
-    return log
-
-
-def check_disk_health():
+    """Delete all files under paths; returns the log lines"""
+    from cleanup import run_cleanup
+    return run_cleanup(paths, delete=True).log_lines()
+
+
+def check_disk_health(smartctl='smartctl'):
+    """SMART health report of all drives as text"""
+    from smart import SmartCollector
     try:
-        if platform.system() == 'Windows':
-            result = subprocess.run(
-                ['chkdsk', 'C:'],
-                capture_output=True,
-                text=True,
-                encoding='cp866' if platform.system() == 'Windows' else 'utf-8'
-            )
-            return result.stdout + result.stderr
-        else:
-            disk = next((p.device for p in psutil.disk_partitions() if p.mountpoint == '/'), None)
-            if not disk:
-                return "Root partition not found"
-
-            result = subprocess.run(
-                ['smartctl', '-H', disk],
-                capture_output=True,
-                text=True
-            )
-            return result.stdout + result.stderr
+        collector = SmartCollector(smartctl)
+        return "\n".join(collector.report_lines(collector.collect()))
     except Exception as e:
         return f"Error: {str(e)}"
 
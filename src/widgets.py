@@ -1,22 +1,24 @@
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QTableWidget, QTableWidgetItem,
-    QGroupBox, QPushButton, QTextEdit, QHeaderView, QFormLayout, QComboBox, QSpinBox,
-    QCheckBox, QProgressDialog, QTabWidget, QApplication, QMessageBox
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QGroupBox, QHeaderView,
+    QLineEdit
 )
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QColor
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.dates as mdates
-import random
 import os
-import tempfile
-import platform
-import subprocess
-import psutil
-from datetime import datetime
-from reports import generate_pdf_report, generate_xml_report, generate_excel_report
-from utils import run_disk_cleanup, check_disk_health, run_ping_test, save_settings
+from models import KeyedTableModel, create_table_view
+from explorer import HistoryNavigator
+from utils import format_bytes
+
+
+def update_anomaly_markers(marker_line, anomalies, metric):
+    """Place markers at the detected anomalies of one metric"""
+    points = [(t, v) for t, m, v in anomalies if m == metric]
+    if points:
+        marker_line.set_data(*zip(*points))
+    else:
+        marker_line.set_data([], [])
 
 
 class DashboardTab(QWidget):
@@ -68,10 +70,10 @@ class DashboardTab(QWidget):
         # Alerts
         alerts_group = QGroupBox("Recent Alerts")
         alerts_layout = QVBoxLayout(alerts_group)
-        self.alerts_table = QTableWidget(5, 3)
-        self.alerts_table.setHorizontalHeaderLabels(["Time", "Component", "Message"])
-        self.alerts_table.horizontalHeader().setStretchLastSection(True)
-        self.alerts_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.alerts_model = KeyedTableModel(["Time", "Component", "Message"], parent=self)
+        self.alerts_table, alerts_proxy = create_table_view(
+            self.alerts_model, sortable=False, resize_mode=QHeaderView.ResizeToContents)
+        alerts_proxy.sort(0, Qt.DescendingOrder)
         alerts_layout.addWidget(self.alerts_table)
         layout.addWidget(alerts_group)
 
@@ -125,12 +127,11 @@ class DashboardTab(QWidget):
                           self.gpu_ax, self.gpu_canvas)
 
         # Update alerts
-        self.alerts_table.clearContents()
-        self.alerts_table.setRowCount(min(5, len(alert_history)))
-        for i, alert in enumerate(list(alert_history)[:5]):
-            self.alerts_table.setItem(i, 0, QTableWidgetItem(alert['time']))
-            self.alerts_table.setItem(i, 1, QTableWidgetItem(alert['component']))
-            self.alerts_table.setItem(i, 2, QTableWidgetItem(alert['message']))
+        recent = [alert_history[i] for i in range(min(5, len(alert_history)))]
+        self.alerts_model.set_rows(
+            ((alert['time'], alert['component'], alert['message']),
+             (alert['time'], alert['component'], alert['message']))
+            for alert in recent)
 
     def update_chart(self, line1, x1_data, y1_data, line2, x2_data, y2_data, ax, canvas):
         valid_points1 = [(t, v) for t, v in zip(x1_data, y1_data) if v is not None]
@@ -166,6 +167,8 @@ class CpuTab(QWidget):
         self.usage_line, = self.ax.plot([], [], color='tab:blue', label='Usage')
         self.ax2 = self.ax.twinx()
         self.temp_line, = self.ax2.plot([], [], color='tab:red', label='Temp')
+        self.usage_anomalies, = self.ax.plot([], [], 'o', color='red', fillstyle='none', markersize=8)
+        self.temp_anomalies, = self.ax2.plot([], [], 'o', color='red', fillstyle='none', markersize=8)
 
         # Chart setup
         self.ax.set_title("CPU Full History")
@@ -179,6 +182,10 @@ class CpuTab(QWidget):
         self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
         self.fig.tight_layout()
 
+        self.navigator = HistoryNavigator(
+            self.parent, self.canvas, [(self.usage_line, 'cpu.percent'), (self.temp_line, 'cpu.temperature')], self)
+        layout.insertLayout(0, self.navigator.create_controls())
+
         self.table = QTableWidget(1, 4)
         self.table.setHorizontalHeaderLabels(["Cores (P/L)", "Current Speed", "Max Speed", "Usage"])
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
@@ -187,17 +194,20 @@ class CpuTab(QWidget):
     def update_data(self, historical_data, time_points, cpu_usage_points, cpu_temp_points,
                     *args, **kwargs):
         # Update chart
-        valid_usage = [(t, v) for t, v in zip(time_points, cpu_usage_points) if v is not None]
-        valid_temp = [(t, v) for t, v in zip(time_points, cpu_temp_points) if v is not None]
+        update_anomaly_markers(self.usage_anomalies, self.parent.anomalies, 'cpu.percent')
+        update_anomaly_markers(self.temp_anomalies, self.parent.anomalies, 'cpu.temperature')
+        if self.navigator.live:
+            valid_usage = [(t, v) for t, v in zip(time_points, cpu_usage_points) if v is not None]
+            valid_temp = [(t, v) for t, v in zip(time_points, cpu_temp_points) if v is not None]
 
-        if valid_usage:
-            self.usage_line.set_data(*zip(*valid_usage))
-        if valid_temp:
-            self.temp_line.set_data(*zip(*valid_temp))
+            if valid_usage:
+                self.usage_line.set_data(*zip(*valid_usage))
+            if valid_temp:
+                self.temp_line.set_data(*zip(*valid_temp))
 
-        if time_points:
-            self.ax.set_xlim(time_points[0], time_points[-1])
-            self.canvas.draw_idle()
+            if time_points:
+                self.ax.set_xlim(time_points[0], time_points[-1])
+                self.canvas.draw_idle()
 
         # Update table
         data = historical_data[-1].get('cpu', {})
@@ -226,6 +236,8 @@ class MemoryTab(QWidget):
 
         self.ax = self.fig.add_subplot(111)
         self.usage_line, = self.ax.plot([], [], 'g-', label="RAM Usage (%)")
+        self.anomaly_markers, = self.ax.plot([], [], 'o', color='red', fillstyle='none', markersize=8,
+                                             label="Anomaly")
         self.ax.set_ylim(0, 105)
         self.ax.set_ylabel("Usage (%)")
         self.ax.grid(True)
@@ -234,6 +246,9 @@ class MemoryTab(QWidget):
         self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
         self.fig.tight_layout()
 
+        self.navigator = HistoryNavigator(self.parent, self.canvas, [(self.usage_line, 'memory.percent')], self)
+        layout.insertLayout(0, self.navigator.create_controls())
+
         # Memory table
         self.table = QTableWidget(2, 4)
         self.table.setHorizontalHeaderLabels(["Total", "Used", "Free", "Usage %"])
@@ -251,8 +266,9 @@ class MemoryTab(QWidget):
         swap = mem_data.get('swap', {})
 
         # Update chart
+        update_anomaly_markers(self.anomaly_markers, self.parent.anomalies, 'memory.percent')
         valid_points = [(t, v) for t, v in zip(time_points, self.parent.mem_usage_points) if v is not None]
-        if valid_points:
+        if valid_points and self.navigator.live:
             self.usage_line.set_data(*zip(*valid_points))
             if time_points:
                 self.ax.set_xlim(time_points[0], time_points[-1])
@@ -280,10 +296,12 @@ class DiskTab(QWidget):
 
     def init_ui(self):
         layout = QVBoxLayout(self)
-        self.table = QTableWidget(0, 5)
-        self.table.setHorizontalHeaderLabels(["Mountpoint", "Total", "Used", "Free", "Usage %"])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
-        self.table.horizontalHeader().setStretchLastSection(True)
+        gb = lambda v: f"{(v or 0) / 1e9:.2f} GB"
+        self.model = KeyedTableModel(
+            ["Mountpoint", "Total", "Used", "Free", "Usage %"],
+            formatters={1: gb, 2: gb, 3: gb, 4: lambda v: f"{v or 0:.1f}%"},
+            parent=self)
+        self.table, self.proxy = create_table_view(self.model, resize_mode=QHeaderView.ResizeToContents)
         layout.addWidget(self.table)
 
     def update_data(self, historical_data, *args, **kwargs):
@@ -291,17 +309,10 @@ class DiskTab(QWidget):
             return
 
         disk_usages = historical_data[-1].get('disk', {})
-        self.table.setRowCount(len(disk_usages))
-
-        for i, (mount, usage) in enumerate(disk_usages.items()):
-            # Format mountpoint for display
-            display_mount = mount.replace('_drive', ':')
-
-            self.table.setItem(i, 0, QTableWidgetItem(display_mount))
-            self.table.setItem(i, 1, QTableWidgetItem(f"{usage.get('total', 0) / 1e9:.2f} GB"))
-            self.table.setItem(i, 2, QTableWidgetItem(f"{usage.get('used', 0) / 1e9:.2f} GB"))
-            self.table.setItem(i, 3, QTableWidgetItem(f"{usage.get('free', 0) / 1e9:.2f} GB"))
-            self.table.setItem(i, 4, QTableWidgetItem(f"{usage.get('percent', 0):.1f}%"))
+        self.model.set_rows(
+            (mount, (mount.replace('_drive', ':'), usage.get('total'), usage.get('used'),
+                     usage.get('free'), usage.get('percent')))
+            for mount, usage in disk_usages.items())
 
 
 class GpuTab(QWidget):
@@ -322,6 +333,8 @@ class GpuTab(QWidget):
         self.load_line, = self.ax.plot([], [], color='tab:green', label='Load')
         self.ax2 = self.ax.twinx()
         self.temp_line, = self.ax2.plot([], [], color='tab:orange', label='Temp')
+        self.load_anomalies, = self.ax.plot([], [], 'o', color='red', fillstyle='none', markersize=8)
+        self.temp_anomalies, = self.ax2.plot([], [], 'o', color='red', fillstyle='none', markersize=8)
 
         # Chart setup
         self.ax.set_title("GPU Full History")
@@ -335,6 +348,10 @@ class GpuTab(QWidget):
         self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
         self.fig.tight_layout()
 
+        self.navigator = HistoryNavigator(
+            self.parent, self.canvas, [(self.load_line, 'gpu.load'), (self.temp_line, 'gpu.temp')], self)
+        layout.insertLayout(0, self.navigator.create_controls())
+
         # GPU info table
         self.table = QTableWidget(0, 2)
         self.table.setHorizontalHeaderLabels(["Metric", "Value"])
@@ -346,20 +363,23 @@ class GpuTab(QWidget):
             return
 
         # Update chart
-        valid_load = [(t, v) for t, v in zip(time_points, gpu_load_points) if v is not None]
-        valid_temp = [(t, v) for t, v in zip(time_points, gpu_temp_points) if v is not None]
+        update_anomaly_markers(self.load_anomalies, self.parent.anomalies, 'gpu.load')
+        update_anomaly_markers(self.temp_anomalies, self.parent.anomalies, 'gpu.temp')
+        if self.navigator.live:
+            valid_load = [(t, v) for t, v in zip(time_points, gpu_load_points) if v is not None]
+            valid_temp = [(t, v) for t, v in zip(time_points, gpu_temp_points) if v is not None]
 
-        if valid_load:
-            self.load_line.set_data(*zip(*valid_load))
-        if valid_temp:
-            self.temp_line.set_data(*zip(*valid_temp))
+            if valid_load:
+                self.load_line.set_data(*zip(*valid_load))
+            if valid_temp:
+                self.temp_line.set_data(*zip(*valid_temp))
 
-        if time_points:
-            self.ax.set_xlim(time_points[0], time_points[-1])
-            self.canvas.draw_idle()
+            if time_points:
+                self.ax.set_xlim(time_points[0], time_points[-1])
+                self.canvas.draw_idle()
 
         # Update table
-        gpu_info = historical_data[-1].get('gpu', {})
+        gpu_info = historical_data[-1].get('gpu') or {}
         self.table.setRowCount(len(gpu_info))
 
         for i, (key, value) in enumerate(gpu_info.items()):
@@ -393,12 +413,17 @@ class NetworkTab(QWidget):
 
     def init_ui(self):
         layout = QVBoxLayout(self)
-        self.table = QTableWidget(0, 5)
-        self.table.setHorizontalHeaderLabels(
-            ["Interface", "Sent (Total)", "Recv (Total)", "Sent (Rate)", "Recv (Rate)"]
-        )
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
-        self.table.horizontalHeader().setStretchLastSection(True)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter interfaces...")
+        layout.addWidget(self.filter_edit)
+
+        rate = lambda v: "N/A" if v is None else self.format_bytes(v) + "/s"
+        self.model = KeyedTableModel(
+            ["Interface", "Sent (Total)", "Recv (Total)", "Sent (Rate)", "Recv (Rate)"],
+            formatters={1: self.format_bytes, 2: self.format_bytes, 3: rate, 4: rate},
+            parent=self)
+        self.table, self.proxy = create_table_view(self.model, resize_mode=QHeaderView.ResizeToContents)
+        self.filter_edit.textChanged.connect(self.proxy.setFilterFixedString)
         layout.addWidget(self.table)
 
     def update_data(self, historical_data, *args, **kwargs):
@@ -406,351 +431,35 @@ class NetworkTab(QWidget):
             return
 
         current_data = historical_data[-1]
-        current_time = current_data['timestamp']
+        current_time = current_data['t_ns']
         current_io = current_data.get('network', {})
 
         if not current_io:
-            self.table.setRowCount(0)
+            self.model.set_rows([])
             return
 
-        self.table.setRowCount(len(current_io))
-
-        for i, (iface, counters) in enumerate(current_io.items()):
-            # Format interface name
-            display_iface = iface.replace('_', ' ').title()
+        time_delta = 0
+        if self.last_net_io and self.last_update_time:
+            time_delta = (current_time - self.last_update_time) / 1e9
 
-            # Format total values
+        rows = []
+        for iface, counters in current_io.items():
             sent_total = counters.get('bytes_sent', 0)
             recv_total = counters.get('bytes_recv', 0)
-            sent_total_str = self.format_bytes(sent_total)
-            recv_total_str = self.format_bytes(recv_total)
 
             # Calculate rates
-            sent_rate_str, recv_rate_str = "N/A", "N/A"
-            if self.last_net_io and self.last_update_time:
-                time_delta = (current_time - self.last_update_time).total_seconds()
-                if time_delta > 0 and iface in self.last_net_io:
-                    last_counters = self.last_net_io[iface]
-                    sent_rate = (sent_total - last_counters.get('bytes_sent', 0)) / time_delta
-                    recv_rate = (recv_total - last_counters.get('bytes_recv', 0)) / time_delta
-                    sent_rate_str = self.format_bytes(sent_rate) + "/s"
-                    recv_rate_str = self.format_bytes(recv_rate) + "/s"
-
-            # Add items to table
-            self.table.setItem(i, 0, QTableWidgetItem(display_iface))
-            self.table.setItem(i, 1, QTableWidgetItem(sent_total_str))
-            self.table.setItem(i, 2, QTableWidgetItem(recv_total_str))
-            self.table.setItem(i, 3, QTableWidgetItem(sent_rate_str))
-            self.table.setItem(i, 4, QTableWidgetItem(recv_rate_str))
+            sent_rate, recv_rate = None, None
+            if time_delta > 0 and iface in self.last_net_io:
+                last_counters = self.last_net_io[iface]
+                sent_rate = (sent_total - last_counters.get('bytes_sent', 0)) / time_delta
+                recv_rate = (recv_total - last_counters.get('bytes_recv', 0)) / time_delta
+
+            rows.append((iface, (iface.replace('_', ' ').title(), sent_total, recv_total, sent_rate, recv_rate)))
+        self.model.set_rows(rows)
 
         # Save for next update
         self.last_net_io = current_io
         self.last_update_time = current_time
 
     def format_bytes(self, size):
-        """Convert bytes to human-readable format"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size < 1024.0:
-                if unit == 'B':
-                    return f"{size:.0f} {unit}"
-                return f"{size:.2f} {unit}"
-            size /= 1024.0
-        return f"{size:.2f} PB"
-
-
-class MultiDeviceTab(QWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.parent = parent
-        self.init_ui()
-
-    def init_ui(self):
-        layout = QVBoxLayout(self)
-
-        # Button layout
-        button_layout = QHBoxLayout()
-        discover_btn = QPushButton("Discover Devices")
-        discover_btn.clicked.connect(self.parent.discover_network_devices)
-        button_layout.addWidget(discover_btn)
-        button_layout.addStretch()
-        layout.addLayout(button_layout)
-
-        # Devices table
-        self.table = QTableWidget(0, 5)
-        self.table.setHorizontalHeaderLabels(["Device Name", "IP Address", "Status", "CPU %", "RAM %"])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.setSortingEnabled(True)
-        layout.addWidget(self.table)
-
-    def update_devices(self, devices):
-        """Update the table with device information"""
-        self.table.setSortingEnabled(False)
-        self.table.setRowCount(len(devices))
-
-        for i, device in enumerate(devices):
-            self.table.setItem(i, 0, QTableWidgetItem(device['name']))
-            self.table.setItem(i, 1, QTableWidgetItem(device['ip']))
-
-            # Status with color coding
-            status_item = QTableWidgetItem(device['status'])
-            if device['status'] == 'Online':
-                status_item.setForeground(QColor('green'))
-            else:
-                status_item.setForeground(QColor('red'))
-            self.table.setItem(i, 2, status_item)
-
-            # CPU usage with color coding
-            cpu_item = QTableWidgetItem(f"{device['cpu']}%")
-            if device['cpu'] > 80:
-                cpu_item.setForeground(QColor('red'))
-            elif device['cpu'] > 60:
-                cpu_item.setForeground(QColor('orange'))
-            self.table.setItem(i, 3, cpu_item)
-
-            # RAM usage with color coding
-            ram_item = QTableWidgetItem(f"{device['ram']}%")
-            if device['ram'] > 90:
-                ram_item.setForeground(QColor('red'))
-            elif device['ram'] > 75:
-                ram_item.setForeground(QColor('orange'))
-            self.table.setItem(i, 4, ram_item)
-
-            self.table.setSortingEnabled(True)
-
-
-
-
-
-class AlertsTab(QWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.init_ui()
-
-    def init_ui(self):
-        layout = QVBoxLayout(self)
-        self.table = QTableWidget(0, 3)
-        self.table.setHorizontalHeaderLabels(["Time", "Component", "Message"])
-        self.table.horizontalHeader().setStretchLastSection(True)
-        self.table.setSortingEnabled(True)
-        layout.addWidget(self.table)
-
-    def update_data(self, *args, alert_history=None, **kwargs):
-        if alert_history is None:
-            return
-
-        self.table.setSortingEnabled(False)
-        self.table.setRowCount(len(alert_history))
-        for i, alert in enumerate(alert_history):
-            self.table.setItem(i, 0, QTableWidgetItem(alert['time']))
-            self.table.setItem(i, 1, QTableWidgetItem(alert['component']))
-            self.table.setItem(i, 2, QTableWidgetItem(alert['message']))
-        self.table.setSortingEnabled(True)
-
-
-class ReportsTab(QWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.parent = parent
-        self.init_ui()
-
-    def init_ui(self):
-        layout = QVBoxLayout(self)
-        group = QGroupBox("Generate Report")
-        form_layout = QFormLayout(group)
-        self.report_type_combo = QComboBox()
-        self.report_type_combo.addItems(["System Summary"])
-        form_layout.addRow("Report Type:", self.report_type_combo)
-        group.setLayout(form_layout)
-
-        button_layout = QHBoxLayout()
-        pdf_button = QPushButton("Generate PDF")
-        pdf_button.clicked.connect(self.generate_pdf)
-        xml_button = QPushButton("Generate XML")
-        xml_button.clicked.connect(self.generate_xml)
-        excel_button = QPushButton("Generate Excel")
-        excel_button.clicked.connect(self.generate_excel)
-        button_layout.addWidget(pdf_button)
-        button_layout.addWidget(xml_button)
-        button_layout.addWidget(excel_button)
-
-        layout.addWidget(group)
-        layout.addLayout(button_layout)
-        layout.addStretch()
-
-    def generate_pdf(self):
-        try:
-            filename = generate_pdf_report(self.parent.dashboard_tab.cpu_fig, self.parent.dashboard_tab.gpu_fig)
-            QMessageBox.information(self, "Success", f"PDF report generated: {filename}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to generate PDF: {str(e)}")
-
-    def generate_xml(self):
-        try:
-            filename = generate_xml_report(self.parent.historical_data)
-            QMessageBox.information(self, "Success", f"XML report generated: {filename}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to generate XML: {str(e)}")
-
-    def generate_excel(self):
-        try:
-            filename = generate_excel_report(self.parent.historical_data)
-            QMessageBox.information(self, "Success", f"Excel report generated: {filename}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to generate Excel: {str(e)}")
-
-
-class SettingsTab(QWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.parent = parent
-        self.init_ui()
-
-    def init_ui(self):
-        layout = QVBoxLayout(self)
-        tabs = QTabWidget()
-
-        # General tab
-        general_tab = QWidget()
-        general_layout = QFormLayout(general_tab)
-        self.poll_map = {
-            "1 second": 1000, "2 seconds": 2000, "5 seconds": 5000,
-            "10 seconds": 10000, "30 seconds": 30000
-        }
-        self.poll_combo = QComboBox()
-        self.poll_combo.addItems(self.poll_map.keys())
-        general_layout.addRow("Polling Interval:", self.poll_combo)
-        tabs.addTab(general_tab, "General")
-
-        # Alerts tab
-        alert_tab = QWidget()
-        alert_layout = QFormLayout(alert_tab)
-        self.cpu_temp_spin = QSpinBox()
-        self.cpu_temp_spin.setRange(50, 120)
-        self.cpu_temp_spin.setSuffix(" °C")
-        self.gpu_temp_spin = QSpinBox()
-        self.gpu_temp_spin.setRange(50, 120)
-        self.gpu_temp_spin.setSuffix(" °C")
-        self.ram_spin = QSpinBox()
-        self.ram_spin.setRange(50, 100)
-        self.ram_spin.setSuffix(" %")
-        self.disk_spin = QSpinBox()
-        self.disk_spin.setRange(50, 100)
-        self.disk_spin.setSuffix(" %")
-        self.popup_check = QCheckBox("Show popup alerts")
-        alert_layout.addRow("CPU Temp Threshold:", self.cpu_temp_spin)
-        alert_layout.addRow("GPU Temp Threshold:", self.gpu_temp_spin)
-        alert_layout.addRow("RAM Usage Threshold:", self.ram_spin)
-        alert_layout.addRow("Disk Usage Threshold:", self.disk_spin)
-        alert_layout.addRow(self.popup_check)
-        tabs.addTab(alert_tab, "Alerts")
-
-        layout.addWidget(tabs)
-
-        save_btn = QPushButton("Save Settings")
-        save_btn.clicked.connect(self.save_settings)
-        layout.addWidget(save_btn, 0, Qt.AlignRight)
-
-        self.load_settings()
-
-    def load_settings(self):
-        settings = self.parent.settings
-        rev_map = {v: k for k, v in self.poll_map.items()}
-        self.poll_combo.setCurrentText(rev_map.get(settings.get('poll_interval', 2000), "2 seconds"))
-        self.cpu_temp_spin.setValue(settings.get('cpu_temp_threshold', 80))
-        self.gpu_temp_spin.setValue(settings.get('gpu_temp_threshold', 85))
-        self.ram_spin.setValue(settings.get('ram_threshold', 90))
-        self.disk_spin.setValue(settings.get('disk_threshold', 90))
-        self.popup_check.setChecked(settings.get('popup_alerts', True))
-
-    def save_settings(self):
-        try:
-            self.parent.settings['poll_interval'] = self.poll_map[self.poll_combo.currentText()]
-            self.parent.settings['cpu_temp_threshold'] = self.cpu_temp_spin.value()
-            self.parent.settings['gpu_temp_threshold'] = self.gpu_temp_spin.value()
-            self.parent.settings['ram_threshold'] = self.ram_spin.value()
-            self.parent.settings['disk_threshold'] = self.disk_spin.value()
-            self.parent.settings['popup_alerts'] = self.popup_check.isChecked()
-
-            save_settings(self.parent.settings)
-            QMessageBox.information(self, "Success", "Settings saved successfully")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save settings: {str(e)}")
-
-
-class ToolsTab(QWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.parent = parent
-        self.init_ui()
-
-    def init_ui(self):
-        layout = QVBoxLayout(self)
-
-        # Disk cleanup
-        disk_group = QGroupBox("Disk Cleanup")
-        disk_layout = QVBoxLayout(disk_group)
-        self.temp_check = QCheckBox("Delete temporary files")
-        self.temp_check.setChecked(True)
-        self.cache_check = QCheckBox("Clear system cache")
-        disk_layout.addWidget(self.temp_check)
-        disk_layout.addWidget(self.cache_check)
-        cleanup_btn = QPushButton("Run Cleanup")
-        cleanup_btn.clicked.connect(self.run_cleanup)
-        disk_layout.addWidget(cleanup_btn)
-        layout.addWidget(disk_group)
-
-        # Diagnostics
-        diag_group = QGroupBox("Diagnostics")
-        diag_layout = QVBoxLayout(diag_group)
-        btn_layout = QHBoxLayout()
-        disk_btn = QPushButton("Disk Health")
-        disk_btn.clicked.connect(self.check_disk)
-        ping_btn = QPushButton("Ping Test")
-        ping_btn.clicked.connect(self.run_ping)
-        speed_btn = QPushButton("Speed Test")
-        speed_btn.clicked.connect(self.run_speed_test)
-        btn_layout.addWidget(disk_btn)
-        btn_layout.addWidget(ping_btn)
-        btn_layout.addWidget(speed_btn)
-        diag_layout.addLayout(btn_layout)
-
-        self.output = QTextEdit()
-        self.output.setReadOnly(True)
-        self.output.setFont(QFont("Courier", 9))
-        diag_layout.addWidget(self.output)
-        layout.addWidget(diag_group)
-
-    def run_cleanup(self):
-        paths = []
-        if self.temp_check.isChecked():
-            paths.append(tempfile.gettempdir())
-        if self.cache_check.isChecked():
-            if platform.system() == 'Windows':
-                paths.append(os.path.join(os.environ['LOCALAPPDATA'], 'Temp'))
-            else:
-                paths.append(os.path.expanduser('~/.cache'))
-
-        if not paths:
-            QMessageBox.warning(self, "Warning", "No cleanup options selected")
-            return
-
-        log = run_disk_cleanup(paths)
-        self.output.setPlainText("\n".join(log))
-        QMessageBox.information(self, "Success", "Cleanup completed")
-
-    def check_disk(self):
-        result = check_disk_health()
-        self.output.setPlainText(result)
-
-    def run_ping(self):
-        result = run_ping_test("8.8.8.8")
-        self.output.setPlainText(result)
-
-    def run_speed_test(self):
-        if not self.parent.speed_test_thread.isRunning():
-            self.output.setPlainText("Starting speed test...")
-            self.parent.speed_test_thread.result_ready.connect(self.output.setPlainText)
-            self.parent.speed_test_thread.start()
-        else:
-            QMessageBox.warning(self, "Warning", "Speed test already in progress")
\ No newline at end of file
+        return format_bytes(size)